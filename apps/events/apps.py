@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.events'
-    verbose_name = 'Events'
\ No newline at end of file
+    verbose_name = 'Events'
+
+    def ready(self):
+        import apps.events.signals  # Cache invalidation for reference data
@@ -0,0 +1,270 @@
+"""
+Backup reporting: dashboard aggregates, storage usage and the verification
+trend cached until the next BackupHistory write, capacity and verification
+alerts, and a streamed CSV export of the backup history.
+"""
+import csv
+import logging
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.urls import reverse
+from django.utils import timezone
+from apps.events.models import BackupHistory
+from apps.shared.cache_utils import bump_namespace_version_on_commit, get_or_set_versioned, make_versioned_key
+
+logger = logging.getLogger(__name__)
+
+# Every BackupHistory write bumps this
+BACKUPS_NAMESPACE = "backups"
+
+RECENT_WINDOW = timedelta(days=1)
+DASHBOARD_LIST_SIZE = 5
+DASHBOARD_CACHE_TIMEOUT = 3600
+
+CSV_HEADER = ['Backup Name', 'Status', 'Timestamp', 'Size', 'Backup File', 'Log File']
+
+_MISSING = object()
+
+
+def bump_backups_version():
+    """Invalidate cached backup reports once the current transaction commits"""
+    bump_namespace_version_on_commit(BACKUPS_NAMESPACE)
+
+
+# ---------------------------------------------------------
+# Dashboard
+# ---------------------------------------------------------
+def _compute_dashboard_stats(now):
+    recent = Q(BackupStatus='completed', BackupTimestamp__gte=now - RECENT_WINDOW)
+    stats = BackupHistory.objects.aggregate(
+        total_backups=Count('BackupHistoryID'),
+        successful_backups=Count('BackupHistoryID', filter=recent),
+        failed_backups=Count('BackupHistoryID', filter=Q(BackupStatus='failed')),
+        oldest_recent=Min('BackupTimestamp', filter=recent),
+    )
+    return {
+        'total_backups': stats['total_backups'],
+        'successful_backups': stats['successful_backups'],
+        'failed_backups': stats['failed_backups'],
+        'recent_jobs': list(BackupHistory.objects.order_by('-BackupTimestamp')[:DASHBOARD_LIST_SIZE]),
+        'failed_jobs': list(
+            BackupHistory.objects.filter(BackupStatus='failed').order_by('-BackupTimestamp')[:DASHBOARD_LIST_SIZE]
+        ),
+        'oldest_recent': stats['oldest_recent'],
+    }
+
+
+def get_dashboard_stats():
+    """
+    Counts (total, successful in the last 24h, failed) from one
+    conditional-aggregation query, plus the recent and failed job lists.
+    Cached until the next BackupHistory write, or until the oldest
+    "successful in the last 24h" backup leaves that window.
+    """
+    now = timezone.now()
+    try:
+        key = make_versioned_key(BACKUPS_NAMESPACE, "dashboard")
+        stats = cache.get(key, _MISSING)
+    except Exception as e:
+        logger.warning(f"Cache read failed for backup dashboard: {str(e)}")
+        return _compute_dashboard_stats(now)
+
+    if stats is not _MISSING:
+        return stats
+
+    stats = _compute_dashboard_stats(now)
+    timeout = DASHBOARD_CACHE_TIMEOUT
+    if stats['oldest_recent']:
+        ages_out = (stats['oldest_recent'] + RECENT_WINDOW - now).total_seconds()
+        timeout = max(1, min(timeout, int(ages_out)))
+    try:
+        cache.set(key, stats, timeout)
+    except Exception as e:
+        logger.warning(f"Cache write failed for backup dashboard: {str(e)}")
+    return stats
+
+
+# ---------------------------------------------------------
+# Storage usage
+# ---------------------------------------------------------
+def backfill_backup_sizes():
+    """Fill BackupSizeBytes from the size label where it is missing (e.g. after a restore)"""
+    updated = 0
+    pending = BackupHistory.objects.filter(BackupSizeBytes__isnull=True, BackupSize__isnull=False)
+    for backup_id, label in pending.values_list('BackupHistoryID', 'BackupSize'):
+        size = BackupHistory.parse_size(label)
+        if size is not None:
+            updated += BackupHistory.objects.filter(pk=backup_id).update(BackupSizeBytes=size)
+    return updated
+
+
+def _compute_storage_usage():
+    # One GROUP BY over backup_storage_idx (timestamp, status, sizes)
+    rows = (
+        BackupHistory.objects
+        .annotate(month=TruncMonth('BackupTimestamp'))
+        .values('month', 'BackupStatus')
+        .annotate(
+            backups=Count('BackupHistoryID'),
+            size_bytes=Sum('BackupSizeBytes'),
+            compressed_bytes=Sum('BackupCompressedBytes'),
+        )
+        .order_by('month', 'BackupStatus')
+    )
+
+    months = {}
+    total_bytes = 0
+    total_backups = 0
+    for row in rows:
+        label = row['month'].strftime('%Y-%m')
+        month = months.setdefault(label, {'month': label, 'size_bytes': 0, 'backups': 0, 'by_status': {}})
+        size = row['size_bytes'] or 0
+        month['by_status'][row['BackupStatus']] = {
+            'backups': row['backups'],
+            'size_bytes': size,
+            'compressed_bytes': row['compressed_bytes'] or 0,
+        }
+        month['size_bytes'] += size
+        month['backups'] += row['backups']
+        total_bytes += size
+        total_backups += row['backups']
+
+    quota = getattr(settings, 'BACKUP_STORAGE_QUOTA_BYTES', 0)
+    return {
+        'months': list(months.values()),
+        'total_bytes': total_bytes,
+        'total_backups': total_backups,
+        'quota_bytes': quota,
+        'usage_ratio': round(total_bytes / quota, 4) if quota else None,
+    }
+
+
+def get_storage_usage():
+    """Stored backup bytes per month and status, cached until the next backup write"""
+    return get_or_set_versioned(BACKUPS_NAMESPACE, "storage-usage", _compute_storage_usage, DASHBOARD_CACHE_TIMEOUT)
+
+
+def get_capacity_alerts(usage):
+    """Dashboard alerts when backups approach BACKUP_STORAGE_QUOTA_BYTES"""
+    quota = usage['quota_bytes']
+    if not quota:
+        return []
+
+    alerts = []
+    now = timezone.now()
+    ratio = usage['usage_ratio']
+    warning_ratio = getattr(settings, 'BACKUP_STORAGE_WARNING_RATIO', 0.8)
+    used = f"{BackupHistory.format_size(usage['total_bytes'])} of {BackupHistory.format_size(quota)}"
+
+    if ratio >= 1:
+        alerts.append({'Level': 'Critical', 'Message': f"Backup storage is full ({used}).", 'CreatedAt': now})
+    elif ratio >= warning_ratio:
+        alerts.append({
+            'Level': 'Warning', 'Message': f"Backup storage is {ratio:.0%} full ({used}).", 'CreatedAt': now,
+        })
+
+    # Project from the current month's growth
+    current_month = timezone.localtime(now).strftime('%Y-%m')
+    this_month = next((m for m in usage['months'] if m['month'] == current_month), None)
+    if ratio < 1 and this_month and this_month['size_bytes']:
+        months_left = (quota - usage['total_bytes']) / this_month['size_bytes']
+        if months_left < 3:
+            alerts.append({
+                'Level': 'Warning',
+                'Message': f"At this month's rate backup storage fills up in about {months_left:.1f} months.",
+                'CreatedAt': now,
+            })
+    return alerts
+
+
+# ---------------------------------------------------------
+# Verification
+# ---------------------------------------------------------
+def _compute_verification_trend(limit):
+    rows = (
+        BackupHistory.objects
+        .filter(BackupVerifiedAt__isnull=False)
+        .order_by('-BackupVerifiedAt')
+        .values_list('BackupHistoryID', 'BackupName', 'BackupVerifiedAt', 'BackupVerifyStatus',
+                     'BackupVerifyRowsPerSecond')[:limit]
+    )
+    return [
+        {
+            'backup_id': str(backup_id),
+            'backup_name': name,
+            'verified_at': verified_at.isoformat(),
+            'status': status,
+            'rows_per_second': rows_per_second,
+        }
+        for backup_id, name, verified_at, status, rows_per_second in reversed(list(rows))
+    ]
+
+
+def get_verification_trend(limit=30):
+    """Latest verification runs, oldest first, with their restore throughput (rows/s)"""
+    return get_or_set_versioned(
+        BACKUPS_NAMESPACE, f"verification-trend:{limit}", lambda: _compute_verification_trend(limit),
+        DASHBOARD_CACHE_TIMEOUT,
+    )
+
+
+def get_verification_alerts(trend):
+    """Dashboard alert when the most recent verification failed"""
+    if not trend or trend[-1]['status'] != 'failed':
+        return []
+    latest = trend[-1]
+    return [{
+        'Level': 'Critical',
+        'Message': f"Backup '{latest['backup_name']}' failed its restore verification.",
+        'CreatedAt': timezone.now(),
+    }]
+
+
+# ---------------------------------------------------------
+# CSV export
+# ---------------------------------------------------------
+class _Echo:
+    """File-like object whose write() just returns the line for streaming"""
+
+    def write(self, value):
+        return value
+
+
+def download_url_builder(request):
+    """
+    Return a function mapping a backup id and file type to an absolute
+    download URL. reverse() and build_absolute_uri() run once here.
+    """
+    placeholder = str(uuid.UUID(int=0))
+    template = request.build_absolute_uri(reverse("events:download_backup", args=[placeholder]))
+    prefix, suffix = template.split(placeholder, 1)
+
+    def build(backup_id, file_type):
+        return f"{prefix}{backup_id}{suffix}?file_type={file_type}"
+
+    return build
+
+
+def stream_backup_csv(backups, request):
+    """Yield CSV lines for a BackupHistory queryset without loading model instances"""
+    writer = csv.writer(_Echo())
+    build_url = download_url_builder(request)
+
+    yield writer.writerow(CSV_HEADER)
+    rows = backups.values_list(
+        'BackupHistoryID', 'BackupName', 'BackupStatus', 'BackupTimestamp', 'BackupSize', 'BackupFile',
+        'BackupLogFile',
+    )
+    for backup_id, name, status, timestamp, size, backup_file, log_file in rows.iterator(chunk_size=2000):
+        yield writer.writerow([
+            name,
+            status.capitalize(),
+            timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            size,
+            build_url(backup_id, "backup") if backup_file else "",
+            build_url(backup_id, "log") if log_file else "",
+        ])
@@ -1,23 +1,20 @@
 import os
+import logging
 import subprocess
+import tempfile
+import time
+import uuid
+import zlib
 from datetime import datetime
-import django
-from dotenv import load_dotenv
 from pathlib import Path
-from io import StringIO
+from apps.events.backup_verification import DUMP_ARGS, DUMP_TIME_ZONE, file_manifest
 from apps.events.models import BackupHistory
 from apps.events.upload_to_cloud import upload_backup_to_cloud
-from apps.events.utils.log_line import log_line
-
-# Initialize Django
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
-django.setup()
+from apps.shared.operation_log import OperationLog
 
-# Load .env
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
-load_dotenv(PROJECT_ROOT / ".env")
+logger = logging.getLogger(__name__)
 
-# Database credentials
+# Database credentials (.env is loaded by settings before this module is imported)
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
@@ -36,28 +33,55 @@ elif IS_WINDOWS:
 else:
     PG_DUMP_PATH = "pg_dump"  # Linux/Mac
 
-# Local folders - use temp directory that works on both platforms
-import tempfile
+# Local folders - use temp directory that works on both platforms (created on first backup)
 BACKUP_DIR = Path(tempfile.gettempdir()) / "arcasys_backups"
-LOG_DIR = Path(tempfile.gettempdir()) / "arcasys_logs"
-BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+def gzip_size(path, chunk_size=1024 * 1024):
+    """Bytes the file would take gzip-compressed, without writing it out"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            size += len(compressor.compress(chunk))
+    return size + len(compressor.flush())
+
+
+def persist_operation_log(oplog):
+    """Upload an operation's gzip JSON-lines log once, at the end; returns the S3 key or None"""
+    path = oplog.finish()
+    if not path:
+        return None
+    try:
+        return upload_backup_to_cloud(path, None, folder="logs")
+    finally:
+        os.unlink(path)
+
 
 def backup_database():
+    started = time.monotonic()
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_id = uuid.uuid4()
     backup_name = f"Backup_{timestamp}"
     backup_filename = f"db_backup_{timestamp}.sql"
-    log_filename = f"backup_log_{timestamp}.txt"
-
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
     backup_path = BACKUP_DIR / backup_filename
-    log_path = LOG_DIR / log_filename
 
-    log_output = StringIO()
-    log_line(log_output, f"Starting DATA-ONLY database backup on {'Render' if IS_RENDER else 'Local'}...")
-    log_line(log_output, f"Using pg_dump at: {PG_DUMP_PATH}")
+    oplog = OperationLog("backup", backup_id)
+    oplog.info(f"Starting DATA-ONLY database backup on {'Render' if IS_RENDER else 'Local'}...")
+    oplog.info(f"Using pg_dump at: {PG_DUMP_PATH}")
 
-    backup_s3_key = None
-    log_s3_key = None
+    def save_record(status, **fields):
+        # Last log line; persisting finishes the log
+        oplog.info(f"Saving backup record ({status}).", phase="finish")
+        log_key = persist_operation_log(oplog)
+        BackupHistory.objects.create(
+            BackupHistoryID=backup_id,
+            BackupName=backup_name,
+            BackupStatus=status if log_key else "failed",
+            BackupDurationMs=int((time.monotonic() - started) * 1000),
+            BackupLogFile=log_key,
+            **fields
+        )
 
     try:
         # Build database URL - different format for Render vs Local
@@ -68,22 +92,13 @@ def backup_database():
             # Use local format
             db_url = f"postgresql://{DB_USER}@{DB_HOST}:{DB_PORT}/{DB_NAME}?sslmode=require"
 
-        log_line(log_output, "Creating Supabase-safe DATA-ONLY backup file...")
+        oplog.info("Creating Supabase-safe DATA-ONLY backup file...", phase="dump")
 
         # Build command arguments
         cmd_args = [
             PG_DUMP_PATH,
             db_url,
-            "--data-only",
-            "--inserts",
-            "--exclude-table=schema_migrations",
-            "--exclude-table=django_migrations",
-            "--exclude-table=django_session",
-            "--exclude-table=pg_*",
-            "--exclude-table=information_schema.*",
-            "--exclude-table=auth.*",
-            "--exclude-table=storage.*",
-            "--exclude-table=realtime.*",
+            *DUMP_ARGS,
             "-f", str(backup_path),
             "--verbose"
         ]
@@ -93,6 +108,7 @@ def backup_database():
         if not IS_RENDER:
             # Only set PGPASSWORD for local (password is in connection string for Render)
             env['PGPASSWORD'] = DB_PASSWORD
+        env['PGTZ'] = DUMP_TIME_ZONE
 
         result = subprocess.run(
             cmd_args,
@@ -103,84 +119,46 @@ def backup_database():
         )
 
         if result.returncode != 0:
-            log_line(log_output, f"Backup failed with return code {result.returncode}", level="ERROR")
-            log_line(log_output, f"STDERR: {result.stderr}", level="ERROR")
-            log_line(log_output, f"STDOUT: {result.stdout}")
-
-            with open(log_path, "w") as f:
-                f.write(log_output.getvalue())
-            log_s3_key = upload_backup_to_cloud(str(log_path), log_output, folder="logs")
-
-            BackupHistory.objects.create(
-                BackupName=backup_name,
-                BackupStatus="failed",
-                BackupSize="0 MB",
-                BackupFile=None,
-                BackupLogFile=log_s3_key
-            )
+            oplog.error(f"Backup failed with return code {result.returncode}", returncode=result.returncode)
+            oplog.error(f"STDERR: {result.stderr}")
+            save_record("failed", BackupSizeBytes=0, BackupFile=None)
             return
 
-        log_line(log_output, f"Backup created successfully: {backup_filename}")
+        size_bytes = os.path.getsize(backup_path)
+        oplog.info(f"Backup created successfully: {backup_filename}", size_bytes=size_bytes)
 
-        # Upload backup file
-        log_line(log_output, "Uploading backup file to cloud…")
-        backup_s3_key = upload_backup_to_cloud(str(backup_path), log_output, folder="backups")
-
-        # Save log locally then upload
-        with open(log_path, "w") as f:
-            f.write(log_output.getvalue())
-        log_s3_key = upload_backup_to_cloud(str(log_path), log_output, folder="logs")
-
-        status = "completed" if backup_s3_key and log_s3_key else "failed"
+        # Row counts and checksums per table, for later verification
+        table_stats = file_manifest(backup_path)
+        oplog.info(
+            f"Recorded {sum(t['rows'] for t in table_stats.values())} rows in {len(table_stats)} tables",
+            phase="manifest",
+        )
 
-        BackupHistory.objects.create(
-            BackupName=backup_name,
-            BackupStatus=status,
-            BackupSize=f"{os.path.getsize(backup_path) / (1024 * 1024):.2f} MB",
+        # Upload backup file
+        oplog.info("Uploading backup file to cloud...", phase="upload")
+        backup_s3_key = upload_backup_to_cloud(str(backup_path), oplog, folder="backups")
+
+        save_record(
+            "completed" if backup_s3_key else "failed",
+            BackupSizeBytes=size_bytes,
+            BackupCompressedBytes=gzip_size(backup_path),
+            BackupTableStats=table_stats,
             BackupFile=backup_s3_key,
-            BackupLogFile=log_s3_key
         )
 
-        log_line(log_output, "Backup record saved.")
-
     except subprocess.TimeoutExpired:
-        log_line(log_output, "Backup timed out after 120 seconds", level="ERROR")
-
-        with open(log_path, "w") as f:
-            f.write(log_output.getvalue())
-        log_s3_key = upload_backup_to_cloud(str(log_path), log_output, folder="logs")
-
-        BackupHistory.objects.create(
-            BackupName=backup_name,
-            BackupStatus="failed",
-            BackupSize="0 MB",
-            BackupFile=None,
-            BackupLogFile=log_s3_key
-        )
+        oplog.error("Backup timed out after 120 seconds")
+        save_record("failed", BackupSizeBytes=0, BackupFile=None)
 
     except Exception as e:
-        log_line(log_output, f"Backup error: {str(e)}", level="ERROR")
-
-        with open(log_path, "w") as f:
-            f.write(log_output.getvalue())
-        log_s3_key = upload_backup_to_cloud(str(log_path), log_output, folder="logs")
-
-        BackupHistory.objects.create(
-            BackupName=backup_name,
-            BackupStatus="failed",
-            BackupSize="0 MB",
-            BackupFile=None,
-            BackupLogFile=log_s3_key
-        )
+        oplog.error(f"Backup error: {str(e)}")
+        save_record("failed", BackupSizeBytes=0, BackupFile=None)
 
     finally:
         # Cleanup temp files
         try:
             if backup_path.exists():
                 backup_path.unlink()
-            if log_path.exists():
-                log_path.unlink()
         except Exception as e:
-            log_line(log_output, f"Cleanup warning: {str(e)}")
-
-        print(log_output.getvalue())
+            logger.warning(f"Backup cleanup warning: {str(e)}")
+        oplog.discard()
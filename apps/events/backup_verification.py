@@ -0,0 +1,289 @@
+"""
+Backup verification: test-restore a backup into a scratch PostgreSQL
+database and compare what comes back with what the dump contained.
+
+When a backup is taken, its manifest (per-table row count, column count
+and an order-independent checksum of the table's INSERT statements) is
+stored on BackupHistory.BackupTableStats. Verification wipes and migrates
+the scratch database (BACKUP_VERIFY_DATABASE_URL), pipes the dump into
+psql, then counts the rows and re-dumps the scratch tables to recompute the
+manifest. The scratch schema is the current one, so columns added since the
+backup was taken are left out of the re-dump's checksums. Only the scratch
+server is touched, and with a local copy of the dump no network access is
+needed.
+"""
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import time
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+from django.utils import timezone
+from apps.events.restore_stream import CHUNK_SIZE, FileSource, open_s3_source, pipe_into_psql
+from apps.events.selective_restore import iter_statements, statement_table, statement_values
+
+logger = logging.getLogger(__name__)
+
+VERIFY_ALIAS = 'backup_verify'
+
+# pg_dump arguments shared by backups and the verification re-dump, so both list the same tables
+DUMP_ARGS = [
+    "--data-only",
+    "--inserts",
+    "--exclude-table=schema_migrations",
+    "--exclude-table=django_migrations",
+    "--exclude-table=django_session",
+    "--exclude-table=pg_*",
+    "--exclude-table=information_schema.*",
+    "--exclude-table=auth.*",
+    "--exclude-table=storage.*",
+    "--exclude-table=realtime.*",
+]
+
+# Timestamps are dumped in the session time zone; pin it so checksums compare across servers
+DUMP_TIME_ZONE = 'UTC'
+
+_CHECKSUM_MODULUS = 2 ** 64
+
+
+class BackupVerificationError(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# Manifests
+# ---------------------------------------------------------
+def _column_count(statement):
+    return len(statement_values(statement.decode('utf-8')))
+
+
+def _leading_columns(statement, table, count):
+    """The INSERT as pg_dump would write it with only its first `count` values"""
+    values = statement_values(statement.decode('utf-8'))[:count]
+    return f'INSERT INTO public."{table}" VALUES ({", ".join(values)});'.encode('utf-8')
+
+
+def dump_manifest(chunks, columns=None):
+    """
+    {table: {"rows": n, "columns": c, "checksum": hex}} for a data-only dump.
+    The checksum is the sum of each INSERT statement's hash, so row order
+    doesn't matter. With `columns` ({table: c} from the backup's manifest),
+    rows that have more values than that are hashed on their first c values,
+    which is what the backup held of them.
+    """
+    columns = columns or {}
+    totals = {}
+    for _, _, statement in iter_statements(chunks):
+        table = statement_table(statement)
+        if table is None:
+            continue
+        if table not in totals:
+            # Every row of a table has the same columns, so the first one decides
+            totals[table] = (0, 0, _column_count(statement))
+        rows, checksum, count = totals[table]
+        if columns.get(table) and columns[table] < count:
+            statement = _leading_columns(statement, table, columns[table])
+        row_hash = int.from_bytes(hashlib.md5(statement).digest()[:8], 'big')
+        totals[table] = (rows + 1, (checksum + row_hash) % _CHECKSUM_MODULUS, count)
+    return {
+        table: {'rows': rows, 'columns': count, 'checksum': f"{checksum:016x}"}
+        for table, (rows, checksum, count) in sorted(totals.items())
+    }
+
+
+def dump_columns(chunks):
+    """{table: column count} of a data-only dump, from each table's first INSERT"""
+    counts = {}
+    for _, _, statement in iter_statements(chunks):
+        table = statement_table(statement)
+        if table is not None and table not in counts:
+            counts[table] = _column_count(statement)
+    return counts
+
+
+def file_manifest(path):
+    return dump_manifest(FileSource(path).chunks())
+
+
+# ---------------------------------------------------------
+# Scratch database
+# ---------------------------------------------------------
+def scratch_connection():
+    """Connection to the scratch database; refuses anything that could be the live one"""
+    config = settings.DATABASES.get(VERIFY_ALIAS)
+    if not config:
+        raise BackupVerificationError("BACKUP_VERIFY_DATABASE_URL is not configured")
+    if 'postgresql' not in config['ENGINE']:
+        raise BackupVerificationError("The verification database must be PostgreSQL")
+
+    live = settings.DATABASES['default']
+    if (config.get('HOST'), str(config.get('PORT')), config.get('NAME')) == \
+            (live.get('HOST'), str(live.get('PORT')), live.get('NAME')):
+        raise BackupVerificationError("BACKUP_VERIFY_DATABASE_URL points at the live database")
+    return connections[VERIFY_ALIAS]
+
+
+def _pg_command(program, config):
+    binary = os.path.join(settings.BACKUP_VERIFY_PG_BIN, program) if settings.BACKUP_VERIFY_PG_BIN else program
+    return [
+        binary,
+        '-h', config.get('HOST') or 'localhost',
+        '-p', str(config.get('PORT') or 5432),
+        '-U', config.get('USER') or 'postgres',
+        '-d', config['NAME'],
+    ]
+
+
+def _pg_env(config):
+    env = os.environ.copy()
+    if config.get('PASSWORD'):
+        env['PGPASSWORD'] = config['PASSWORD']
+    env['PGTZ'] = DUMP_TIME_ZONE
+    return env
+
+
+def _drop_public_schema(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('DROP SCHEMA IF EXISTS public CASCADE')
+        cursor.execute('CREATE SCHEMA public')
+
+
+def reset_scratch_database(connection):
+    """Recreate the schema from migrations, then empty every table the dump will fill"""
+    _drop_public_schema(connection)
+    call_command('migrate', database=VERIFY_ALIAS, interactive=False, verbosity=0)
+
+    # Data migrations seed rows (roles, departments, content types) that the dump also contains
+    tables = [table for table in connection.introspection.table_names() if table != 'django_migrations']
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {', '.join(connection.ops.quote_name(t) for t in tables)} CASCADE")
+
+
+def _dump_scratch(config, env, columns):
+    """Manifest of the scratch database, from a pg_dump with the backup's arguments"""
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            _pg_command('pg_dump', config) + DUMP_ARGS, stdout=subprocess.PIPE, stderr=stderr, env=env
+        )
+        manifest = dump_manifest(iter(lambda: process.stdout.read(CHUNK_SIZE), b''), columns)
+        if process.wait() != 0:
+            stderr.seek(0)
+            raise BackupVerificationError(f"pg_dump of the scratch database failed: {stderr.read().decode()[:500]}")
+    return manifest
+
+
+def _count_rows(connection, tables):
+    counts = {}
+    with connection.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            counts[table] = cursor.fetchone()[0]
+    return counts
+
+
+# ---------------------------------------------------------
+# Verification
+# ---------------------------------------------------------
+def compare_manifests(expected, restored, counts):
+    """Per-table comparison; a table passes when its row count and checksum both match"""
+    tables = {}
+    for table in sorted(set(expected) | set(restored)):
+        want = expected.get(table, {'rows': 0, 'checksum': None})
+        got = restored.get(table, {'rows': 0, 'checksum': None})
+        tables[table] = {
+            'expected_rows': want['rows'],
+            'restored_rows': counts.get(table, got['rows']),
+            'expected_checksum': want['checksum'],
+            'restored_checksum': got['checksum'],
+        }
+        tables[table]['ok'] = (
+            tables[table]['expected_rows'] == tables[table]['restored_rows']
+            and want['checksum'] == got['checksum']
+        )
+    return tables
+
+
+def _record(backup, status, report, rows_per_second=None):
+    backup.BackupVerifyStatus = status
+    backup.BackupVerifiedAt = timezone.now()
+    backup.BackupVerifyRowsPerSecond = rows_per_second
+    backup.BackupVerifyReport = report
+    backup.save(update_fields=[
+        'BackupVerifyStatus', 'BackupVerifiedAt', 'BackupVerifyRowsPerSecond', 'BackupVerifyReport',
+    ])
+    return report
+
+
+def verify_backup(backup, path=None):
+    """
+    Test-restore `backup` (or its local copy at `path`) into the scratch
+    database and store the outcome on the BackupHistory row. Returns the report.
+    """
+    connection = scratch_connection()
+    config = connection.settings_dict
+
+    def open_source():
+        return FileSource(path) if path else open_s3_source(str(backup.BackupFile))
+
+    if not path and not backup.BackupFile:
+        raise BackupVerificationError("This backup has no file to verify")
+
+    expected = backup.BackupTableStats
+    report = {'manifest': 'backup'}
+    if not expected:
+        # Backups taken before manifests were recorded: take it from the dump itself
+        expected = dump_manifest(open_source().chunks())
+        report['manifest'] = 'dump'
+    elif any('columns' not in entry for entry in expected.values()):
+        # Manifests recorded before column counts were: read them from the dump
+        counts = dump_columns(open_source().chunks())
+        expected = {table: {**entry, 'columns': counts.get(table)} for table, entry in expected.items()}
+    columns = {table: entry['columns'] for table, entry in expected.items() if entry.get('columns')}
+
+    try:
+        reset_scratch_database(connection)
+        env = _pg_env(config)
+
+        started = time.monotonic()
+        source = open_source()
+        returncode, stderr = pipe_into_psql(
+            _pg_command('psql', config) + ['-v', 'ON_ERROR_STOP=1'], env, source
+        )
+        restore_seconds = time.monotonic() - started
+        report['restore_seconds'] = round(restore_seconds, 3)
+        report['bytes'] = source.bytes_read
+
+        if returncode != 0:
+            report['error'] = f"Restore into the scratch database failed: {stderr.strip()[-500:]}"
+            logger.error(f"Verification of backup {backup.BackupHistoryID} failed: {report['error']}")
+            return _record(backup, 'failed', report)
+
+        restored = _dump_scratch(config, env, columns)
+        counts = _count_rows(connection, sorted(set(expected) | set(restored)))
+        report['tables'] = compare_manifests(expected, restored, counts)
+
+        total_rows = sum(entry['rows'] for entry in expected.values())
+        rows_per_second = round(total_rows / restore_seconds, 1) if restore_seconds > 0 else None
+        report['rows'] = total_rows
+        status = 'passed' if all(entry['ok'] for entry in report['tables'].values()) else 'failed'
+
+        logger.info(
+            f"Verification of backup {backup.BackupHistoryID} {status}: {total_rows} rows in "
+            f"{restore_seconds:.1f}s ({rows_per_second} rows/s)"
+        )
+        return _record(backup, status, report, rows_per_second)
+
+    except BackupVerificationError as e:
+        report['error'] = str(e)
+        logger.error(f"Verification of backup {backup.BackupHistoryID} failed: {str(e)}")
+        return _record(backup, 'failed', report)
+
+    finally:
+        try:
+            _drop_public_schema(connection)
+        except Exception as e:
+            logger.warning(f"Could not clear the scratch database: {str(e)}")
+        connection.close()
@@ -0,0 +1,208 @@
+"""
+Bulk event operations: delete, add/remove a tag and move to a department
+for many events at once.
+
+Each operation is a handful of set-based statements inside one
+transaction: one DELETE per table in dependency order, INSERT ... SELECT
+for a new tag and one UPDATE of Event for a department move, per batch of
+up to BATCH_SIZE events. Raw SQL skips model signals, so the summary
+fields, statistics rollup, dedupe keys and archive cache are brought up
+to date here instead.
+"""
+import logging
+import time
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.events.caching import bump_archive_version
+from apps.events.dedupe import update_dedupe_keys
+from apps.events.models import Event, EventDepartment, EventLink, EventTag
+from apps.events.statistics import apply_changes, stat_rows
+from apps.events.summaries import refresh_event_summaries
+
+logger = logging.getLogger(__name__)
+
+# Events per statement; keeps the IN list within SQLite's parameter limit
+BATCH_SIZE = 500
+# Largest selection one request may change
+MAX_EVENTS = 10000
+
+# New primary keys generated by the database for INSERT ... SELECT
+UUID_SQL = {
+    'postgresql': "gen_random_uuid()",
+    'sqlite': "lower(hex(randomblob(16)))",
+}
+
+
+class BulkOperationError(Exception):
+    pass
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _column(model, field):
+    return connection.ops.quote_name(model._meta.get_field(field).column)
+
+
+def _batches(event_ids):
+    """Event ids as database values, BATCH_SIZE at a time, with a matching placeholder list"""
+    pk = Event._meta.pk
+    for start in range(0, len(event_ids), BATCH_SIZE):
+        batch = [pk.get_db_prep_value(event_id, connection) for event_id in event_ids[start:start + BATCH_SIZE]]
+        yield batch, ", ".join(["%s"] * len(batch))
+
+
+def _execute(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def _touch_sql():
+    """UPDATE statement prefix setting EventUpdatedAt to now, and the value to bind"""
+    now = Event._meta.get_field('EventUpdatedAt').get_db_prep_value(timezone.now(), connection)
+    return f"UPDATE {_table(Event)} SET {_column(Event, 'EventUpdatedAt')} = %s", now
+
+
+def _timed(operation):
+    """Run operation(event_ids) in a transaction and report rows affected and elapsed time"""
+
+    def run(event_ids, *args):
+        event_ids = list(dict.fromkeys(event_ids))
+        if len(event_ids) > MAX_EVENTS:
+            raise BulkOperationError(f"Select at most {MAX_EVENTS} events at a time ({len(event_ids)} selected).")
+        started = time.perf_counter()
+        with transaction.atomic():
+            affected = operation(event_ids, *args) if event_ids else {}
+            if event_ids:
+                bump_archive_version()
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Bulk {operation.__name__} on {len(event_ids)} events: {affected} in {elapsed_ms} ms")
+        return {'events': len(event_ids), 'affected': affected, 'elapsed_ms': elapsed_ms}
+
+    run.__name__ = operation.__name__
+    run.__doc__ = operation.__doc__
+    return run
+
+
+@_timed
+def delete_events(event_ids):
+    """Delete events with their tags, departments and links"""
+    before = stat_rows(event_ids)
+    affected = {}
+    # Junction tables first, then the events they point to
+    for model in (EventTag, EventDepartment, EventLink, Event):
+        column = _column(model, 'EventID')
+        for batch, placeholders in _batches(event_ids):
+            count = _execute(f"DELETE FROM {_table(model)} WHERE {column} IN ({placeholders})", batch)
+            affected[model._meta.db_table] = affected.get(model._meta.db_table, 0) + count
+    apply_changes([(row, None) for row in before.values()])
+    return affected
+
+
+@_timed
+def add_tag(event_ids, tag):
+    """Tag events that don't have the tag yet"""
+    uuid_sql = UUID_SQL.get(connection.vendor)
+    if uuid_sql is None:
+        raise BulkOperationError(f"Bulk tagging isn't supported on {connection.vendor}.")
+
+    tag_id = EventTag._meta.get_field('TagID').get_db_prep_value(tag.TagID, connection)
+    now = EventTag._meta.get_field('EventTagAssignedAt').get_db_prep_value(timezone.now(), connection)
+    event_table, event_column = _table(Event), _column(Event, 'EventID')
+    tag_table, tag_event, tag_tag = _table(EventTag), _column(EventTag, 'EventID'), _column(EventTag, 'TagID')
+    updated_sql, updated_at = _touch_sql()
+    inserted = 0
+    for batch, placeholders in _batches(event_ids):
+        # Touch the events about to gain the tag, so conditional GETs see the change
+        _execute(
+            f"{updated_sql} WHERE {event_column} IN ({placeholders}) "
+            f"AND NOT EXISTS (SELECT 1 FROM {tag_table} t WHERE t.{tag_event} = {event_table}.{event_column} "
+            f"AND t.{tag_tag} = %s)",
+            [updated_at, *batch, tag_id],
+        )
+        inserted += _execute(
+            f"INSERT INTO {tag_table} ({_column(EventTag, 'EventTagID')}, {tag_event}, {tag_tag}, "
+            f"{_column(EventTag, 'EventTagAssignedAt')}) "
+            f"SELECT {uuid_sql}, e.{event_column}, %s, %s FROM {event_table} e "
+            f"WHERE e.{event_column} IN ({placeholders}) "
+            f"AND NOT EXISTS (SELECT 1 FROM {tag_table} t WHERE t.{tag_event} = e.{event_column} AND t.{tag_tag} = %s)",
+            [tag_id, now, *batch, tag_id],
+        )
+    refresh_event_summaries(event_ids)
+    return {EventTag._meta.db_table: inserted}
+
+
+@_timed
+def remove_tag(event_ids, tag):
+    """Take a tag off events"""
+    tag_id = EventTag._meta.get_field('TagID').get_db_prep_value(tag.TagID, connection)
+    event_table, event_column = _table(Event), _column(Event, 'EventID')
+    tag_table, tag_event, tag_tag = _table(EventTag), _column(EventTag, 'EventID'), _column(EventTag, 'TagID')
+    updated_sql, updated_at = _touch_sql()
+    deleted = 0
+    for batch, placeholders in _batches(event_ids):
+        # Touch the events about to lose the tag, so conditional GETs see the change
+        _execute(
+            f"{updated_sql} WHERE {event_column} IN ({placeholders}) "
+            f"AND EXISTS (SELECT 1 FROM {tag_table} t WHERE t.{tag_event} = {event_table}.{event_column} "
+            f"AND t.{tag_tag} = %s)",
+            [updated_at, *batch, tag_id],
+        )
+        deleted += _execute(
+            f"DELETE FROM {tag_table} WHERE {tag_tag} = %s "
+            f"AND {tag_event} IN ({placeholders})",
+            [tag_id, *batch],
+        )
+    refresh_event_summaries(event_ids)
+    return {EventTag._meta.db_table: deleted}
+
+
+@_timed
+def move_to_department(event_ids, department):
+    """Make `department` the only department of the events"""
+    uuid_sql = UUID_SQL.get(connection.vendor)
+    if uuid_sql is None:
+        raise BulkOperationError(f"Bulk moves aren't supported on {connection.vendor}.")
+
+    before = stat_rows(event_ids)
+    dept_id = EventDepartment._meta.get_field('DepartmentID').get_db_prep_value(department.DepartmentID, connection)
+    now = timezone.now()
+    now_db = EventDepartment._meta.get_field('EventDepartmentAssignedAt').get_db_prep_value(now, connection)
+    event_table, event_column = _table(Event), _column(Event, 'EventID')
+    dept_table, dept_event = _table(EventDepartment), _column(EventDepartment, 'EventID')
+    affected = {'removed': 0, 'assigned': 0, Event._meta.db_table: 0}
+    for batch, placeholders in _batches(event_ids):
+        affected['removed'] += _execute(f"DELETE FROM {dept_table} WHERE {dept_event} IN ({placeholders})", batch)
+        affected['assigned'] += _execute(
+            f"INSERT INTO {dept_table} ({_column(EventDepartment, 'EventDepartmentID')}, {dept_event}, "
+            f"{_column(EventDepartment, 'DepartmentID')}, {_column(EventDepartment, 'EventDepartmentAssignedAt')}) "
+            f"SELECT {uuid_sql}, e.{event_column}, %s, %s FROM {event_table} e WHERE e.{event_column} IN ({placeholders})",
+            [dept_id, now_db, *batch],
+        )
+    # The summary fields change the same way for every event: one UPDATE
+    affected[Event._meta.db_table] = Event.objects.filter(pk__in=event_ids).update(
+        EventPrimaryDepartmentID=department.DepartmentID,
+        EventPrimaryDepartmentName=department.DepartmentName,
+        EventUpdatedAt=now,
+    )
+    apply_changes([(row, {**row, 'EventPrimaryDepartmentID': department.DepartmentID}) for row in before.values()])
+    update_dedupe_keys(event_ids)
+    return affected
+
+
+def department_conflicts(event_ids, department):
+    """Events that would duplicate another event (same title and date) in `department`"""
+    event_ids = set(event_ids)
+    seen = {}
+    conflicts = []
+    for event_id, title, date in Event.objects.filter(pk__in=event_ids).values_list('EventID', 'EventTitle', 'EventDate'):
+        key = Event.dedupe_key(title, date, department.DepartmentID)
+        if key in seen:
+            conflicts.append(event_id)
+        seen[key] = event_id
+    conflicts += Event.objects.filter(EventDedupeKey__in=list(seen)).exclude(pk__in=event_ids).values_list(
+        'EventID', flat=True
+    )
+    return conflicts
@@ -0,0 +1,127 @@
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils import timezone
+from apps.shared.cache_utils import bump_namespace_version_on_commit, get_namespace_version, get_or_set_versioned
+
+logger = logging.getLogger(__name__)
+
+# Every Event / Department / Tag write (and their junction rows) bumps this
+ARCHIVE_NAMESPACE = "archive"
+
+# Fragment names this process has recorded stats for
+FRAGMENT_NAMES = set()
+FRAGMENT_NAMES_KEY = "fragment-stats:names"
+LAST_FINGERPRINT_KEY = "archive-fingerprint:last"
+
+
+def get_archive_version():
+    """Current archive version; changes whenever archive content changes"""
+    return get_namespace_version(ARCHIVE_NAMESPACE)
+
+
+def bump_archive_version():
+    """Invalidate fragments and derived data once the current transaction commits"""
+    bump_namespace_version_on_commit(ARCHIVE_NAMESPACE)
+
+
+def _compute_archive_fingerprint():
+    from apps.events.models import Event
+
+    version = get_archive_version()
+    stats = Event.objects.aggregate(max_updated=Max('EventUpdatedAt'), total=Count('EventID'))
+    fingerprint = {
+        "version": version,
+        "max_updated": stats["max_updated"],
+        "total": stats["total"],
+        "changed_at": timezone.now(),
+    }
+
+    # Deletes, tag renames and junction-row writes don't move max(EventUpdatedAt)
+    # or the count, but they do bump the archive version; remember when it last moved
+    previous = cache.get(LAST_FINGERPRINT_KEY)
+    current = (version, stats["max_updated"], stats["total"])
+    if previous and (previous.get("version"), previous["max_updated"], previous["total"]) == current:
+        fingerprint["changed_at"] = previous["changed_at"]
+    else:
+        cache.set(LAST_FINGERPRINT_KEY, fingerprint, timeout=None)
+    return fingerprint
+
+
+def get_archive_fingerprint():
+    """
+    Cheap summary of the archive: its version, newest EventUpdatedAt, row
+    count and the time those last changed. Recomputed once per archive version.
+    """
+    return get_or_set_versioned(
+        ARCHIVE_NAMESPACE, "fingerprint", _compute_archive_fingerprint, fragment_cache_timeout()
+    )
+
+
+def get_archive_last_modified():
+    """Last-Modified for archive listings; accounts for deletes and other version bumps via changed_at"""
+    fingerprint = get_archive_fingerprint()
+    if fingerprint["max_updated"] is None:
+        return fingerprint["changed_at"]
+    return max(fingerprint["max_updated"], fingerprint["changed_at"])
+
+
+def fragment_cache_timeout():
+    return getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 600)
+
+
+def _stats_key(fragment_name, outcome):
+    return f"fragment-stats:{fragment_name}:{outcome}"
+
+
+def _register_fragment_name(fragment_name):
+    # Shared across workers so the stats endpoint sees fragments it never rendered
+    names = cache.get(FRAGMENT_NAMES_KEY) or set()
+    if fragment_name not in names:
+        cache.set(FRAGMENT_NAMES_KEY, names | {fragment_name}, timeout=None)
+    FRAGMENT_NAMES.add(fragment_name)
+
+
+def record_fragment_lookup(fragment_name, hit):
+    """Count a fragment cache hit or miss; counters never expire"""
+    if fragment_name not in FRAGMENT_NAMES:
+        _register_fragment_name(fragment_name)
+    key = _stats_key(fragment_name, "hits" if hit else "misses")
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Could not record fragment stats for {fragment_name}: {str(e)}")
+
+
+def get_fragment_cache_stats():
+    """Hit/miss counters for every known fragment, plus totals"""
+    names = sorted(FRAGMENT_NAMES | (cache.get(FRAGMENT_NAMES_KEY) or set()))
+    keys = [_stats_key(n, o) for n in names for o in ("hits", "misses")]
+    values = cache.get_many(keys) if keys else {}
+
+    fragments = {}
+    total_hits = total_misses = 0
+    for name in names:
+        hits = values.get(_stats_key(name, "hits"), 0)
+        misses = values.get(_stats_key(name, "misses"), 0)
+        total_hits += hits
+        total_misses += misses
+        lookups = hits + misses
+        fragments[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        }
+
+    lookups = total_hits + total_misses
+    return {
+        "archive_version": get_archive_version(),
+        "hits": total_hits,
+        "misses": total_misses,
+        "hit_ratio": round(total_hits / lookups, 4) if lookups else None,
+        "fragments": fragments,
+    }
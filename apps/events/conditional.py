@@ -0,0 +1,130 @@
+import hashlib
+from datetime import datetime, time
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib import messages
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from apps.events.caching import get_archive_fingerprint, get_archive_last_modified
+from apps.events.feeds import request_feed_index
+from apps.events.filters import invalid_filters
+from apps.shared.async_utils import get_user
+from apps.shared.reference_cache import get_departments
+
+
+def _skip_conditional(request):
+    # Flash messages and the empty-search warning make a response one-off
+    if len(messages.get_messages(request)):
+        return True
+    return 'q' in request.GET and not request.GET.get('q', '').strip()
+
+
+def _archive_validator(*parts):
+    fingerprint = get_archive_fingerprint()
+    raw = "|".join(
+        [
+            str(fingerprint["version"]), str(fingerprint["max_updated"]), str(fingerprint["total"]),
+            str(fingerprint["changed_at"]),
+        ]
+        + [str(p) for p in parts]
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _query_signature(request):
+    return "&".join(f"{k}={v}" for k, v in sorted(request.GET.lists()))
+
+
+def events_page_etag(request, *args, **kwargs):
+    """ETag for the events page: archive fingerprint + filters + viewer"""
+    if _skip_conditional(request):
+        return None
+
+    if request.user.is_authenticated:
+        # Admin/staff pages embed CSRF tokens and role-specific controls
+        viewer = (
+            f"{request.user.pk}:{request.user.isUserAdmin}:{request.user.isUserStaff}:"
+            f"{request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')}"
+        )
+    else:
+        viewer = "anonymous"
+
+    departments = ",".join(f"{d.DepartmentID}={d.DepartmentName}" for d in get_departments())
+    # The page header shows the current month
+    month = timezone.localdate().strftime("%Y-%m")
+    return _archive_validator(_query_signature(request), viewer, departments, month)
+
+
+def events_page_last_modified(request, *args, **kwargs):
+    if _skip_conditional(request):
+        return None
+    return get_archive_last_modified()
+
+
+def calendar_etag(request, *args, **kwargs):
+    """ETag for the calendar: as the events page, plus the day it highlights as today"""
+    etag = events_page_etag(request, *args, **kwargs)
+    if etag is None:
+        return None
+    return hashlib.sha1(f"{etag}|{timezone.localdate().isoformat()}".encode("utf-8")).hexdigest()
+
+
+def calendar_last_modified(request, *args, **kwargs):
+    """The archive's last change, but no earlier than the start of today, when the highlighted day moved"""
+    if _skip_conditional(request):
+        return None
+    last_modified = get_archive_last_modified()
+    today = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+    return max(last_modified, today) if last_modified else today
+
+
+def search_api_etag(request, *args, **kwargs):
+    """ETag for the search API: results only depend on the archive and the query"""
+    return _archive_validator("search", _query_signature(request))
+
+
+def search_api_last_modified(request, *args, **kwargs):
+    return get_archive_last_modified()
+
+
+def feed_etag(request, *args, **kwargs):
+    """ETag for a syndication feed: the revisions of the events it lists, read from the cached feed index"""
+    if invalid_filters(request.GET):
+        return None
+    return request_feed_index(request)['etag']
+
+
+def feed_last_modified(request, *args, **kwargs):
+    if invalid_filters(request.GET):
+        return None
+    return request_feed_index(request)['last_modified']
+
+
+def archive_cache_control(view_func):
+    """
+    Public, always-revalidated caching for anonymous visitors; private,
+    no-cache for signed-in users. Either way clients keep the ETag and
+    send it back, so unchanged responses come back as 304s.
+    """
+    def patch(response, user):
+        if user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_wrapped_view(request, *args, **kwargs):
+            response = await view_func(request, *args, **kwargs)
+            return patch(response, await get_user(request))
+
+        return _async_wrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        return patch(view_func(request, *args, **kwargs), request.user)
+
+    return _wrapped_view
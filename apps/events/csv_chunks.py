@@ -0,0 +1,36 @@
+"""
+CSV formatting for event exports. Export jobs run write_csv_chunk inside
+worker processes, so this module must not import Django.
+"""
+import csv
+import gzip
+
+CSV_HEADER = ['Event Title', 'Date', 'Department', 'Description', 'Platform(s)', 'Tag(s)', 'Link(s)']
+
+
+def format_row(title, event_date, department, description, platforms, tags, links):
+    """One export row; `links` is a sequence of (name, url) pairs"""
+    return [
+        title,
+        event_date.strftime('%Y-%m-%d'),
+        department or "N/A",
+        description,
+        platforms,
+        tags,
+        ", ".join(f"{name}: {url}" for name, url in links),
+    ]
+
+
+def write_csv_chunk(path, rows, header=False):
+    """
+    Format `rows` (format_row arguments) as CSV into a gzip member at `path`.
+    Gzip members concatenate into one valid .csv.gz, so chunks can be
+    written in parallel and joined byte-for-byte afterwards.
+    """
+    with gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6) as fh:
+        writer = csv.writer(fh)
+        if header:
+            writer.writerow(CSV_HEADER)
+        for row in rows:
+            writer.writerow(format_row(*row))
+    return path, len(rows)
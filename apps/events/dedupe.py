@@ -0,0 +1,125 @@
+"""
+Duplicate events.
+
+Exact duplicates (same normalized title, date and primary department) are
+stopped by the unique EventDedupeKey, which Event.save() computes. Events
+created before the key existed, or written by paths that skip save(),
+get theirs from assign_dedupe_keys(); when several share a key the oldest
+keeps it and the rest stay NULL until cleaned up.
+
+Near duplicates ("Intramurals 2025" / "Intramurals  2025 ") are found by
+find_near_duplicates(), which only compares titles within a block of
+events sharing a date and department instead of every pair.
+"""
+import logging
+from difflib import SequenceMatcher
+from itertools import groupby
+from django.db import transaction
+from apps.events.models import Event
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMILARITY = 0.85
+KEY_FIELDS = ['EventTitle', 'EventDate', 'EventPrimaryDepartmentID']
+
+
+def is_duplicate(title, date, department_id, exclude=None):
+    """Whether another event already has this title, date and department"""
+    key = Event.dedupe_key(title, date, department_id)
+    if key is None:
+        return False
+    duplicates = Event.objects.filter(EventDedupeKey=key)
+    if exclude is not None:
+        duplicates = duplicates.exclude(pk=exclude.pk)
+    return duplicates.exists()
+
+
+@transaction.atomic
+def update_dedupe_keys(event_ids, batch_size=500):
+    """Recompute keys after a primary department change made outside Event.save()"""
+    keys = {
+        event_id: Event.dedupe_key(title, date, dept_id)
+        for event_id, title, date, dept_id in Event.objects.filter(pk__in=list(event_ids)).values_list(
+            'EventID', *KEY_FIELDS
+        )
+    }
+    taken = set(
+        Event.objects.filter(EventDedupeKey__in=[key for key in keys.values() if key])
+        .exclude(pk__in=list(keys))
+        .values_list('EventDedupeKey', flat=True)
+    )
+    for event_id, key in keys.items():
+        if key in taken:
+            # Another event already has this title/date/department; leave this one for cleanup
+            logger.warning(f"Event {event_id} duplicates an existing event; dedupe key cleared")
+            keys[event_id] = None
+        elif key is not None:
+            taken.add(key)
+
+    _store_keys(keys, batch_size)
+
+
+def _store_keys(keys, batch_size):
+    # Clear first so a key can move from one event to another without a transient clash
+    event_ids = list(keys)
+    for start in range(0, len(event_ids), batch_size):
+        Event.objects.filter(pk__in=event_ids[start:start + batch_size]).update(EventDedupeKey=None)
+    Event.objects.bulk_update(
+        [Event(EventID=event_id, EventDedupeKey=key) for event_id, key in keys.items() if key is not None],
+        ['EventDedupeKey'],
+        batch_size=batch_size,
+    )
+
+
+@transaction.atomic
+def assign_dedupe_keys(batch_size=500):
+    """Recompute every event's key, oldest first; returns the number of events whose key changed"""
+    taken = set()
+    changed = {}
+    rows = Event.objects.order_by('EventCreatedAt', 'EventID').values_list('EventID', *KEY_FIELDS, 'EventDedupeKey')
+    for event_id, title, date, dept_id, current in rows.iterator(chunk_size=2000):
+        key = Event.dedupe_key(title, date, dept_id)
+        if key in taken:
+            key = None
+        elif key is not None:
+            taken.add(key)
+        if key != current:
+            changed[event_id] = key
+
+    _store_keys(changed, batch_size)
+    return len(changed)
+
+
+def find_near_duplicates(threshold=DEFAULT_SIMILARITY, start=None, end=None):
+    """
+    Pairs of events on the same date in the same department whose
+    normalized titles are at least `threshold` similar, as
+    ([(similarity, event_a, event_b)], comparisons made), most similar first.
+    """
+    events = Event.objects.order_by('EventPrimaryDepartmentID', '-EventDate', 'EventCreatedAt').values(
+        'EventID', 'EventTitle', 'EventDate', 'EventPrimaryDepartmentID', 'EventPrimaryDepartmentName',
+        'EventCreatedAt', 'EventDedupeKey',
+    )
+    if start:
+        events = events.filter(EventDate__gte=start)
+    if end:
+        events = events.filter(EventDate__lte=end)
+
+    pairs = []
+    comparisons = 0
+    blocks = groupby(events.iterator(chunk_size=2000), key=lambda row: (row['EventPrimaryDepartmentID'], row['EventDate']))
+    for _, block in blocks:
+        block = list(block)
+        titles = [Event.normalize_title(row['EventTitle']) for row in block]
+        for i in range(len(block)):
+            for j in range(i + 1, len(block)):
+                comparisons += 1
+                matcher = SequenceMatcher(None, titles[i], titles[j])
+                # Cheap upper bounds first; ratio() is the expensive part
+                if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                    continue
+                similarity = matcher.ratio()
+                if similarity >= threshold:
+                    pairs.append((similarity, block[i], block[j]))
+    pairs.sort(key=lambda pair: -pair[0])
+    return pairs, comparisons
@@ -0,0 +1,97 @@
+"""
+Month and week calendar data.
+
+Events are read a month at a time with one range query on the
+(EventDate, EventTime) index, selecting only the columns the calendar
+shows, and grouped into day buckets here. Each month's buckets are cached
+under the archive version, so paging through months only queries a month
+the first time it is shown after an archive change. Week views reuse the
+buckets of the one or two months they overlap.
+"""
+import calendar
+from datetime import date, timedelta
+from apps.events.caching import ARCHIVE_NAMESPACE, fragment_cache_timeout
+from apps.events.models import Event
+from apps.shared.cache_utils import get_or_set_versioned
+
+# Weeks start on Sunday, as on the printed school calendar
+FIRST_WEEKDAY = calendar.SUNDAY
+VIEWS = ('month', 'week')
+
+
+def month_bounds(year, month):
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def week_start(day):
+    return day - timedelta(days=(day.weekday() - FIRST_WEEKDAY) % 7)
+
+
+def build_month_buckets(year, month):
+    """{date: [event, ...]} for one month, in date and time order"""
+    first, last = month_bounds(year, month)
+    rows = (
+        Event.objects.filter(EventDate__range=(first, last))
+        .order_by('EventDate', 'EventTime')
+        .values_list('EventID', 'EventTitle', 'EventDate', 'EventTime', 'EventLocation', 'EventPrimaryDepartmentName')
+    )
+    buckets = {}
+    for event_id, title, day, time, location, department in rows:
+        buckets.setdefault(day, []).append({
+            'id': str(event_id),
+            'title': title,
+            'time': time.strftime("%H:%M") if time else '',
+            'location': location,
+            'department': department,
+        })
+    return buckets
+
+
+def get_month_buckets(year, month):
+    return get_or_set_versioned(
+        ARCHIVE_NAMESPACE, f"calendar:{year:04d}-{month:02d}",
+        lambda: build_month_buckets(year, month), fragment_cache_timeout(),
+    )
+
+
+def _day(day, buckets, in_range=True):
+    return {'date': day, 'in_range': in_range, 'events': buckets.get(day, []) if in_range else []}
+
+
+def month_calendar(year, month):
+    """Weeks of days for a month grid; days from neighbouring months are placeholders"""
+    buckets = get_month_buckets(year, month)
+    first, last = month_bounds(year, month)
+    weeks = [
+        [_day(day, buckets, day.month == month) for day in week]
+        for week in calendar.Calendar(FIRST_WEEKDAY).monthdatescalendar(year, month)
+    ]
+    previous_month = first - timedelta(days=1)
+    next_month = last + timedelta(days=1)
+    return {
+        'view': 'month',
+        'start': first,
+        'end': last,
+        'title': first.strftime("%B %Y"),
+        'weeks': weeks,
+        'previous': previous_month.strftime("%Y-%m"),
+        'next': next_month.strftime("%Y-%m"),
+    }
+
+
+def week_calendar(day):
+    """The seven days of the week containing `day`"""
+    start = week_start(day)
+    end = start + timedelta(days=6)
+    buckets = dict(get_month_buckets(start.year, start.month))
+    if end.month != start.month:
+        buckets.update(get_month_buckets(end.year, end.month))
+    return {
+        'view': 'week',
+        'start': start,
+        'end': end,
+        'title': f"{start:%b %d} – {end:%b %d, %Y}",
+        'weeks': [[_day(start + timedelta(days=offset), buckets) for offset in range(7)]],
+        'previous': (start - timedelta(days=7)).isoformat(),
+        'next': (end + timedelta(days=1)).isoformat(),
+    }
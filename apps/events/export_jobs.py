@@ -0,0 +1,240 @@
+"""
+Offline CSV export for large archives, plus the streamed NDJSON export.
+
+The filtered, ordered event ids are split into ranges; the job thread
+fetches each range from the database while a process pool formats and
+gzips the previous ones. The chunk files are concatenated into a single
+.csv.gz and stored on S3 (or local storage when S3 isn't configured).
+"""
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.utils import timezone
+from apps.events.csv_chunks import write_csv_chunk
+from apps.events.filters import filter_events
+from apps.events.models import Event, EventLink, ExportJob
+from apps.events.ndjson_format import EventEncoder
+from apps.events.upload_to_cloud import upload_backup_to_cloud
+
+logger = logging.getLogger(__name__)
+
+# CSV rows (csv_chunks.format_row order)
+ROW_FIELDS = (
+    'EventID', 'EventTitle', 'EventDate', 'EventPrimaryDepartmentName', 'EventDescription',
+    'EventPlatforms', 'EventTagNames',
+)
+# NDJSON rows (ndjson_format.EventEncoder.encode order)
+NDJSON_FIELDS = (
+    'EventID', 'EventTitle', 'EventDate', 'EventTime', 'EventLocation', 'EventPrimaryDepartmentName',
+    'EventTagNames', 'EventCreatedAt', 'EventUpdatedAt', 'EventDescription',
+)
+
+
+def export_workers():
+    return getattr(settings, 'EXPORT_JOB_WORKERS', 0)
+
+
+def export_chunk_size():
+    return max(1, getattr(settings, 'EXPORT_JOB_CHUNK_SIZE', 5000))
+
+
+def export_storage():
+    return FileSystemStorage(location=settings.EXPORT_LOCAL_ROOT)
+
+
+def _s3_configured():
+    return bool(settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY and settings.AWS_STORAGE_BUCKET_NAME)
+
+
+# ---------------------------------------------------------
+# Starting jobs
+# ---------------------------------------------------------
+def export_stale_after():
+    return timedelta(seconds=getattr(settings, 'EXPORT_JOB_STALE_SECONDS', 600))
+
+
+def start_export_job(user, filters):
+    """
+    Create an export job for `filters` and run it on a background thread.
+    An unfinished job from the same user with the same filters is reused
+    while its heartbeat is recent; one that stopped (e.g. its worker was
+    restarted) is marked failed instead.
+    """
+    unfinished = ExportJob.objects.filter(
+        ExportRequestedBy=user,
+        ExportFilters=filters,
+        ExportStatus__in=['queued', 'in_progress'],
+    )
+    cutoff = timezone.now() - export_stale_after()
+    stale = unfinished.filter(ExportUpdatedAt__lt=cutoff).update(
+        ExportStatus='failed', ExportMessage="Export stopped responding.", ExportCompletedAt=timezone.now(),
+    )
+    if stale:
+        logger.warning(f"Marked {stale} stale export jobs of user {user.pk} as failed")
+
+    existing = unfinished.filter(ExportUpdatedAt__gte=cutoff).order_by('-ExportCreatedAt').first()
+    if existing:
+        return existing
+
+    job = ExportJob.objects.create(ExportRequestedBy=user, ExportFilters=filters)
+
+    thread = threading.Thread(target=run_export_job, args=(str(job.ExportJobID),))
+    thread.daemon = True
+    thread.start()
+    return job
+
+
+# ---------------------------------------------------------
+# Running jobs
+# ---------------------------------------------------------
+def _update(job_id, **fields):
+    """Update the job row; every update also moves the heartbeat"""
+    ExportJob.objects.filter(ExportJobID=job_id).update(ExportUpdatedAt=timezone.now(), **fields)
+
+
+def iter_id_ranges(ids, size):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def fetch_event_rows(id_range, fields=ROW_FIELDS):
+    """
+    (EventID, values of the remaining `fields`, [(link name, url), ...])
+    for one id range, in the range's order. `fields` starts with EventID.
+    """
+    rows = {row[0]: row[1:] for row in Event.objects.filter(EventID__in=id_range).values_list(*fields)}
+
+    links = defaultdict(list)
+    for event_id, name, url in (
+        EventLink.objects.filter(EventID__in=id_range).values_list('EventID', 'EventLinkName', 'EventLinkURL')
+    ):
+        links[event_id].append((name, url))
+
+    # Events deleted since the id list was taken are skipped
+    return [(event_id, rows[event_id], links[event_id]) for event_id in id_range if event_id in rows]
+
+
+def stream_ndjson_export(events):
+    """Yield the compact NDJSON export (see ndjson_format) for a filtered queryset"""
+    encoder = EventEncoder()
+    yield encoder.header()
+
+    ids = list(events.values_list('EventID', flat=True))
+    for id_range in iter_id_ranges(ids, export_chunk_size()):
+        for event_id, values, links in fetch_event_rows(id_range, NDJSON_FIELDS):
+            title, event_date, event_time, location, department, tag_names, created, updated, description = values
+            yield encoder.encode(
+                event_id, title, event_date, event_time, location, department,
+                tag_names.split(Event.SUMMARY_SEPARATOR) if tag_names else [],
+                links, created, updated, description,
+            )
+
+
+def _pool():
+    workers = export_workers()
+    if workers <= 0:
+        return None
+    # spawn: the job runs on a thread inside a web worker, where fork isn't safe
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def _write_chunks(job_id, ids, workdir):
+    """Format every id range into a gzip chunk file; returns the paths in order"""
+    pool = _pool()
+    max_in_flight = max(1, export_workers()) * 2
+    pending = deque()
+    paths = []
+    processed = 0
+    total = len(ids)
+
+    def collect(future_or_result):
+        nonlocal processed
+        path, count = future_or_result.result() if pool else future_or_result
+        paths.append(path)
+        processed += count
+        _update(job_id, ExportProcessedRows=processed, ExportProgress=int(processed * 100 / total) if total else 100)
+
+    try:
+        # The header gets its own chunk so every range is formatted the same way
+        paths.append(write_csv_chunk(os.path.join(workdir, "chunk_header.csv.gz"), [], header=True)[0])
+
+        for index, id_range in enumerate(iter_id_ranges(ids, export_chunk_size())):
+            rows = [values + (links,) for _, values, links in fetch_event_rows(id_range)]
+            path = os.path.join(workdir, f"chunk_{index:06d}.csv.gz")
+            if pool is None:
+                collect(write_csv_chunk(path, rows))
+                continue
+
+            pending.append(pool.submit(write_csv_chunk, path, rows))
+            # Keep a bounded number of chunks in memory / in flight
+            while len(pending) >= max_in_flight:
+                collect(pending.popleft())
+
+        while pending:
+            collect(pending.popleft())
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    return paths
+
+
+def _store(final_path, filename):
+    """Store the finished file; returns (storage, key)"""
+    if _s3_configured():
+        log = StringIO()
+        key = upload_backup_to_cloud(final_path, log, folder="exports")
+        if not key:
+            raise RuntimeError(f"Upload failed: {log.getvalue().strip()}")
+        return 's3', key
+
+    with open(final_path, 'rb') as fh:
+        key = export_storage().save(f"exports/{filename}", File(fh))
+    return 'local', key
+
+
+def run_export_job(job_id):
+    """Background export; records progress and the outcome on the ExportJob row"""
+    workdir = tempfile.mkdtemp(prefix="arcasys_export_")
+    try:
+        job = ExportJob.objects.get(ExportJobID=job_id)
+        ids = list(filter_events(job.ExportFilters).values_list('EventID', flat=True))
+        _update(
+            job_id, ExportStatus='in_progress', ExportTotalRows=len(ids), ExportProcessedRows=0,
+            ExportMessage=f"Exporting {len(ids)} events...",
+        )
+
+        chunk_paths = _write_chunks(job_id, ids, workdir)
+
+        filename = f"Arcasys_Events_{timezone.localtime().strftime('%Y-%m-%d_%H-%M')}_{str(job_id)[:8]}.csv.gz"
+        final_path = os.path.join(workdir, filename)
+        with open(final_path, 'wb') as out:
+            for path in chunk_paths:
+                with open(path, 'rb') as chunk:
+                    shutil.copyfileobj(chunk, out)
+
+        _update(job_id, ExportMessage=f"Storing {len(ids)} exported events...")
+        storage, key = _store(final_path, filename)
+        _update(
+            job_id, ExportStatus='completed', ExportProgress=100, ExportStorage=storage, ExportFile=key,
+            ExportMessage=f"Exported {len(ids)} events.", ExportCompletedAt=timezone.now(),
+        )
+        logger.info(f"Export job {job_id} finished: {len(ids)} events in {len(chunk_paths) - 1} chunks")
+
+    except Exception as e:
+        logger.error(f"Export job {job_id} failed: {str(e)}")
+        _update(job_id, ExportStatus='failed', ExportMessage=f"Export failed: {str(e)}", ExportCompletedAt=timezone.now())
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        connection.close()
@@ -0,0 +1,119 @@
+"""
+Facet counts for the events page: events per department, per platform and
+per tag (top N) for the current search and date range.
+
+All facets come from one UNION ALL of grouped queries over the filtered
+events, and the result is cached in the archive namespace, so any event
+write invalidates it. The unfiltered page always hits the "baseline" entry.
+Department and platform selections narrow the results but not the counts,
+so each option shows how many events picking it would give.
+"""
+import hashlib
+import uuid
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Cast
+from apps.events.caching import ARCHIVE_NAMESPACE, fragment_cache_timeout
+from apps.events.filters import filter_events, filter_params
+from apps.events.models import EventLink, EventTag
+from apps.shared.cache_utils import get_or_set_versioned
+from apps.shared.reference_cache import get_departments
+
+# Platform options offered by the filter, in display order
+PLATFORMS = ['Zoom', 'Teams', 'Onsite', 'Facebook', 'YouTube', 'TikTok']
+
+# Filters the counts follow; department/platform/tag selections don't change them
+FACET_SCOPE_KEYS = ('q', 'from_date', 'to_date')
+
+DEFAULT_TAG_LIMIT = 10
+
+
+def facet_scope(params):
+    return {key: value for key, value in filter_params(params).items() if key in FACET_SCOPE_KEYS}
+
+
+def _normalize_id(value):
+    # UUIDs cast to text are dashed on PostgreSQL and bare hex on SQLite
+    return str(uuid.UUID(str(value)))
+
+
+def _grouped(queryset, facet, value, label, counted):
+    return queryset.order_by().values(
+        facet=Value(facet, output_field=CharField()),
+        value=value,
+        label=label,
+    ).annotate(hits=counted)
+
+
+def count_facets(scope):
+    """Raw counts for a scope (see facet_scope), in a single query"""
+    events = filter_events(scope).order_by()
+    event_ids = events.values('EventID')
+    blank = Value('', output_field=CharField())
+
+    total = _grouped(events, 'total', blank, blank, Count('EventID'))
+    departments = _grouped(
+        events.filter(EventPrimaryDepartmentID__isnull=False), 'department',
+        Cast('EventPrimaryDepartmentID', CharField()), F('EventPrimaryDepartmentName'), Count('EventID'),
+    )
+    platforms = _grouped(
+        EventLink.objects.filter(EventID__in=event_ids), 'platform',
+        F('EventLinkPlatform'), F('EventLinkPlatform'), Count('EventID', distinct=True),
+    )
+    tags = _grouped(
+        EventTag.objects.filter(EventID__in=event_ids), 'tag',
+        Cast('TagID', CharField()), F('TagID__TagName'), Count('EventID', distinct=True),
+    )
+
+    counts = {'total': 0, 'departments': {}, 'platforms': {}, 'tags': []}
+    for row in total.union(departments, platforms, tags, all=True):
+        if row['facet'] == 'total':
+            counts['total'] = row['hits']
+        elif row['facet'] == 'department':
+            counts['departments'][_normalize_id(row['value'])] = row['hits']
+        elif row['facet'] == 'platform':
+            counts['platforms'][row['value']] = row['hits']
+        else:
+            counts['tags'].append((_normalize_id(row['value']), row['label'], row['hits']))
+    counts['tags'].sort(key=lambda tag: (-tag[2], tag[1].casefold()))
+    return counts
+
+
+def get_facet_counts(params):
+    """Cached count_facets for the request's scope; the unfiltered page shares one baseline entry"""
+    scope = facet_scope(params)
+    if scope:
+        signature = "&".join(f"{key}={value}" for key, value in sorted(scope.items()))
+        name = f"facets:{hashlib.sha1(signature.encode('utf-8')).hexdigest()}"
+    else:
+        name = "facets:baseline"
+    return get_or_set_versioned(ARCHIVE_NAMESPACE, name, lambda: count_facets(scope), fragment_cache_timeout())
+
+
+def get_facets(params, tag_limit=DEFAULT_TAG_LIMIT):
+    """Facet options with counts for templates, marking the ones currently selected"""
+    counts = get_facet_counts(params)
+    selected = filter_params(params)
+    return {
+        'total': counts['total'],
+        'departments': [
+            {
+                'id': str(dept.DepartmentID),
+                'name': dept.DepartmentName,
+                'count': counts['departments'].get(str(dept.DepartmentID), 0),
+                'selected': selected.get('department') == str(dept.DepartmentID),
+            }
+            for dept in get_departments()
+        ],
+        'platforms': [
+            {
+                'name': platform,
+                'count': counts['platforms'].get(EventLink.normalize_platform(platform), 0),
+                'selected': selected.get('platform') == platform,
+            }
+            for platform in PLATFORMS
+        ],
+        'tags': [
+            {'id': tag_id, 'name': name, 'count': count, 'selected': selected.get('tag') == tag_id}
+            for tag_id, name, count in counts['tags'][:tag_limit]
+        ],
+    }
@@ -0,0 +1,254 @@
+"""
+iCalendar and Atom feeds of the newest events, optionally for one
+department or tag.
+
+Serving a feed takes three steps:
+- The feed index is cached per archive version. It holds the newest N
+  events' rows, a revision hash per event and the newest EventUpdatedAt.
+- Conditional GET is answered from the index alone, so a poll that finds
+  nothing changed costs a cache read.
+- Each event is serialized once per revision. Fragments are cached by
+  (format, event, revision) and reused when the archive changes
+  elsewhere. The response streams the header, the cached fragments and
+  the footer.
+"""
+import hashlib
+import re
+from datetime import datetime, timezone as dt_timezone
+from xml.sax.saxutils import escape, quoteattr
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from apps.events.caching import ARCHIVE_NAMESPACE, fragment_cache_timeout
+from apps.events.filters import filter_events
+from apps.events.models import Event
+from apps.shared.cache_utils import get_or_set_versioned
+from apps.shared.metrics import REGISTRY
+from apps.shared.reference_cache import get_department, get_tag_lookup
+
+FEED_FILTER_KEYS = ('department', 'tag')
+FEED_FIELDS = [
+    'EventID', 'EventTitle', 'EventDescription', 'EventDate', 'EventTime', 'EventLocation',
+    'EventCreatedAt', 'EventUpdatedAt', 'EventPrimaryDepartmentName', 'EventTagNames',
+]
+MAX_LIMIT = 200
+
+FEED_FRAGMENT_REQUESTS = REGISTRY.counter(
+    "arcasys_feed_fragment_requests_total", "Feed entry fragment lookups, by format and hit or miss"
+)
+
+# Characters XML 1.0 doesn't allow, even escaped
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def default_limit():
+    return getattr(settings, 'FEED_MAX_EVENTS', 50)
+
+
+def feed_scope(params):
+    """The feed filters and size from a request's query string"""
+    scope = {key: params.get(key, '').strip().lower() for key in FEED_FILTER_KEYS if params.get(key, '').strip()}
+    try:
+        scope['limit'] = min(max(int(params.get('limit', '')), 1), MAX_LIMIT)
+    except ValueError:
+        scope['limit'] = default_limit()
+    return scope
+
+
+def _revision(row):
+    raw = "|".join(str(row[field]) for field in FEED_FIELDS)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def build_feed_index(scope):
+    rows = list(
+        filter_events(scope).order_by('-EventDate', '-EventTime').values(*FEED_FIELDS)[:scope['limit']]
+    )
+    for row in rows:
+        row['revision'] = _revision(row)
+    signature = "|".join(row['revision'] for row in rows)
+    return {
+        'rows': rows,
+        'etag': hashlib.sha1(f"{sorted(scope.items())}|{signature}".encode('utf-8')).hexdigest(),
+        'last_modified': max((row['EventUpdatedAt'] for row in rows), default=None),
+    }
+
+
+def get_feed_index(scope):
+    name = "feed:" + "&".join(f"{key}={value}" for key, value in sorted(scope.items()))
+    return get_or_set_versioned(ARCHIVE_NAMESPACE, name, lambda: build_feed_index(scope), fragment_cache_timeout())
+
+
+def request_feed_index(request):
+    """The feed index for a request, looked up once and shared by the validators and the view"""
+    if not hasattr(request, '_feed_index'):
+        request._feed_index = get_feed_index(feed_scope(request.GET))
+    return request._feed_index
+
+
+def feed_title(scope):
+    title = "CIT-U Marketing Archive events"
+    department = get_department(scope['department']) if 'department' in scope else None
+    if department:
+        title += f" – {department.DepartmentName}"
+    if 'tag' in scope:
+        tag = next((tag for tag in get_tag_lookup().values() if str(tag.TagID) == scope['tag']), None)
+        if tag:
+            title += f" #{tag.TagName}"
+    return title
+
+
+# ---------------------------------------------------------
+# iCalendar (RFC 5545)
+# ---------------------------------------------------------
+def _ical_text(value):
+    return (
+        (value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n')
+    )
+
+
+def _ical_fold(line):
+    """Fold a content line at 75 octets without splitting a UTF-8 character"""
+    data = line.encode('utf-8')
+    parts = []
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        while cut > 0 and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut])
+        data = data[cut:]
+        limit = 74  # continuation lines start with a space
+    parts.append(data)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _ical_utc(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _ical_start(row):
+    start = datetime.combine(row['EventDate'], row['EventTime'])
+    return _ical_utc(timezone.make_aware(start, timezone.get_default_timezone()))
+
+
+def ical_event(row):
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{row['EventID']}@arcasys",
+        f"DTSTAMP:{_ical_utc(row['EventUpdatedAt'])}",
+        f"CREATED:{_ical_utc(row['EventCreatedAt'])}",
+        f"LAST-MODIFIED:{_ical_utc(row['EventUpdatedAt'])}",
+        f"DTSTART:{_ical_start(row)}",
+        f"SUMMARY:{_ical_text(row['EventTitle'])}",
+        f"LOCATION:{_ical_text(row['EventLocation'])}",
+        f"DESCRIPTION:{_ical_text(row['EventDescription'])}",
+    ]
+    # Department first, then tags, so calendar apps can colour or filter by either
+    categories = [row['EventPrimaryDepartmentName']] + row['EventTagNames'].split(Event.SUMMARY_SEPARATOR)
+    categories = [category for category in categories if category]
+    if categories:
+        lines.append("CATEGORIES:" + ",".join(_ical_text(category) for category in categories))
+    lines.append("END:VEVENT")
+    return b"".join(_ical_fold(line) for line in lines)
+
+
+def ical_header(title):
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//CIT-U Marketing Archive//Events//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_ical_text(title)}",
+    ]
+    return b"".join(_ical_fold(line) for line in lines)
+
+
+def ical_footer():
+    return b"END:VCALENDAR\r\n"
+
+
+# ---------------------------------------------------------
+# Atom (RFC 4287)
+# ---------------------------------------------------------
+def _xml_text(value):
+    return escape(_XML_INVALID.sub('', value or ''))
+
+
+def _atom_time(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def atom_entry(row):
+    when = f"{row['EventDate']:%b %d, %Y}" + (f" {row['EventTime']:%H:%M}" if row['EventTime'] else '')
+    summary = " · ".join(part for part in (when, row['EventLocation'], row['EventPrimaryDepartmentName']) if part)
+    parts = [
+        "<entry>",
+        f"<id>urn:uuid:{row['EventID']}</id>",
+        f"<title>{_xml_text(row['EventTitle'])}</title>",
+        f"<updated>{_atom_time(row['EventUpdatedAt'])}</updated>",
+        f"<published>{_atom_time(row['EventCreatedAt'])}</published>",
+        f"<summary>{_xml_text(summary)}</summary>",
+        f"<content type=\"text\">{_xml_text(row['EventDescription'])}</content>",
+    ]
+    parts += [
+        f"<category term={quoteattr(_XML_INVALID.sub('', tag))}/>"
+        for tag in row['EventTagNames'].split(Event.SUMMARY_SEPARATOR) if tag
+    ]
+    parts.append("</entry>\n")
+    return "".join(parts).encode('utf-8')
+
+
+def atom_header(title, index, feed_url, site_url):
+    updated = index['last_modified'] or timezone.now()
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        f"<id>{_xml_text(feed_url)}</id>\n"
+        f"<title>{_xml_text(title)}</title>\n"
+        f"<updated>{_atom_time(updated)}</updated>\n"
+        f"<link rel=\"self\" href={quoteattr(feed_url)}/>\n"
+        f"<link rel=\"alternate\" href={quoteattr(site_url)}/>\n"
+        "<author><name>CIT-U Marketing Archive</name></author>\n"
+    ).encode('utf-8')
+
+
+def atom_footer():
+    return b"</feed>\n"
+
+
+# ---------------------------------------------------------
+# Fragments
+# ---------------------------------------------------------
+SERIALIZERS = {'ical': ical_event, 'atom': atom_entry}
+
+
+def feed_fragments(fmt, rows):
+    """
+    Yield serialized entries in feed order as they are produced. Fragments
+    are cached by event revision, so unchanged events are never re-rendered;
+    the cache is read in one call up front and new ones stored after the last.
+    """
+    keys = {row['EventID']: f"feed-fragment:{fmt}:{row['EventID']}:{row['revision']}" for row in rows}
+    cached = cache.get_many(list(keys.values()))
+    missing = {}
+    for row in rows:
+        key = keys[row['EventID']]
+        fragment = cached.get(key)
+        if fragment is None:
+            FEED_FRAGMENT_REQUESTS.inc(format=fmt, result="miss")
+            fragment = SERIALIZERS[fmt](row)
+            missing[key] = fragment
+        else:
+            FEED_FRAGMENT_REQUESTS.inc(format=fmt, result="hit")
+        yield fragment
+    if missing:
+        cache.set_many(missing, getattr(settings, 'FEED_FRAGMENT_TIMEOUT', 86400))
+
+
+def stream_feed(header, fragments, footer):
+    yield header
+    yield from fragments
+    yield footer
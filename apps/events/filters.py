@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime
+from django.db.models import Q
+from apps.events.models import Event, EventLink, EventTag
+
+# Query-string keys understood by filter_events (also what export jobs store)
+FILTER_KEYS = ('q', 'department', 'platform', 'tag', 'from_date', 'to_date')
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_uuid(value):
+    try:
+        return uuid.UUID(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_params(params):
+    """Pick the filter keys out of a QueryDict/dict, dropping empty values"""
+    return {key: params.get(key, '').strip() for key in FILTER_KEYS if params.get(key, '').strip()}
+
+
+def invalid_filters(params):
+    """Filter keys whose values filter_events would ignore as malformed"""
+    parsers = {'department': _parse_uuid, 'tag': _parse_uuid, 'from_date': _parse_date, 'to_date': _parse_date}
+    return [key for key, parse in parsers.items() if params.get(key) and parse(params[key]) is None]
+
+
+def filter_events(params, events=None):
+    """
+    Apply the events-page search and filters to `events` (default: all
+    events, newest EventDate first). Invalid dates and ids are ignored.
+    """
+    if events is None:
+        events = Event.objects.all().order_by('-EventDate')
+
+    search_query = params.get('q', '').strip()
+    department_filter = _parse_uuid(params.get('department'))
+    platform_filter = params.get('platform', '')
+    tag_filter = _parse_uuid(params.get('tag'))
+
+    if search_query:
+        # Department and tag names are denormalized onto Event, so no joins/DISTINCT
+        events = events.filter(
+            Q(EventTitle__icontains=search_query) |
+            Q(EventDescription__icontains=search_query) |
+            Q(EventPrimaryDepartmentName__icontains=search_query) |
+            Q(EventTagNames__icontains=search_query)
+        )
+
+    if department_filter:
+        events = events.filter(EventPrimaryDepartmentID=department_filter)
+
+    # Exact match on the indexed, normalized platform column
+    if platform_filter:
+        events = events.filter(EventID__in=EventLink.objects.filter(
+            EventLinkPlatform=EventLink.normalize_platform(platform_filter)
+        ).values('EventID'))
+
+    if tag_filter:
+        events = events.filter(EventID__in=EventTag.objects.filter(TagID=tag_filter).values('EventID'))
+
+    from_date = _parse_date(params.get('from_date'))
+    if from_date:
+        events = events.filter(EventDate__gte=from_date)
+
+    to_date = _parse_date(params.get('to_date'))
+    if to_date:
+        events = events.filter(EventDate__lte=to_date)
+
+    return events
@@ -1,11 +1,28 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from apps.shared.reference_cache import get_department, get_departments
 from .models import Department
 
+
+class CachedDepartmentChoiceField(forms.ModelChoiceField):
+    """Department picker that validates against the reference-data cache"""
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            dept = get_department(value)
+        except (ValueError, TypeError):
+            dept = None
+        if dept is None:
+            raise ValidationError(self.error_messages["invalid_choice"], code="invalid_choice")
+        return dept
+
+
 class AdminEditEventForm(forms.Form):
     event_title = forms.CharField(label="Event Title", max_length=120, required=True)
-    department = forms.ModelChoiceField(
+    department = CachedDepartmentChoiceField(
         label="Office/Department",
         queryset=Department.objects.all(),
         empty_label="Select office/department",
@@ -21,6 +38,13 @@ class AdminEditEventForm(forms.Form):
     youtube = forms.URLField(label="YouTube Link", required=False)
     website = forms.URLField(label="Website Link", required=False)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Render options from the cache instead of evaluating the queryset
+        self.fields["department"].choices = [("", self.fields["department"].empty_label)] + [
+            (dept.DepartmentID, dept.DepartmentName) for dept in get_departments()
+        ]
+
     def clean_event_title(self):
         title = self.cleaned_data["event_title"].strip()
         if len(title) < 5:
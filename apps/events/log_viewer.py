@@ -0,0 +1,235 @@
+"""
+Log viewer reads: tails and byte ranges of backup/restore log objects.
+
+Logs never change once written, so whatever is fetched from S3 is kept in
+a size-bounded LRU keyed by S3 key. Plain-text logs are read with ranged
+GETs in fixed-size chunks; structured logs (gzip JSON lines) can't be
+decompressed from the middle, so they are fetched once and their rendered
+text is cached instead. Either way, offsets refer to the text returned.
+"""
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from django.conf import settings
+from apps.events.s3 import s3_client
+from apps.shared.async_utils import run_in_thread
+from apps.shared.metrics import REGISTRY
+from apps.shared.operation_log import format_entry, read_operation_log
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+DEFAULT_TAIL_LINES = 200
+# Largest slice returned by one request
+MAX_READ_BYTES = 4 * 1024 * 1024
+
+LOG_CACHE_REQUESTS = REGISTRY.counter(
+    "arcasys_log_cache_requests_total", "Log viewer chunk lookups, by hit or miss"
+)
+LOG_S3_REQUESTS = REGISTRY.counter(
+    "arcasys_log_s3_requests_total", "S3 requests made by the log viewer"
+)
+
+
+class LRUCache:
+    """Thread-safe LRU bounded by the total size (cost) of its values"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                LOG_CACHE_REQUESTS.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+            LOG_CACHE_REQUESTS.inc(result="hit")
+            return entry[0]
+
+    def set(self, key, value, cost):
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, cost)
+            self._size += cost
+            while self._size > self.max_bytes:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self._size -= evicted_cost
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'max_bytes': self.max_bytes}
+
+
+_cache = LRUCache(getattr(settings, 'LOG_VIEWER_CACHE_BYTES', 32 * 1024 * 1024))
+
+
+def log_cache_stats():
+    return _cache.stats()
+
+
+class LogObject:
+    """Random access to one log's text, through the shared cache"""
+
+    def __init__(self, key, s3_client=None, bucket=None):
+        self.key = key
+        self._s3 = s3_client
+        self.bucket = bucket or settings.AWS_STORAGE_BUCKET_NAME
+        self._text = None
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            self._s3 = s3_client()
+        return self._s3
+
+    def _object_size(self):
+        size = _cache.get((self.key, 'size'))
+        if size is None:
+            LOG_S3_REQUESTS.inc(operation="head")
+            size = self.s3.head_object(Bucket=self.bucket, Key=self.key)['ContentLength']
+            _cache.set((self.key, 'size'), size, 64)
+        return size
+
+    def _fetch(self, first, last, object_size):
+        """Chunks first..last of the raw object, one ranged GET for any that aren't cached"""
+        chunks = {index: _cache.get((self.key, 'chunk', index)) for index in range(first, last + 1)}
+        missing = [index for index, chunk in chunks.items() if chunk is None]
+        if missing:
+            start = missing[0] * CHUNK_SIZE
+            end = min((missing[-1] + 1) * CHUNK_SIZE, object_size) - 1
+            LOG_S3_REQUESTS.inc(operation="get")
+            body = self.s3.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}")['Body']
+            data = body.read()
+            for index in range(missing[0], missing[-1] + 1):
+                chunk = data[(index - missing[0]) * CHUNK_SIZE:(index - missing[0] + 1) * CHUNK_SIZE]
+                chunks[index] = chunk
+                _cache.set((self.key, 'chunk', index), chunk, len(chunk))
+        return [chunks[index] for index in range(first, last + 1)]
+
+    def _raw(self, start, end, object_size):
+        if start >= end:
+            return b""
+        chunks = self._fetch(start // CHUNK_SIZE, (end - 1) // CHUNK_SIZE, object_size)
+        offset = (start // CHUNK_SIZE) * CHUNK_SIZE
+        return b"".join(chunks)[start - offset:end - offset]
+
+    def _structured_text(self, object_size):
+        if self._text is None:
+            self._text = _cache.get((self.key, 'text'))
+        if self._text is None:
+            entries = read_operation_log(self._raw(0, object_size, object_size))
+            self._text = "".join(format_entry(entry) + "\n" for entry in entries).encode('utf-8')
+            _cache.set((self.key, 'text'), self._text, len(self._text))
+        return self._text
+
+    def _is_structured(self):
+        # Operation logs are uploaded as .jsonl.gz; anything else is plain text
+        return self.key.endswith('.gz')
+
+    def size(self):
+        object_size = self._object_size()
+        if self._is_structured():
+            return len(self._structured_text(object_size))
+        return object_size
+
+    def read(self, start, end):
+        object_size = self._object_size()
+        if self._is_structured():
+            return self._structured_text(object_size)[start:end]
+        return self._raw(start, min(end, object_size), object_size)
+
+
+# ---------------------------------------------------------
+# Slices
+# ---------------------------------------------------------
+def tail_start(log, lines, size):
+    """Offset where the last `lines` lines begin, reading backwards a chunk at a time"""
+    if lines <= 0:
+        return size
+    end = size
+    # A trailing newline ends the last line rather than starting an empty one
+    newlines_needed = lines + 1 if size and log.read(size - 1, size) == b"\n" else lines
+    seen = 0
+    while end > 0:
+        start = max(0, end - CHUNK_SIZE)
+        data = log.read(start, end)
+        for position in range(len(data) - 1, -1, -1):
+            if data[position] == 0x0A:
+                seen += 1
+                if seen == newlines_needed:
+                    return start + position + 1
+        end = start
+    return 0
+
+
+def line_start(log, offset, size):
+    """`offset` moved forward to the start of the next line (unless it already is one)"""
+    if offset <= 0 or offset >= size or log.read(offset - 1, offset) == b"\n":
+        return min(max(offset, 0), size)
+    position = offset
+    while position < size:
+        data = log.read(position, min(position + CHUNK_SIZE, size))
+        newline = data.find(b"\n")
+        if newline >= 0:
+            return position + newline + 1
+        position += len(data)
+    return size
+
+
+def log_slice(log, tail=None, offset=None, length=None):
+    """
+    (start, end, size) of the requested part of the log: the last `tail`
+    lines, or `length` bytes from `offset` aligned to whole lines.
+    """
+    size = log.size()
+    if offset is None:
+        start = tail_start(log, DEFAULT_TAIL_LINES if tail is None else tail, size)
+        end = size
+        if end - start > MAX_READ_BYTES:
+            # A tail keeps the newest lines: drop from the front, at a line boundary
+            start = line_start(log, end - MAX_READ_BYTES, size)
+        return start, end, size
+
+    start = line_start(log, offset, size)
+    end = size if length is None else min(size, offset + length)
+    start = min(start, end)
+    if end - start > MAX_READ_BYTES:
+        end = start + MAX_READ_BYTES
+    return start, end, size
+
+
+def stream_slice(log, start, end, compress=False):
+    """Yield the slice in chunks, gzip-compressed when `compress` is set"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    position = start
+    while position < end:
+        data = log.read(position, min(position + CHUNK_SIZE, end))
+        if not data:
+            break
+        position += len(data)
+        if compressor:
+            data = compressor.compress(data)
+            if not data:
+                continue
+        yield data
+    if compressor:
+        yield compressor.flush()
+
+
+async def astream_slice(log, start, end, compress=False):
+    """stream_slice for ASGI responses; each S3 read runs on a worker thread"""
+    chunks = stream_slice(log, start, end, compress)
+    while True:
+        data = await run_in_thread(next, chunks, None)
+        if data is None:
+            return
+        yield data
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from apps.events.dedupe import assign_dedupe_keys
+from apps.events.statistics import rebuild_archive_statistics
+from apps.events.summaries import backfill_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized department/tag/platform fields on every Event"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        updated = backfill_summaries(batch_size=options['batch_size'])
+        # bulk_update skips the incremental statistics and dedupe key paths
+        assign_dedupe_keys()
+        rebuild_archive_statistics()
+        self.stdout.write(self.style.SUCCESS(f"Backfilled summaries for {updated} events."))
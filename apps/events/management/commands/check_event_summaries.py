@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.events.summaries import find_stale_summaries, refresh_event_summaries
+
+
+class Command(BaseCommand):
+    help = "Report Events whose denormalized summary fields disagree with the junction tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--fix', action='store_true', help="Rewrite stale summaries instead of failing")
+
+    def handle(self, *args, **options):
+        stale_ids = set()
+        for event_id, field, stored, expected in find_stale_summaries(batch_size=options['batch_size']):
+            stale_ids.add(event_id)
+            self.stdout.write(f"{event_id} {field}: stored={stored!r} expected={expected!r}")
+
+        if not stale_ids:
+            self.stdout.write(self.style.SUCCESS("All event summaries are consistent."))
+            return
+
+        if options['fix']:
+            refresh_event_summaries(stale_ids)
+            self.stdout.write(self.style.SUCCESS(f"Fixed summaries for {len(stale_ids)} events."))
+            return
+
+        raise CommandError(f"{len(stale_ids)} events have stale summaries; rerun with --fix to repair.")
@@ -0,0 +1,95 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.events.models import BackupHistory, Event, EventLink
+
+INDEX_SCAN_MARKERS = ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+
+
+def hot_queries():
+    """(label, queryset, expected index name) for the queries the events/backup pages run"""
+    today = datetime.date.today()
+    any_id = '00000000-0000-0000-0000-000000000000'
+    return [
+        (
+            "events listing order",
+            Event.objects.order_by('-EventDate')[:10],
+            'event_date_time_idx',
+        ),
+        (
+            "events date range",
+            Event.objects.filter(
+                EventDate__gte=today - datetime.timedelta(days=30), EventDate__lte=today
+            ).order_by('-EventDate')[:10],
+            'event_date_time_idx',
+        ),
+        (
+            "events department filter",
+            Event.objects.filter(EventPrimaryDepartmentID=any_id).order_by('-EventDate')[:10],
+            'event_dept_date_idx',
+        ),
+        (
+            "events platform filter",
+            EventLink.objects.filter(EventLinkPlatform='facebook').values('EventID'),
+            'eventlink_platform_event_idx',
+        ),
+        (
+            "recent events sidebar",
+            Event.objects.only('EventTitle').order_by('-EventCreatedAt')[:10],
+            'event_created_idx',
+        ),
+        (
+            "backup history by status",
+            BackupHistory.objects.filter(BackupStatus='failed').order_by('-BackupTimestamp')[:10],
+            'backup_status_time_idx',
+        ),
+        (
+            "backup history listing",
+            BackupHistory.objects.order_by('-BackupTimestamp')[:10],
+            'backup_storage_idx',
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the hot event/backup queries on PostgreSQL and fail unless each one uses its index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--allow-seqscan',
+            action='store_true',
+            help="Leave enable_seqscan on; small tables will then legitimately plan sequential scans",
+        )
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                f"Query-plan checks need PostgreSQL (current backend: {connection.vendor}); skipping."
+            ))
+            return
+
+        failures = []
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if not options['allow_seqscan']:
+                    # Ask "can the planner use the index?", independent of table size
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for label, queryset, index_name in hot_queries():
+                plan = queryset.explain()
+                uses_index = index_name in plan and any(marker in plan for marker in INDEX_SCAN_MARKERS)
+
+                if options['verbose_plans']:
+                    self.stdout.write(f"--- {label}\n{plan}")
+
+                if uses_index:
+                    self.stdout.write(self.style.SUCCESS(f"OK   {label} -> {index_name}"))
+                else:
+                    failures.append(label)
+                    self.stdout.write(self.style.ERROR(f"FAIL {label}: expected {index_name}\n{plan}"))
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries are not using their indexes: {', '.join(failures)}")
@@ -0,0 +1,70 @@
+import json
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from apps.events.dedupe import DEFAULT_SIMILARITY, assign_dedupe_keys, find_near_duplicates
+from apps.events.models import Event
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date {value!r}; use YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = (
+        "List events on the same date in the same department whose titles are near-identical, "
+        "for cleaning up duplicates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold', type=float, default=DEFAULT_SIMILARITY,
+            help="Minimum title similarity, 0-1 (1 = same normalized title)",
+        )
+        parser.add_argument('--from', dest='start', type=_date, help="Only events on or after this date")
+        parser.add_argument('--to', dest='end', type=_date, help="Only events on or before this date")
+        parser.add_argument('--json', action='store_true', help="Print the pairs as JSON")
+        parser.add_argument(
+            '--assign-keys', action='store_true',
+            help="Recompute every event's dedupe key first (e.g. after deleting duplicates)",
+        )
+
+    def handle(self, *args, **options):
+        if not 0 < options['threshold'] <= 1:
+            raise CommandError("--threshold must be between 0 and 1.")
+
+        if options['assign_keys']:
+            changed = assign_dedupe_keys()
+            self.stdout.write(f"Dedupe keys updated for {changed} events.")
+
+        pairs, comparisons = find_near_duplicates(options['threshold'], options['start'], options['end'])
+
+        if options['json']:
+            self.stdout.write(json.dumps([
+                {
+                    'similarity': round(similarity, 3),
+                    'date': a['EventDate'].isoformat(),
+                    'department': a['EventPrimaryDepartmentName'],
+                    'events': [
+                        {'id': str(row['EventID']), 'title': row['EventTitle'], 'has_key': row['EventDedupeKey'] is not None}
+                        for row in (a, b)
+                    ],
+                }
+                for similarity, a, b in pairs
+            ], indent=2))
+            return
+
+        for similarity, a, b in pairs:
+            self.stdout.write(
+                f"{similarity:.2f}  {a['EventDate']}  {a['EventPrimaryDepartmentName'] or '(no department)'}\n"
+                f"      {a['EventID']}  {a['EventTitle']}\n"
+                f"      {b['EventID']}  {b['EventTitle']}"
+            )
+
+        total = Event.objects.count()
+        self.stdout.write(
+            f"{len(pairs)} likely duplicate pair(s); {comparisons} title comparisons "
+            f"instead of {total * (total - 1) // 2} for all pairs."
+        )
@@ -0,0 +1,166 @@
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.events.management.commands.run_benchmarks import _git_commit
+
+# Modules that should only load when a backup, restore, S3 transfer or email actually happens
+HEAVY_MODULES = ["boto3", "botocore", "s3transfer", "sendgrid"]
+
+# What a worker does before serving its first request: set up Django, build the WSGI app, load the URLconf
+BOOT_SCRIPT = """
+import json
+import sys
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+get_wsgi_application()
+get_resolver().url_patterns
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_kb = rss // 1024 if sys.platform == "darwin" else rss
+except ImportError:
+    rss_kb = None
+print(json.dumps({{"rss_kb": rss_kb, "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_import_times(stderr):
+    """[(module, self_us, cumulative_us, depth)] from `python -X importtime` output"""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+
+def _boot_once():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT.format(heavy=HEAVY_MODULES)],
+        cwd=settings.BASE_DIR, env=os.environ.copy(), capture_output=True, text=True, timeout=120,
+    )
+    if result.returncode != 0:
+        raise CommandError(f"Worker boot failed:\n{result.stderr[-2000:]}")
+
+    boot = json.loads(result.stdout.strip().splitlines()[-1])
+    modules = parse_import_times(result.stderr)
+    return {
+        'import_ms': sum(self_us for _, self_us, _, _ in modules) / 1000,
+        'rss_mb': boot['rss_kb'] / 1024 if boot['rss_kb'] is not None else None,
+        'modules': modules,
+        'heavy_loaded': boot['heavy'],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker boot: import time (python -X importtime) and peak RSS after loading the WSGI app "
+        "and URLconf, in fresh interpreters, and write JSON results"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters to boot")
+        parser.add_argument('--top', type=int, default=15, help="Slowest modules (cumulative) to list")
+        parser.add_argument('--output', help="Write results to this JSON file")
+        parser.add_argument('--compare', help="Baseline JSON file from an earlier run")
+        parser.add_argument(
+            '--threshold', type=float, default=10.0,
+            help="Fail when import time or RSS is more than this percent above the baseline",
+        )
+        parser.add_argument(
+            '--forbid-heavy', action='store_true',
+            help=f"Fail if any of {', '.join(HEAVY_MODULES)} is imported at boot",
+        )
+
+    def handle(self, *args, **options):
+        runs = [_boot_once() for _ in range(max(1, options['repeat']))]
+
+        # Per-module figures come from the median run, so they add up to the reported total
+        median_run = sorted(runs, key=lambda run: run['import_ms'])[len(runs) // 2]
+        packages = defaultdict(int)
+        for name, self_us, _, _ in median_run['modules']:
+            packages[name.split(".")[0]] += self_us
+        top_modules = sorted(median_run['modules'], key=lambda module: module[2], reverse=True)[:options['top']]
+        rss_values = [run['rss_mb'] for run in runs if run['rss_mb'] is not None]
+
+        results = {
+            'meta': {
+                'commit': _git_commit(),
+                'timestamp': datetime.now(dt_timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'repeat': len(runs),
+            },
+            'import_ms': round(statistics.median(run['import_ms'] for run in runs), 2),
+            'rss_mb': round(statistics.median(rss_values), 1) if rss_values else None,
+            'module_count': len(median_run['modules']),
+            'heavy_loaded': median_run['heavy_loaded'],
+            'packages_ms': {
+                package: round(us / 1000, 2)
+                for package, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            },
+            'top_modules': [
+                {'module': name, 'self_ms': round(self_us / 1000, 2), 'cumulative_ms': round(cumulative_us / 1000, 2)}
+                for name, self_us, cumulative_us, _ in top_modules
+            ],
+        }
+
+        self.stdout.write(
+            f"Worker boot: {results['import_ms']:.1f} ms importing {results['module_count']} modules, "
+            f"peak RSS {results['rss_mb'] if results['rss_mb'] is not None else '?'} MB"
+        )
+        self.stdout.write("By package (self time):")
+        for package, ms in list(results['packages_ms'].items())[:10]:
+            self.stdout.write(f"  {package:<28} {ms:>8.2f} ms")
+        self.stdout.write("Slowest imports (cumulative):")
+        for row in results['top_modules']:
+            self.stdout.write(f"  {row['module']:<48} {row['cumulative_ms']:>8.2f} ms")
+        if results['heavy_loaded']:
+            self.stdout.write(self.style.WARNING(f"Loaded at boot: {', '.join(results['heavy_loaded'])}"))
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        failures = []
+        if options['forbid_heavy'] and results['heavy_loaded']:
+            failures.append(f"{', '.join(results['heavy_loaded'])} imported at boot")
+        if options['compare']:
+            failures += self._compare(results, options['compare'], options['threshold'])
+        if failures:
+            raise CommandError("; ".join(failures))
+
+    def _compare(self, results, baseline_path, threshold):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline {baseline_path}: {e}")
+
+        self.stdout.write(f"Compared with {baseline['meta'].get('commit') or baseline_path}:")
+        failures = []
+        for key, unit in (('import_ms', 'ms'), ('rss_mb', 'MB')):
+            before, after = baseline.get(key), results[key]
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            line = f"  {key:<10} {before:>9.2f} -> {after:>9.2f} {unit} ({change:+.1f}%)"
+            if change > threshold:
+                failures.append(f"{key} regressed by {change:.1f}% (threshold {threshold}%)")
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        return failures
@@ -0,0 +1,242 @@
+import http.client
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from apps.events.management.commands.run_benchmarks import Command as BenchmarkCommand, _git_commit
+from apps.events.models import RestoreOperation
+
+# gunicorn invocations compared by the load test; both get the same number of worker processes
+SERVERS = {
+    'wsgi': ['project.wsgi:application'],
+    'asgi': ['project.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker'],
+}
+STARTUP_TIMEOUT = 30
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(ordered, fraction):
+    return ordered[max(0, int(round(len(ordered) * fraction)) - 1)]
+
+
+class _Server:
+    """gunicorn serving this project on a free local port, for the duration of a `with` block"""
+
+    def __init__(self, interface, workers):
+        self.interface = interface
+        self.workers = workers
+        self.port = _free_port()
+        self.process = None
+
+    def __enter__(self):
+        env = os.environ.copy()
+        env['SERVER_INTERFACE'] = self.interface
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', *SERVERS[self.interface],
+             '--workers', str(self.workers), '--bind', f'127.0.0.1:{self.port}', '--log-level', 'warning'],
+            cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f"{self.interface} server exited:\n{self.process.stderr.read()[-2000:]}")
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise CommandError(f"{self.interface} server did not start within {STARTUP_TIMEOUT}s")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the I/O-bound endpoints with concurrent clients against gunicorn sync workers (WSGI) "
+        "and uvicorn workers (ASGI), and write throughput/latency results as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interfaces', default="wsgi,asgi", help="Comma-separated: wsgi, asgi")
+        parser.add_argument('--url', help="Load-test an already running server at this base URL instead")
+        parser.add_argument('--workers', type=int, default=2, help="Worker processes per server")
+        parser.add_argument('--concurrency', type=int, default=32, help="Simultaneous clients")
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per interface")
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help="Path to request (repeatable); defaults to the search API, restore status and events page",
+        )
+        parser.add_argument('--output', help="Write results to this JSON file")
+        parser.add_argument('--compare', help="Baseline JSON file from an earlier run")
+        parser.add_argument(
+            '--threshold', type=float, default=20.0,
+            help="Fail when throughput drops or p95 latency grows by more than this percent",
+        )
+        parser.add_argument('--force', action='store_true', help="Allow running when DEBUG is off")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError(
+                "The load test signs in a benchmark admin and needs plain http (DEBUG on); pass --force to run anyway."
+            )
+
+        # Same benchmark admin as run_benchmarks; its session cookie is replayed by every client
+        client = BenchmarkCommand()._client()
+        self.cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        paths = options['paths'] or self._default_paths()
+
+        results = {
+            'meta': {
+                'commit': _git_commit(),
+                'timestamp': datetime.now(dt_timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'workers': options['workers'],
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'paths': paths,
+            },
+            'interfaces': {},
+        }
+
+        if options['url']:
+            results['interfaces']['external'] = self._run(options['url'], paths, options)
+        else:
+            for interface in [i.strip() for i in options['interfaces'].split(",") if i.strip()]:
+                if interface not in SERVERS:
+                    raise CommandError(f"Unknown interface {interface}; use wsgi and/or asgi.")
+                self.stdout.write(f"Starting {interface} server with {options['workers']} worker(s)...")
+                with _Server(interface, options['workers']) as server:
+                    results['interfaces'][interface] = self._run(f"http://127.0.0.1:{server.port}", paths, options)
+
+        for name, row in results['interfaces'].items():
+            self.stdout.write(
+                f"  {name:<8} {row['rps']:>8.1f} req/s  p50 {row['p50_ms']:>8.1f} ms  p95 {row['p95_ms']:>8.1f} ms  "
+                f"p99 {row['p99_ms']:>8.1f} ms  errors {row['errors']}"
+            )
+        if {'wsgi', 'asgi'} <= set(results['interfaces']):
+            ratio = results['interfaces']['asgi']['rps'] / results['interfaces']['wsgi']['rps']
+            results['asgi_vs_wsgi_throughput'] = round(ratio, 2)
+            self.stdout.write(f"ASGI throughput is {ratio:.2f}x WSGI")
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['compare']:
+            regressions = self._compare(results, options['compare'], options['threshold'])
+            if regressions:
+                raise CommandError(f"{regressions} load-test figure(s) regressed by more than {options['threshold']}%.")
+
+    def _default_paths(self):
+        paths = [f"{reverse('events:events_search_api')}?q=Summit"]
+        restore_op = RestoreOperation.objects.order_by('-RestoreStartedAt').first()
+        if restore_op:
+            paths.append(reverse('events:check_restore_status', args=[restore_op.RestoreID]))
+        paths.append(reverse('events:events'))
+        return paths
+
+    # ---------------------------------------------------------
+    # Load
+    # ---------------------------------------------------------
+    def _run(self, base_url, paths, options):
+        target = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if target.scheme == 'https' else http.client.HTTPConnection
+        local = threading.local()
+        headers = {'Cookie': self.cookie, 'Accept-Encoding': 'gzip'}
+
+        def request(index):
+            # One keep-alive connection per client thread
+            if getattr(local, 'connection', None) is None:
+                local.connection = connection_class(target.hostname, target.port, timeout=60)
+            path = paths[index % len(paths)]
+            started = time.perf_counter()
+            try:
+                local.connection.request('GET', path, headers=headers)
+                response = local.connection.getresponse()
+                response.read()
+                status = response.status
+                if response.getheader('Connection', '').lower() == 'close':
+                    local.connection.close()
+                    local.connection = None
+            except (OSError, http.client.HTTPException):
+                local.connection.close()
+                local.connection = None
+                status = None
+            return path, status, (time.perf_counter() - started) * 1000
+
+        concurrency = max(1, options['concurrency'])
+        total = max(1, options['requests'])
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(request, range(concurrency)))  # warm-up: connections, worker imports, caches
+            started = time.perf_counter()
+            samples = list(pool.map(request, range(total)))
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(ms for _, status, ms in samples)
+        errors = sum(1 for _, status, _ in samples if status is None or status >= 400)
+        by_path = {}
+        for path in paths:
+            path_latencies = [ms for p, _, ms in samples if p == path]
+            by_path[path] = {
+                'median_ms': round(statistics.median(path_latencies), 2),
+                'statuses': sorted({str(status) for p, status, _ in samples if p == path}),
+            }
+        return {
+            'rps': round(total / elapsed, 1),
+            'p50_ms': round(_percentile(latencies, 0.50), 2),
+            'p95_ms': round(_percentile(latencies, 0.95), 2),
+            'p99_ms': round(_percentile(latencies, 0.99), 2),
+            'errors': errors,
+            'paths': by_path,
+        }
+
+    def _compare(self, results, baseline_path, threshold):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline {baseline_path}: {e}")
+
+        self.stdout.write(f"Compared with {baseline['meta'].get('commit') or baseline_path}:")
+        regressions = 0
+        for name, row in results['interfaces'].items():
+            before = baseline.get('interfaces', {}).get(name)
+            if not before:
+                continue
+            # Lower throughput and higher latency are both regressions
+            for key, worse in (('rps', -1), ('p95_ms', 1)):
+                if not before[key]:
+                    continue
+                change = (row[key] - before[key]) / before[key] * 100
+                line = f"  {name:<8} {key:<7} {before[key]:>9.1f} -> {row[key]:>9.1f} ({change:+.1f}%)"
+                if change * worse > threshold:
+                    regressions += 1
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+        return regressions
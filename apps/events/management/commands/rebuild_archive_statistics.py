@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.events.statistics import find_stale_statistics, rebuild_archive_statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the archive statistics rollup (events per month, department, tag and platform)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Report buckets that disagree with the events table instead of rebuilding",
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            stale = 0
+            for dimension, month, key, stored, expected in find_stale_statistics():
+                stale += 1
+                self.stdout.write(f"{month:%Y-%m} {dimension}:{key or '-'} stored={stored} expected={expected}")
+            if stale:
+                raise CommandError(f"{stale} statistics buckets are stale; rerun without --check to rebuild.")
+            self.stdout.write(self.style.SUCCESS("Archive statistics are consistent."))
+            return
+
+        buckets = rebuild_archive_statistics(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt archive statistics: {buckets} buckets."))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.events.models import BackupHistory
+from apps.events.selective_restore import RESTORABLE_TABLES, BackupReader, SelectiveRestoreError, \
+    restore_events, restore_tables
+
+
+class Command(BaseCommand):
+    help = "Selectively restore tables, or events with their tags/departments/links, from a backup (upsert)"
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--backup-id', help="BackupHistoryID of a completed backup")
+        source.add_argument('--file', help="Local data-only dump (pg_dump --inserts)")
+        what = parser.add_mutually_exclusive_group()
+        what.add_argument('--tables', help=f"Comma-separated tables: {', '.join(RESTORABLE_TABLES)}")
+        what.add_argument('--events', help="Comma-separated EventIDs")
+        parser.add_argument('--list', action='store_true', help="Only show the backup's tables and row counts")
+
+    def handle(self, *args, **options):
+        try:
+            if options['backup_id']:
+                backup = BackupHistory.objects.filter(BackupHistoryID=options['backup_id']).first()
+                if backup is None:
+                    raise CommandError(f"Backup {options['backup_id']} not found")
+                reader = BackupReader(backup=backup)
+            else:
+                reader = BackupReader(path=options['file'])
+
+            if options['list']:
+                for table, entry in sorted(reader.index()['tables'].items()):
+                    self.stdout.write(f"{table:<20} {entry['rows']:>10} rows  {len(entry['ranges'])} range(s)")
+                return
+
+            if options['tables']:
+                report = restore_tables(reader, [t.strip() for t in options['tables'].split(',') if t.strip()])
+            elif options['events']:
+                report = restore_events(reader, [e.strip() for e in options['events'].split(',') if e.strip()])
+            else:
+                raise CommandError("Pass --tables, --events or --list")
+        except SelectiveRestoreError as e:
+            raise CommandError(str(e))
+
+        for table, stats in report.items():
+            if table == 'missing_events':
+                continue
+            self.stdout.write(f"{table:<20} restored {stats['restored']:>8}  skipped {stats['skipped']:>6}")
+            for error in stats['errors']:
+                self.stdout.write(self.style.WARNING(f"    {error}"))
+        for event_id in report.get('missing_events', []):
+            self.stdout.write(self.style.WARNING(f"Event {event_id} is not in this backup"))
+        self.stdout.write(self.style.SUCCESS("Selective restore finished."))
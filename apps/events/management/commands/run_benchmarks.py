@@ -0,0 +1,281 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime, timezone as dt_timezone
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.events.models import Event
+from apps.events.seeding import seed_archive
+from apps.shared.reference_cache import get_departments, get_role
+
+BENCH_EMAIL = "benchmark.admin@cit.edu"
+BENCH_PASSWORD = "benchmark-password"
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _summarize(durations, queries):
+    ordered = sorted(durations)
+    p95_index = max(0, int(round(len(ordered) * 0.95)) - 1)
+    return {
+        'runs': len(ordered),
+        'min_ms': round(ordered[0], 2),
+        'median_ms': round(statistics.median(ordered), 2),
+        'p95_ms': round(ordered[p95_index], 2),
+        'mean_ms': round(statistics.mean(ordered), 2),
+        'queries': max(queries),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the hot endpoints (listing, search, search API, CSV export, login, add/edit event and, "
+        "on PostgreSQL, backup/restore) at several archive sizes and write JSON results"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default="1000,10000", help="Comma-separated archive sizes (events)")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per endpoint")
+        parser.add_argument('--search', default="Summit", help="Search term for the search benchmarks")
+        parser.add_argument('--output', help="Write results to this JSON file")
+        parser.add_argument('--compare', help="Baseline JSON file from an earlier run")
+        parser.add_argument(
+            '--threshold', type=float, default=20.0,
+            help="Fail when a median is more than this percent slower than the baseline",
+        )
+        parser.add_argument('--include-backup', action='store_true', help="Also time pg_dump and restore (PostgreSQL)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--force', action='store_true', help="Allow running when DEBUG is off")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("Benchmarks seed and modify data; pass --force if this is really a test database.")
+        if options['include_backup'] and connection.vendor != 'postgresql':
+            raise CommandError("--include-backup needs a local PostgreSQL database.")
+
+        try:
+            sizes = sorted(int(s) for s in options['sizes'].split(",") if s.strip())
+        except ValueError:
+            raise CommandError("--sizes must be a comma-separated list of integers.")
+
+        self.repeat = max(1, options['repeat'])
+        self.search = options['search']
+        client = self._client()
+
+        results = {
+            'meta': {
+                'commit': _git_commit(),
+                'timestamp': datetime.now(dt_timezone.utc).isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'repeat': self.repeat,
+            },
+            'sizes': {},
+        }
+
+        for size in sizes:
+            existing = Event.objects.count()
+            if existing < size:
+                self.stdout.write(f"Seeding {size - existing} events to reach {size}...")
+                seed_archive(events=size - existing, seed=options['seed'] + size)
+            elif existing > size:
+                self.stdout.write(self.style.WARNING(
+                    f"Database already has {existing} events; the {size} row measures that instead."
+                ))
+
+            self.stdout.write(f"Benchmarking with {size} events")
+            size_results = self._run_endpoints(client)
+            if options['include_backup']:
+                size_results.update(self._run_backup())
+            results['sizes'][str(size)] = size_results
+
+            for name, row in size_results.items():
+                self.stdout.write(
+                    f"  {name:<14} median {row['median_ms']:>9.2f} ms  p95 {row['p95_ms']:>9.2f} ms  "
+                    f"queries {row['queries']}"
+                )
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['compare']:
+            regressions = self._compare(results, options['compare'], options['threshold'])
+            if regressions:
+                raise CommandError(f"{regressions} benchmark(s) regressed by more than {options['threshold']}%.")
+
+    # ---------------------------------------------------------
+    # Endpoints
+    # ---------------------------------------------------------
+    def _client(self):
+        from apps.users.models import User
+
+        user = User.objects.filter(UserEmail=BENCH_EMAIL).first()
+        if user is None:
+            user = User.objects.create_user(
+                UserEmail=BENCH_EMAIL, UserFullName="Benchmark Admin", password=BENCH_PASSWORD,
+            )
+        user.RoleID = get_role('Admin')
+        user.isUserActive = True
+        user.isUserStaff = True
+        user.isUserAdmin = True
+        user.set_password(BENCH_PASSWORD)
+        user.save()
+        self.user = user
+
+        # SECURE_SSL_REDIRECT would 301 every plain-http request
+        client = Client(SERVER_NAME='localhost', **{'wsgi.url_scheme': 'https'})
+        client.force_login(user)
+        return client
+
+    def _time(self, call, setup=None):
+        cache.clear()
+        call(*setup()) if setup else call()  # warm-up, not recorded
+        durations, queries = [], []
+        for _ in range(self.repeat):
+            args = setup() if setup else ()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = call(*args)
+                if getattr(response, 'streaming', False):
+                    b"".join(response.streaming_content)
+                durations.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                raise CommandError(f"Benchmark request failed with HTTP {response.status_code}")
+            queries.append(len(ctx.captured_queries))
+        return _summarize(durations, queries)
+
+    def _run_endpoints(self, client):
+        events_url = reverse('events:events')
+        search_api_url = reverse('events:events_search_api')
+        login_url = reverse('users:login')
+        department = get_departments()[0]
+
+        def login():
+            anonymous = Client(SERVER_NAME='localhost', **{'wsgi.url_scheme': 'https'})
+            return anonymous.post(login_url, {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD})
+
+        def add_event():
+            return client.post(reverse('events:add_event'), {
+                'event_title': f"Benchmark Event {time.perf_counter_ns()}",
+                'office': str(department.DepartmentID),
+                'event_date': date.today().isoformat(),
+                'event_time': "09:00",
+                'location': "Benchmark Hall",
+                'description': "Created by the benchmark runner.",
+                'tags_input': "Benchmark, Workshop",
+            })
+
+        def latest_event():
+            return (Event.objects.filter(EventLocation="Benchmark Hall").order_by('-EventCreatedAt').first(),)
+
+        def edit_event(event):
+            return client.post(reverse('events:edit_event', args=[event.EventID]), {
+                'event_title': f"Benchmark Event {time.perf_counter_ns()}",
+                'department': str(department.DepartmentID),
+                'event_date': date.today().isoformat(),
+                'event_time': "10:30",
+                'location': "Benchmark Hall",
+                'description': "Edited by the benchmark runner.",
+                'tags': "Benchmark, Seminar",
+            })
+
+        return {
+            'listing': self._time(lambda: client.get(events_url)),
+            'search': self._time(lambda: client.get(events_url, {'q': self.search})),
+            'search_api': self._time(lambda: client.get(search_api_url, {'q': self.search})),
+            'csv_export': self._time(lambda: client.get(events_url, {'export': 1})),
+            'login': self._time(login),
+            'add_event': self._time(add_event),
+            'edit_event': self._time(edit_event, setup=latest_event),
+        }
+
+    # ---------------------------------------------------------
+    # Backup / restore (local PostgreSQL only)
+    # ---------------------------------------------------------
+    def _run_backup(self):
+        from apps.events.restore_service import execute_full_restoration, get_platform_config
+
+        db = connection.settings_dict
+        env = os.environ.copy()
+        env['PGPASSWORD'] = db.get('PASSWORD') or ''
+        dump_path = Path(tempfile.gettempdir()) / "arcasys_benchmark_dump.sql"
+        cmd = [
+            get_platform_config()['pg_dump_path'],
+            '-h', db.get('HOST') or 'localhost', '-p', str(db.get('PORT') or 5432),
+            '-U', db.get('USER') or '', '-d', db['NAME'],
+            "--data-only", "--inserts",
+            "--exclude-table=django_migrations", "--exclude-table=django_session",
+            '-f', str(dump_path),
+        ]
+
+        def backup():
+            result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+            if result.returncode != 0:
+                raise CommandError(f"pg_dump failed: {result.stderr.strip()}")
+            return _Status(200)
+
+        def restore():
+            connection.close()  # psql truncates tables under our feet
+            if not execute_full_restoration(str(dump_path)):
+                raise CommandError("Restore failed; see the application log.")
+            return _Status(200)
+
+        try:
+            return {'backup': self._time(backup), 'restore': self._time(restore)}
+        finally:
+            dump_path.unlink(missing_ok=True)
+
+    # ---------------------------------------------------------
+    # Comparison
+    # ---------------------------------------------------------
+    def _compare(self, results, baseline_path, threshold):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline {baseline_path}: {e}")
+
+        self.stdout.write(f"Compared with {baseline['meta'].get('commit') or baseline_path}:")
+        regressions = 0
+        for size, rows in results['sizes'].items():
+            for name, row in rows.items():
+                before = baseline.get('sizes', {}).get(size, {}).get(name)
+                if not before or not before['median_ms']:
+                    continue
+                change = (row['median_ms'] - before['median_ms']) / before['median_ms'] * 100
+                line = f"  {size:>7} {name:<14} {before['median_ms']:>9.2f} -> {row['median_ms']:>9.2f} ms ({change:+.1f}%)"
+                if change > threshold:
+                    regressions += 1
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+        return regressions
+
+
+class _Status:
+    """Stand-in response for timed calls that aren't HTTP requests"""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.events.seeding import seed_archive
+
+
+class Command(BaseCommand):
+    help = "Bulk-create a synthetic event archive (events, departments, tags, links, users) for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, required=True, help="Number of events to add")
+        parser.add_argument('--departments', type=int, default=20, help="Ensure at least this many departments")
+        parser.add_argument('--tags', type=int, default=60, help="Ensure at least this many tags")
+        parser.add_argument('--users', type=int, default=0, help="Number of staff users to add")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible data")
+        parser.add_argument('--force', action='store_true', help="Allow seeding when DEBUG is off")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("Refusing to seed a non-DEBUG database; pass --force if this is really a test database.")
+
+        counts = seed_archive(
+            events=options['events'],
+            departments=options['departments'],
+            tags=options['tags'],
+            users=options['users'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {counts['events']} events ({counts['departments']} departments, "
+            f"{counts['tags']} tags, {counts['users']} new users)."
+        ))
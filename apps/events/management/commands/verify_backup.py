@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.events.backup_verification import BackupVerificationError, verify_backup
+from apps.events.models import BackupHistory
+
+
+class Command(BaseCommand):
+    help = "Test-restore a backup into the scratch database and compare row counts and checksums"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backup-id', help="BackupHistoryID to verify (default: the latest completed backup)")
+        parser.add_argument('--file', help="Local copy of the backup's dump, so no download is needed")
+
+    def handle(self, *args, **options):
+        completed = BackupHistory.objects.filter(BackupStatus='completed')
+        if options['backup_id']:
+            backup = completed.filter(BackupHistoryID=options['backup_id']).first()
+        else:
+            backup = completed.order_by('-BackupTimestamp').first()
+        if backup is None:
+            raise CommandError("No completed backup to verify")
+
+        self.stdout.write(f"Verifying {backup.BackupName}...")
+        try:
+            report = verify_backup(backup, path=options['file'])
+        except BackupVerificationError as e:
+            raise CommandError(str(e))
+
+        for table, entry in report.get('tables', {}).items():
+            line = f"{table:<28} {entry['expected_rows']:>10} -> {entry['restored_rows']:<10}"
+            if entry['ok']:
+                self.stdout.write(f"{line} ok")
+            else:
+                self.stdout.write(self.style.ERROR(f"{line} MISMATCH"))
+
+        if backup.BackupVerifyRowsPerSecond:
+            self.stdout.write(
+                f"Restored {report['rows']} rows in {report['restore_seconds']}s "
+                f"({backup.BackupVerifyRowsPerSecond:.0f} rows/s)"
+            )
+        if backup.BackupVerifyStatus != 'passed':
+            raise CommandError(report.get('error') or "Backup verification failed")
+        self.stdout.write(self.style.SUCCESS("Backup verified."))
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+def backfill_event_summaries(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventDepartment = apps.get_model('events', 'EventDepartment')
+    EventTag = apps.get_model('events', 'EventTag')
+    EventLink = apps.get_model('events', 'EventLink')
+
+    summaries = {}
+    for event_id in Event.objects.values_list('EventID', flat=True):
+        summaries[event_id] = {'dept': None, 'dept_name': '', 'tags': [], 'platforms': []}
+
+    for event_id, dept_id, dept_name in EventDepartment.objects.order_by(
+        'EventDepartmentAssignedAt', 'EventDepartmentID'
+    ).values_list('EventID', 'DepartmentID', 'DepartmentID__DepartmentName'):
+        if summaries[event_id]['dept'] is None:
+            summaries[event_id]['dept'] = dept_id
+            summaries[event_id]['dept_name'] = dept_name
+
+    for event_id, tag_name in EventTag.objects.order_by(
+        'EventTagAssignedAt', 'EventTagID'
+    ).values_list('EventID', 'TagID__TagName'):
+        summaries[event_id]['tags'].append(tag_name)
+
+    for event_id, link_name in EventLink.objects.order_by('EventLinkName').values_list('EventID', 'EventLinkName'):
+        if link_name not in summaries[event_id]['platforms']:
+            summaries[event_id]['platforms'].append(link_name)
+
+    for event_id, summary in summaries.items():
+        Event.objects.filter(pk=event_id).update(
+            EventPrimaryDepartmentID=summary['dept'],
+            EventPrimaryDepartmentName=summary['dept_name'],
+            EventTagNames=', '.join(summary['tags']),
+            EventPlatforms=', '.join(summary['platforms']),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_alter_restoreoperation_backuphistoryid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='EventPlatforms',
+            field=models.TextField(blank=True, db_column='EventPlatforms', default=''),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='EventPrimaryDepartmentID',
+            field=models.UUIDField(blank=True, db_column='EventPrimaryDepartmentID', null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='EventPrimaryDepartmentName',
+            field=models.CharField(blank=True, db_column='EventPrimaryDepartmentName', default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='EventTagNames',
+            field=models.TextField(blank=True, db_column='EventTagNames', default=''),
+        ),
+        migrations.RunPython(backfill_event_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+SUMMARY_COLUMNS = ['EventPrimaryDepartmentName', 'EventTagNames', 'EventPlatforms']
+
+
+def set_db_defaults(apps, schema_editor):
+    # Data-only backups taken before 0009 insert Event rows without these
+    # columns; a server-side default keeps such restores from failing.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SUMMARY_COLUMNS:
+        schema_editor.execute(f'ALTER TABLE "Event" ALTER COLUMN "{column}" SET DEFAULT \'\'')
+
+
+def drop_db_defaults(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SUMMARY_COLUMNS:
+        schema_editor.execute(f'ALTER TABLE "Event" ALTER COLUMN "{column}" DROP DEFAULT')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_summary_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_db_defaults, drop_db_defaults),
+    ]
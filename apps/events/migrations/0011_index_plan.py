@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:21
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def populate_link_platform(apps, schema_editor):
+    EventLink = apps.get_model('events', 'EventLink')
+    EventLink.objects.update(EventLinkPlatform=Lower(Trim('EventLinkName')))
+
+    if schema_editor.connection.vendor == 'postgresql':
+        # Older data-only backups insert EventLink rows without this column
+        schema_editor.execute('ALTER TABLE "EventLink" ALTER COLUMN "EventLinkPlatform" SET DEFAULT \'\'')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_summary_db_defaults'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventlink',
+            name='EventLinkPlatform',
+            field=models.CharField(blank=True, db_column='EventLinkPlatform', default='', max_length=255),
+        ),
+        migrations.RunPython(populate_link_platform, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='backuphistory',
+            index=models.Index(fields=['BackupStatus', '-BackupTimestamp'], name='backup_status_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='backuphistory',
+            index=models.Index(fields=['-BackupTimestamp'], name='backup_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-EventDate'], name='event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-EventCreatedAt'], name='event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['EventPrimaryDepartmentID', '-EventDate'], name='event_dept_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventdepartment',
+            index=models.Index(fields=['DepartmentID', 'EventID'], name='eventdept_dept_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventlink',
+            index=models.Index(fields=['EventLinkPlatform', 'EventID'], name='eventlink_platform_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventtag',
+            index=models.Index(fields=['TagID', 'EventID'], name='eventtag_tag_event_idx'),
+        ),
+    ]
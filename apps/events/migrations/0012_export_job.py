@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0011_index_plan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('ExportJobID', models.UUIDField(db_column='ExportJobID', default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('ExportFilters', models.JSONField(blank=True, default=dict)),
+                ('ExportStatus', models.CharField(choices=[('queued', 'Queued'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('ExportProgress', models.IntegerField(default=0)),
+                ('ExportTotalRows', models.IntegerField(default=0)),
+                ('ExportProcessedRows', models.IntegerField(default=0)),
+                ('ExportStorage', models.CharField(blank=True, choices=[('s3', 'S3'), ('local', 'Local')], default='', max_length=10)),
+                ('ExportFile', models.FileField(blank=True, null=True, upload_to='exports/')),
+                ('ExportMessage', models.TextField(blank=True, null=True)),
+                ('ExportCreatedAt', models.DateTimeField(auto_now_add=True)),
+                ('ExportCompletedAt', models.DateTimeField(blank=True, null=True)),
+                ('ExportRequestedBy', models.ForeignKey(blank=True, db_column='ExportRequestedBy', null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'ExportJob',
+                'indexes': [models.Index(fields=['ExportRequestedBy', '-ExportCreatedAt'], name='exportjob_user_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:31
+
+import re
+from django.db import migrations, models
+
+UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+
+
+def parse_backup_sizes(apps, schema_editor):
+    BackupHistory = apps.get_model('events', 'BackupHistory')
+
+    for backup_id, label in BackupHistory.objects.values_list('BackupHistoryID', 'BackupSize'):
+        match = re.match(r'^\s*([\d.]+)\s*([KMGT]?B)?\s*$', label or '', re.IGNORECASE)
+        if not match:
+            continue
+        try:
+            size = int(round(float(match.group(1)) * UNITS[(match.group(2) or 'B').upper()]))
+        except ValueError:
+            continue
+        BackupHistory.objects.filter(pk=backup_id).update(BackupSizeBytes=size)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_export_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupCompressedBytes',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupDurationMs',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupSizeBytes',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(parse_backup_sizes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='backuphistory',
+            index=models.Index(
+                fields=['BackupTimestamp', 'BackupStatus', 'BackupSizeBytes', 'BackupCompressedBytes'],
+                name='backup_storage_idx',
+            ),
+        ),
+    ]
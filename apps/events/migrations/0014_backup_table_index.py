@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_backup_size_accounting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupTableIndex',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
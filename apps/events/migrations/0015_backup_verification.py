@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_backup_table_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupTableStats',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupVerifiedAt',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupVerifyReport',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupVerifyRowsPerSecond',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='backuphistory',
+            name='BackupVerifyStatus',
+            field=models.CharField(blank=True, choices=[('passed', 'Passed'), ('failed', 'Failed')], max_length=20, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_backup_verification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restoreoperation',
+            name='RestoreLogFile',
+            field=models.FileField(blank=True, null=True, upload_to='logs/'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:55
+
+from django.db import migrations, models
+import uuid
+
+
+def build_archive_statistics(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    ArchiveStatistic = apps.get_model('events', 'ArchiveStatistic')
+
+    counts = {}
+    for day, dept_id, tag_names, platforms in Event.objects.values_list(
+        'EventDate', 'EventPrimaryDepartmentID', 'EventTagNames', 'EventPlatforms'
+    ).iterator():
+        month = day.replace(day=1)
+        buckets = {('total', month, '')}
+        if dept_id:
+            buckets.add(('department', month, str(dept_id)))
+        buckets.update(('tag', month, name[:255]) for name in tag_names.split(', ') if name)
+        buckets.update(
+            ('platform', month, name.strip().lower()) for name in platforms.split(', ') if name.strip()
+        )
+        for bucket in buckets:
+            counts[bucket] = counts.get(bucket, 0) + 1
+
+    ArchiveStatistic.objects.bulk_create(
+        [
+            ArchiveStatistic(StatDimension=dimension, StatMonth=month, StatKey=key, StatCount=count)
+            for (dimension, month, key), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_restore_log_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveStatistic',
+            fields=[
+                ('StatisticID', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('StatMonth', models.DateField()),
+                ('StatDimension', models.CharField(choices=[('total', 'total'), ('department', 'department'), ('tag', 'tag'), ('platform', 'platform')], max_length=20)),
+                ('StatKey', models.CharField(blank=True, default='', max_length=255)),
+                ('StatCount', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'ArchiveStatistic',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='archivestatistic',
+            constraint=models.UniqueConstraint(fields=('StatDimension', 'StatMonth', 'StatKey'), name='archivestat_bucket_uniq'),
+        ),
+        migrations.RunPython(build_archive_statistics, migrations.RunPython.noop),
+    ]
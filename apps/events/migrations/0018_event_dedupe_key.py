@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:01
+
+import hashlib
+import unicodedata
+import uuid
+from django.db import migrations, models
+
+
+def backfill_dedupe_keys(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+
+    # The oldest of a set of duplicates keeps the key; the others stay NULL for find_duplicate_events
+    taken = set()
+    rows = Event.objects.order_by('EventCreatedAt', 'EventID').values_list(
+        'EventID', 'EventTitle', 'EventDate', 'EventPrimaryDepartmentID'
+    )
+    for event_id, title, date, dept_id in rows.iterator():
+        if not dept_id:
+            continue
+        title = " ".join(unicodedata.normalize('NFKC', title or '').casefold().split())
+        key = hashlib.sha1(f"{title}|{date}|{uuid.UUID(str(dept_id))}".encode('utf-8')).hexdigest()
+        if key not in taken:
+            taken.add(key)
+            Event.objects.filter(pk=event_id).update(EventDedupeKey=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_archive_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='EventDedupeKey',
+            field=models.CharField(blank=True, db_column='EventDedupeKey', editable=False, max_length=40, null=True),
+        ),
+        migrations.RunPython(backfill_dedupe_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('EventDedupeKey',), name='event_dedupe_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0018_event_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['EventDate', 'EventTime'], name='event_date_time_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:18
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0019_event_date_time_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='ExportUpdatedAt',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0020_export_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='backuphistory',
+            name='backup_time_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_date_idx',
+        ),
+    ]
@@ -1,3 +1,6 @@
+import hashlib
+import re
+import unicodedata
 import uuid
 from django.db import models
 from django.utils import timezone     
@@ -41,12 +44,86 @@ class Event(models.Model):
         db_column='EventUpdatedAt'
     )
 
+    # Denormalized read fields, maintained by apps.events.summaries
+    EventPrimaryDepartmentID = models.UUIDField(
+        null=True,
+        blank=True,
+        db_column='EventPrimaryDepartmentID'
+    )
+    EventPrimaryDepartmentName = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        db_column='EventPrimaryDepartmentName'
+    )
+    EventTagNames = models.TextField(
+        blank=True,
+        default='',
+        db_column='EventTagNames'
+    )
+    EventPlatforms = models.TextField(
+        blank=True,
+        default='',
+        db_column='EventPlatforms'
+    )
+    # Hash of normalized title + date + primary department; NULL when there is no department
+    # or an older duplicate already holds the key (see apps.events.dedupe)
+    EventDedupeKey = models.CharField(
+        max_length=40,
+        null=True,
+        blank=True,
+        editable=False,
+        db_column='EventDedupeKey'
+    )
+
+    SUMMARY_SEPARATOR = ', '
+    DEDUPE_FIELDS = {'EventTitle', 'EventDate', 'EventPrimaryDepartmentID'}
+
     class Meta:
         db_table = 'Event'
+        indexes = [
+            # "Recent events" sidebar
+            models.Index(fields=['-EventCreatedAt'], name='event_created_idx'),
+            # Department filter + listing order
+            models.Index(fields=['EventPrimaryDepartmentID', '-EventDate'], name='event_dept_date_idx'),
+            # Listing order (scanned backwards), date-range filters and calendar
+            # month/week ranges in day and time order
+            models.Index(fields=['EventDate', 'EventTime'], name='event_date_time_idx'),
+        ]
+        constraints = [
+            # One event per title, date and department, also under concurrent submissions
+            models.UniqueConstraint(fields=['EventDedupeKey'], name='event_dedupe_key_uniq'),
+        ]
 
     def __str__(self):
         return self.EventTitle
 
+    @staticmethod
+    def normalize_title(title):
+        return " ".join(unicodedata.normalize('NFKC', title or '').casefold().split())
+
+    @classmethod
+    def dedupe_key(cls, title, date, department_id):
+        if not department_id:
+            return None
+        signature = f"{cls.normalize_title(title)}|{date}|{uuid.UUID(str(department_id))}"
+        return hashlib.sha1(signature.encode('utf-8')).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.EventDedupeKey = self.dedupe_key(self.EventTitle, self.EventDate, self.EventPrimaryDepartmentID)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & self.DEDUPE_FIELDS:
+            kwargs['update_fields'] = set(update_fields) | {'EventDedupeKey'}
+        super().save(*args, **kwargs)
+
+    @property
+    def tag_name_list(self):
+        return [t for t in self.EventTagNames.split(self.SUMMARY_SEPARATOR) if t]
+
+    @property
+    def platform_list(self):
+        return [p for p in self.EventPlatforms.split(self.SUMMARY_SEPARATOR) if p]
+
 class Tag(models.Model):
     TagID = models.UUIDField(
         primary_key=True,
@@ -117,6 +194,10 @@ class EventTag(models.Model):
     class Meta:
         db_table = 'EventTag'
         unique_together = ('EventID', 'TagID')
+        indexes = [
+            # Tag -> events lookups; unique_together already covers EventID-first
+            models.Index(fields=['TagID', 'EventID'], name='eventtag_tag_event_idx'),
+        ]
 
     def __str__(self):
         return f"Tag {self.TagID} on Event {self.EventID}"
@@ -148,6 +229,9 @@ class EventDepartment(models.Model):
     class Meta:
         db_table = 'EventDepartment'
         unique_together = ('EventID', 'DepartmentID')
+        indexes = [
+            models.Index(fields=['DepartmentID', 'EventID'], name='eventdept_dept_event_idx'),
+        ]
 
     def __str__(self):
         return f"Dept {self.DepartmentID} for Event {self.EventID}"
@@ -173,17 +257,74 @@ class EventLink(models.Model):
         max_length=2000, 
         db_column='EventLinkURL'
     )
+    # Lower-cased EventLinkName so the platform filter is an indexed exact match
+    EventLinkPlatform = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        db_column='EventLinkPlatform'
+    )
 
     class Meta:
         db_table = 'EventLink'
+        indexes = [
+            models.Index(fields=['EventLinkPlatform', 'EventID'], name='eventlink_platform_event_idx'),
+        ]
 
     def __str__(self):
         return f"{self.EventLinkName} for Event {self.EventID}"
-    
-    
+
+    @staticmethod
+    def normalize_platform(name):
+        return (name or '').strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.EventLinkPlatform = self.normalize_platform(self.EventLinkName)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'EventLinkName' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'EventLinkPlatform'}
+        super().save(*args, **kwargs)
+
+
+# ==============================
+# ARCHIVE STATISTICS (rollup)
+# ==============================
+
+class ArchiveStatistic(models.Model):
+    """
+    Events per month overall and per department, tag and platform. Kept in
+    step with Event's summary fields by apps.events.statistics.
+    """
+    DIMENSIONS = ['total', 'department', 'tag', 'platform']
+
+    StatisticID = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    # First day of the month of EventDate
+    StatMonth = models.DateField()
+    StatDimension = models.CharField(max_length=20, choices=[(d, d) for d in DIMENSIONS])
+    # DepartmentID, tag name or normalized platform; '' for totals
+    StatKey = models.CharField(max_length=255, blank=True, default='')
+    StatCount = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'ArchiveStatistic'
+        constraints = [
+            models.UniqueConstraint(fields=['StatDimension', 'StatMonth', 'StatKey'], name='archivestat_bucket_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.StatMonth:%Y-%m} {self.StatDimension}:{self.StatKey} = {self.StatCount}"
+
+
 # ==============================
 # BACKUP MODEL
 # ==============================
+BACKUP_SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+
+
 class BackupHistory(models.Model):
     BackupHistoryID = models.UUIDField(
         primary_key=True,
@@ -197,16 +338,69 @@ class BackupHistory(models.Model):
         ('failed', 'Failed')
     ])
     BackupTimestamp = models.DateTimeField(auto_now_add=True)
+    # Display label ("12.34 MB"); kept in step with BackupSizeBytes on save
     BackupSize = models.CharField(max_length=50, blank=True, null=True)
+    BackupSizeBytes = models.BigIntegerField(blank=True, null=True)
+    BackupCompressedBytes = models.BigIntegerField(blank=True, null=True)
+    BackupDurationMs = models.IntegerField(blank=True, null=True)
     BackupLogFile = models.FileField(upload_to='logs/', blank=True, null=True)
     BackupFile = models.FileField(upload_to='backups/', blank=True, null=True)
+    # Table -> byte ranges / row counts in BackupFile, built on the first selective restore
+    BackupTableIndex = models.JSONField(blank=True, null=True)
+    # Per-table row counts and checksums of the dump, recorded when it was taken
+    BackupTableStats = models.JSONField(blank=True, null=True)
+    # Outcome of the last test restore into the scratch database
+    BackupVerifyStatus = models.CharField(max_length=20, blank=True, null=True, choices=[
+        ('passed', 'Passed'),
+        ('failed', 'Failed'),
+    ])
+    BackupVerifiedAt = models.DateTimeField(blank=True, null=True)
+    BackupVerifyRowsPerSecond = models.FloatField(blank=True, null=True)
+    BackupVerifyReport = models.JSONField(blank=True, null=True)
 
     class Meta:
         db_table = 'BackupHistory'
+        indexes = [
+            # Status filter + newest-first listing, and the dashboard aggregates
+            models.Index(fields=['BackupStatus', '-BackupTimestamp'], name='backup_status_time_idx'),
+            # Storage usage per month/status reads only this index; scanned backwards it
+            # also serves the newest-first listing
+            models.Index(
+                fields=['BackupTimestamp', 'BackupStatus', 'BackupSizeBytes', 'BackupCompressedBytes'],
+                name='backup_storage_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.BackupName} - {self.BackupTimestamp.strftime('%Y-%m-%d %H:%M:%S')}"
 
+    @staticmethod
+    def format_size(size_bytes):
+        return f"{(size_bytes or 0) / (1024 * 1024):.2f} MB"
+
+    @staticmethod
+    def parse_size(label):
+        """Bytes from a legacy size label like "12.34 MB"; None if it can't be read"""
+        match = re.match(r'^\s*([\d.]+)\s*([KMGT]?B)?\s*$', label or '', re.IGNORECASE)
+        if not match:
+            return None
+        try:
+            value = float(match.group(1))
+        except ValueError:
+            return None
+        unit = (match.group(2) or 'B').upper()
+        return int(round(value * BACKUP_SIZE_UNITS[unit]))
+
+    def save(self, *args, **kwargs):
+        if self.BackupSizeBytes is not None:
+            self.BackupSize = self.format_size(self.BackupSizeBytes)
+        elif self.BackupSize:
+            self.BackupSizeBytes = self.parse_size(self.BackupSize)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'BackupSize', 'BackupSizeBytes'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'BackupSize', 'BackupSizeBytes'}
+        super().save(*args, **kwargs)
+
 class RestoreOperation(models.Model):
     RestoreID = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     BackupHistoryID = models.ForeignKey(
@@ -223,9 +417,57 @@ class RestoreOperation(models.Model):
     RestoreMessage = models.TextField(blank=True, null=True)
     RestoreStartedAt = models.DateTimeField(auto_now_add=True)
     RestoreCompletedAt = models.DateTimeField(blank=True, null=True)
+    # Structured log (gzip JSON lines), uploaded once when the restore ends
+    RestoreLogFile = models.FileField(upload_to='logs/', blank=True, null=True)
 
     class Meta:
         db_table = 'RestoreOperation'
 
     def __str__(self):
-        return f"Restore {self.BackupHistoryID.BackupName} ({self.RestoreStatus})"
\ No newline at end of file
+        return f"Restore {self.BackupHistoryID.BackupName} ({self.RestoreStatus})"
+# ==============================
+# EXPORT JOB MODEL
+# ==============================
+class ExportJob(models.Model):
+    ExportJobID = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        db_column='ExportJobID'
+    )
+    ExportRequestedBy = models.ForeignKey(
+        'users.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='ExportRequestedBy'
+    )
+    ExportFilters = models.JSONField(default=dict, blank=True)
+    ExportStatus = models.CharField(max_length=20, choices=[
+        ('queued', 'Queued'),
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ], default='queued')
+    ExportProgress = models.IntegerField(default=0)
+    ExportTotalRows = models.IntegerField(default=0)
+    ExportProcessedRows = models.IntegerField(default=0)
+    ExportStorage = models.CharField(max_length=10, choices=[
+        ('s3', 'S3'),
+        ('local', 'Local'),
+    ], blank=True, default='')
+    ExportFile = models.FileField(upload_to='exports/', blank=True, null=True)
+    ExportMessage = models.TextField(blank=True, null=True)
+    ExportCreatedAt = models.DateTimeField(auto_now_add=True)
+    # Heartbeat: moved by every progress update of the running job
+    ExportUpdatedAt = models.DateTimeField(default=timezone.now)
+    ExportCompletedAt = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'ExportJob'
+        indexes = [
+            models.Index(fields=['ExportRequestedBy', '-ExportCreatedAt'], name='exportjob_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Export {self.ExportJobID} ({self.ExportStatus})"
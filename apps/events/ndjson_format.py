@@ -0,0 +1,122 @@
+"""
+Compact event export for analytics ("arcasys-events" NDJSON, version 1).
+
+Every line is one JSON value:
+
+* line 1 is a header object: {"format": "arcasys-events", "version": 1, "columns": [...]}
+* dictionary entries are objects, {"d": <dictionary>, "i": <index>, "v": <value>},
+  written the first time a department, tag or platform appears
+* every other line is a row array in `columns` order; dictionary-encoded
+  columns hold indexes, dates/times are ISO strings, null means empty
+
+Rows can be streamed as they are read from the database, and load_events()
+only runs json.loads per line, so there is no CSV quoting to undo. This
+module has no Django imports so analytics jobs can copy it as-is.
+"""
+import datetime
+import json
+
+FORMAT_NAME = "arcasys-events"
+FORMAT_VERSION = 1
+
+COLUMNS = [
+    # (name, type)
+    ("id", "str"),
+    ("title", "str"),
+    ("date", "date"),
+    ("time", "time"),
+    ("location", "str"),
+    ("department", "dict:department"),
+    ("tags", "list:dict:tag"),
+    ("links", "list:[dict:platform,str]"),
+    ("created_at", "datetime"),
+    ("updated_at", "datetime"),
+    ("description", "str"),
+]
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class EventEncoder:
+    """Turns event tuples into NDJSON lines, keeping the dictionaries as it goes"""
+
+    def __init__(self):
+        self._dictionaries = {"department": {}, "tag": {}, "platform": {}}
+
+    def header(self):
+        return _dumps({
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "columns": [name for name, _ in COLUMNS],
+            "types": dict(COLUMNS),
+        }) + "\n"
+
+    def _index(self, dictionary, value, out):
+        entries = self._dictionaries[dictionary]
+        index = entries.get(value)
+        if index is None:
+            index = entries[value] = len(entries)
+            out.append(_dumps({"d": dictionary, "i": index, "v": value}) + "\n")
+        return index
+
+    def encode(self, event_id, title, event_date, event_time, location, department, tags, links,
+               created_at, updated_at, description):
+        """
+        Lines for one event: any new dictionary entries followed by the row.
+        `tags` is a sequence of names, `links` a sequence of (platform, url).
+        """
+        out = []
+        row = [
+            str(event_id),
+            title,
+            event_date.isoformat() if event_date else None,
+            event_time.isoformat() if event_time else None,
+            location,
+            self._index("department", department, out) if department else None,
+            [self._index("tag", tag, out) for tag in tags],
+            [[self._index("platform", platform, out), url] for platform, url in links],
+            created_at.isoformat() if created_at else None,
+            updated_at.isoformat() if updated_at else None,
+            description,
+        ]
+        out.append(_dumps(row) + "\n")
+        return "".join(out)
+
+
+def load_events(lines):
+    """
+    Read an export (an iterable of lines, e.g. an open file) and yield one
+    dict per event with dictionary values, dates and times decoded.
+    """
+    lines = iter(lines)
+    header = json.loads(next(lines))
+    if header.get("format") != FORMAT_NAME or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported export: {header.get('format')} v{header.get('version')}")
+
+    columns = header["columns"]
+    dictionaries = {"department": [], "tag": [], "platform": []}
+    departments, tags, platforms = dictionaries["department"], dictionaries["tag"], dictionaries["platform"]
+    parse_date = datetime.date.fromisoformat
+    parse_time = datetime.time.fromisoformat
+    parse_datetime = datetime.datetime.fromisoformat
+    loads = json.loads
+
+    for line in lines:
+        value = loads(line)
+        if isinstance(value, dict):
+            entries = dictionaries[value["d"]]
+            # Indexes are assigned in order, so appending keeps them aligned
+            if value["i"] != len(entries):
+                raise ValueError(f"Out-of-order {value['d']} dictionary entry {value['i']}")
+            entries.append(value["v"])
+            continue
+
+        record = dict(zip(columns, value))
+        record["date"] = parse_date(record["date"]) if record["date"] else None
+        record["time"] = parse_time(record["time"]) if record["time"] else None
+        record["department"] = departments[record["department"]] if record["department"] is not None else None
+        record["tags"] = [tags[i] for i in record["tags"]]
+        record["links"] = [(platforms[i], url) for i, url in record["links"]]
+        record["created_at"] = parse_datetime(record["created_at"]) if record["created_at"] else None
+        record["updated_at"] = parse_datetime(record["updated_at"]) if record["updated_at"] else None
+        yield record
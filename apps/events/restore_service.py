@@ -0,0 +1,284 @@
+"""
+Full and selective database restores, run on background threads started
+by the restore views. Views import this module when a restore starts, so
+psql, S3 and backup machinery stay out of workers that never restore.
+"""
+import logging
+import os
+import platform
+from django.utils import timezone
+from apps.events.backup_reports import backfill_backup_sizes, bump_backups_version
+from apps.events.backup_script import persist_operation_log
+from apps.events.caching import bump_archive_version
+from apps.events.dedupe import assign_dedupe_keys
+from apps.events.models import BackupHistory, RestoreOperation
+from apps.events.restore_stream import FileSource, open_s3_source, pipe_into_psql, stage_to_disk_requested, \
+    staged_copy
+from apps.events.selective_restore import BackupReader, restore_events, restore_tables
+from apps.events.statistics import rebuild_archive_statistics
+from apps.events.summaries import backfill_link_platforms, backfill_summaries
+from apps.shared.operation_log import OperationLog, active_operation
+from apps.shared.reference_cache import invalidate_reference_data
+
+logger = logging.getLogger(__name__)
+
+# Emptied before a full restore loads the dump (children first); django_session is kept.
+# Inserts into any other table keep the rows already there.
+REPLACED_TABLES = ['EventTag', 'EventDepartment', 'EventLink', 'Event', 'Tag', 'Department', 'User', 'Role']
+
+
+def get_platform_config():
+    """Get platform-specific configuration"""
+    IS_RENDER = os.environ.get('RENDER', 'false').lower() == 'true'
+    IS_WINDOWS = platform.system().lower() == 'windows'
+
+    if IS_RENDER:
+        return {
+            'psql_path': 'psql',
+            'pg_dump_path': 'pg_dump',
+            'platform': 'render'
+        }
+    elif IS_WINDOWS:
+        return {
+            'psql_path': r"C:\Program Files\PostgreSQL\18\bin\psql.exe",
+            'pg_dump_path': r"C:\Program Files\PostgreSQL\18\bin\pg_dump.exe",
+            'platform': 'windows'
+        }
+    else:
+        return {
+            'psql_path': 'psql',
+            'pg_dump_path': 'pg_dump',
+            'platform': 'linux'
+        }
+
+
+def execute_full_restoration_async(backup_s3_key, restore_op_id):
+    """
+    Background restoration process.
+    """
+    from django.db import connection
+    connection.close()
+
+    oplog = OperationLog("restore", restore_op_id)
+    try:
+        restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
+        oplog.info(f"Full restoration from {backup_s3_key}")
+
+        _report_restore_progress(restore_op, 10, 'Downloading backup file...')
+
+        # Download and restore
+        success = restore_full_database_from_s3(backup_s3_key, restore_op)
+
+        # Update status
+        restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
+        if not success:
+            oplog.error(restore_op.RestoreMessage or 'Restoration failed')
+        restore_op.RestoreStatus = 'completed' if success else 'failed'
+        restore_op.RestoreProgress = 100
+        restore_op.RestoreMessage = 'FULL DATA RESTORATION COMPLETED' if success else 'RESTORATION FAILED'
+        restore_op.RestoreCompletedAt = timezone.now()
+        restore_op.save()
+        oplog.log(restore_op.RestoreMessage, level="INFO" if success else "ERROR", phase="finish")
+
+    except Exception as e:
+        oplog.error(f'Restoration failed: {str(e)}', phase="finish")
+        try:
+            restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
+            restore_op.RestoreStatus = 'failed'
+            restore_op.RestoreMessage = f'Restoration failed: {str(e)}'
+            restore_op.RestoreCompletedAt = timezone.now()
+            restore_op.save()
+        except RestoreOperation.DoesNotExist:
+            logger.error(f"RestoreOperation {restore_op_id} not found during error handling")
+    finally:
+        _persist_restore_log(restore_op_id, oplog)
+
+
+def _persist_restore_log(restore_op_id, oplog):
+    """Upload the restore's operation log once, now that it has ended"""
+    try:
+        log_key = persist_operation_log(oplog)
+        if log_key:
+            RestoreOperation.objects.filter(RestoreID=restore_op_id).update(RestoreLogFile=log_key)
+    except Exception as e:
+        logger.error(f"Could not persist log of restore {restore_op_id}: {str(e)}")
+    finally:
+        oplog.discard()
+
+
+def _report_restore_progress(restore_op, progress, message):
+    if restore_op:
+        restore_op.RestoreProgress = progress
+        restore_op.RestoreMessage = message
+        restore_op.save()
+        oplog = active_operation(restore_op.RestoreID)
+        if oplog:
+            oplog.info(message, progress=progress)
+
+
+def restore_full_database_from_s3(backup_s3_key, restore_op=None, stage_to_disk=None):
+    """
+    Restores straight from the S3 object stream. The backup is only copied
+    to a temp file first when staging is requested (RESTORE_STAGE_TO_DISK).
+    """
+    staged_path = None
+    try:
+        _report_restore_progress(restore_op, 20, 'Opening backup file...')
+
+        source = open_s3_source(backup_s3_key)
+
+        if stage_to_disk is None:
+            stage_to_disk = stage_to_disk_requested()
+        if stage_to_disk:
+            _report_restore_progress(restore_op, 25, 'Downloading backup file...')
+            staged_path = staged_copy(source)
+            source = FileSource(staged_path)
+
+        return restore_from_source(source, restore_op)
+
+    except Exception as e:
+        if restore_op:
+            restore_op.RestoreStatus = 'failed'
+            restore_op.RestoreMessage = f'Download failed: {str(e)}'
+            restore_op.RestoreCompletedAt = timezone.now()
+            restore_op.save()
+        return False
+
+    finally:
+        if staged_path and os.path.exists(staged_path):
+            os.unlink(staged_path)
+
+
+def execute_full_restoration(sql_file_path, restore_op=None):
+    """Restore from a backup file on local disk"""
+    return restore_from_source(FileSource(sql_file_path), restore_op)
+
+
+def restore_from_source(source, restore_op=None):
+    """
+    Actual restoration using psql - platform aware. `source` is a
+    restore_stream FileSource/S3Source; its bytes are piped into psql.
+    """
+    try:
+        db_host = os.getenv('DB_HOST')
+        db_port = os.getenv('DB_PORT', '5432')
+        db_name = os.getenv('DB_NAME')
+        db_user = os.getenv('DB_USER')
+        db_password = os.getenv('DB_PASSWORD')
+
+        # Get platform config
+        config = get_platform_config()
+        psql_path = config['psql_path']
+
+        env = os.environ.copy()
+
+        # Handle password based on platform
+        IS_RENDER = os.environ.get('RENDER', 'false').lower() == 'true'
+        if not IS_RENDER:
+            env['PGPASSWORD'] = db_password
+
+        _report_restore_progress(restore_op, 30, f'Preparing database for restoration on {config["platform"]}...')
+
+        # Build connection command based on platform
+        if IS_RENDER:
+            # Render connection string includes password
+            base_cmd = [
+                psql_path,
+                f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?sslmode=require"
+            ]
+        else:
+            # Local connection uses separate parameters
+            base_cmd = [
+                psql_path, '-h', db_host, '-p', db_port, '-U', db_user, '-d', db_name
+            ]
+
+        _report_restore_progress(restore_op, 40, 'Replacing existing data...')
+
+        # One psql session and one transaction: the replica role (no FK triggers), the
+        # DELETEs and the streamed dump either all commit or, on any error, none do
+        delete_script = "".join(f'DELETE FROM public."{table}";\n' for table in REPLACED_TABLES)
+
+        # Stream the backup into psql; progress runs 40-90% with the bytes read
+        def on_progress(percent):
+            _report_restore_progress(restore_op, 40 + percent * 50 // 100, f'Restoring data from backup... {percent}%')
+
+        returncode, stderr = pipe_into_psql(
+            base_cmd + ['--single-transaction', '-v', 'ON_ERROR_STOP=1'], env, source, on_progress,
+            preamble=delete_script, replaced_tables=REPLACED_TABLES,
+        )
+
+        if returncode != 0:
+            logger.error(f"Restoration failed, nothing was changed: {stderr}")
+            if restore_op:
+                restore_op.RestoreMessage = f'Data restoration failed (database unchanged): {stderr[:200]}'
+                restore_op.save()
+            return False
+
+        _report_restore_progress(restore_op, 90, 'Finalizing restoration...')
+
+        # psql bypasses model signals, so cached and denormalized data is stale now
+        invalidate_reference_data()
+        backfill_backup_sizes()
+        bump_backups_version()
+        backfill_summaries()
+        backfill_link_platforms()
+        assign_dedupe_keys()
+        rebuild_archive_statistics()
+        bump_archive_version()
+
+        logger.info(f"Database restoration completed successfully ({source.bytes_read} bytes)")
+        return True
+
+    except Exception as e:
+        logger.error(f"Restoration error: {str(e)}")
+        if restore_op:
+            restore_op.RestoreMessage = f'Restoration error: {str(e)}'
+            restore_op.save()
+        return False
+
+
+def execute_selective_restoration_async(backup_id, restore_op_id, tables, event_ids):
+    """Background selective restoration; the outcome is recorded on the RestoreOperation"""
+    from django.db import connection
+    connection.close()
+
+    oplog = OperationLog("restore", restore_op_id)
+    try:
+        backup = BackupHistory.objects.get(BackupHistoryID=backup_id)
+        restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
+        reader = BackupReader(backup=backup)
+
+        _report_restore_progress(restore_op, 10, 'Indexing backup contents...')
+        reader.index()
+        _report_restore_progress(restore_op, 30, 'Restoring selected rows...')
+
+        if event_ids:
+            report = restore_events(reader, event_ids)
+        else:
+            report = restore_tables(reader, tables)
+
+        restored = sum(stats['restored'] for stats in report.values() if isinstance(stats, dict))
+        skipped = sum(stats['skipped'] for stats in report.values() if isinstance(stats, dict))
+        message = f'SELECTIVE RESTORATION COMPLETED: {restored} rows restored'
+        if skipped:
+            message += f', {skipped} skipped'
+        if report.get('missing_events'):
+            message += f", {len(report['missing_events'])} event(s) not in this backup"
+
+        restore_op.RestoreStatus = 'completed'
+        restore_op.RestoreProgress = 100
+        restore_op.RestoreMessage = message
+        restore_op.RestoreCompletedAt = timezone.now()
+        restore_op.save()
+        oplog.info(message, phase="finish", report=report)
+
+    except Exception as e:
+        oplog.error(f"Restoration failed: {str(e)}", phase="finish")
+        RestoreOperation.objects.filter(RestoreID=restore_op_id).update(
+            RestoreStatus='failed',
+            RestoreMessage=f'Restoration failed: {str(e)}',
+            RestoreCompletedAt=timezone.now(),
+        )
+    finally:
+        _persist_restore_log(restore_op_id, oplog)
+        connection.close()
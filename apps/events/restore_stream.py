@@ -0,0 +1,231 @@
+"""
+Streaming restore sources.
+
+A source yields the backup's bytes in chunks and tracks how many have been
+consumed, so the restore can pipe them straight into psql and report
+progress against the object's size instead of staging a local copy first.
+"""
+import codecs
+import logging
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from apps.events.s3 import s3_client
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+RANGE_SIZE = 8 * 1024 * 1024
+MAX_RETRIES = 4
+
+# Inserts that must not fail when the row survived the restore (history of the restore itself)
+IDEMPOTENT_INSERTS = {
+    'BackupHistory': 'BackupHistoryID',
+    'RestoreOperation': 'RestoreID',
+}
+_INSERT_RE = re.compile(r'^INSERT INTO public\."(?P<table>\w+)"', re.IGNORECASE)
+
+
+class FileSource:
+    """Backup stored on local disk; `byte_range` (start, end) limits it to a slice"""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE, byte_range=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.start, self.end = byte_range or (0, os.path.getsize(path))
+        self.total_bytes = self.end - self.start
+        self.bytes_read = 0
+
+    def chunks(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.start)
+            while self.bytes_read < self.total_bytes:
+                chunk = f.read(min(self.chunk_size, self.total_bytes - self.bytes_read))
+                if not chunk:
+                    break
+                self.bytes_read += len(chunk)
+                yield chunk
+
+
+class S3Source:
+    """
+    Backup object on S3, read with ranged GETs. A failed or truncated range
+    is retried from the last byte received, with exponential backoff.
+    `byte_range` (start, end) limits reading to a slice of the object.
+    """
+
+    def __init__(self, s3_client, bucket, key, chunk_size=CHUNK_SIZE, range_size=RANGE_SIZE,
+                 max_retries=MAX_RETRIES, byte_range=None):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.chunk_size = chunk_size
+        self.range_size = range_size
+        self.max_retries = max_retries
+        if byte_range is None:
+            byte_range = (0, s3_client.head_object(Bucket=bucket, Key=key)['ContentLength'])
+        self.start, self.end = byte_range
+        self.total_bytes = self.end - self.start
+        self.bytes_read = 0
+
+    def _read_range(self, start, end):
+        body = self.s3.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}")['Body']
+        try:
+            yield from body.iter_chunks(self.chunk_size)
+        finally:
+            body.close()
+
+    def chunks(self):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        retries = 0
+        while self.bytes_read < self.total_bytes:
+            start = self.start + self.bytes_read
+            end = min(start + self.range_size, self.end) - 1
+            try:
+                for chunk in self._read_range(start, end):
+                    self.bytes_read += len(chunk)
+                    retries = 0
+                    yield chunk
+                if self.start + self.bytes_read <= end:
+                    raise IOError(f"range {start}-{end} ended early at byte {self.start + self.bytes_read}")
+            except (BotoCoreError, ClientError, IOError) as e:
+                retries += 1
+                if retries > self.max_retries:
+                    raise
+                delay = 2 ** (retries - 1)
+                logger.warning(
+                    f"S3 read of {self.key} failed at byte {self.start + self.bytes_read} ({str(e)}); "
+                    f"retry {retries}/{self.max_retries} in {delay}s"
+                )
+                time.sleep(delay)
+
+
+def open_s3_source(key, byte_range=None):
+    """S3Source for a backup key using the configured bucket and credentials"""
+    return S3Source(s3_client(), settings.AWS_STORAGE_BUCKET_NAME, key, byte_range=byte_range)
+
+
+def staged_copy(source):
+    """
+    Copy a source to a temporary file and return its path; the caller
+    deletes it. Only used when staging is explicitly requested.
+    """
+    fd, path = tempfile.mkstemp(suffix='.sql')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in source.chunks():
+                f.write(chunk)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def stage_to_disk_requested():
+    return getattr(settings, 'RESTORE_STAGE_TO_DISK', False)
+
+
+def iter_sql(chunks, replaced_tables=None):
+    """
+    Decode dump bytes and yield SQL text line by line, turning inserts
+    into BackupHistory / RestoreOperation into ON CONFLICT DO NOTHING.
+    With `replaced_tables` (tables emptied before the load), inserts into
+    any other table keep existing rows the same way.
+    """
+    # Strict: a dump that isn't valid UTF-8 must fail the restore, not load altered text
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='strict')
+    pending = ''
+    statement = None  # (lines, conflict column, quotes seen) for an idempotent insert in progress
+
+    def finish(line):
+        nonlocal statement
+        if statement is None:
+            match = _INSERT_RE.match(line)
+            if not match:
+                return line
+            table = match.group('table')
+            column = IDEMPOTENT_INSERTS.get(table)
+            if column is None and (replaced_tables is None or table in replaced_tables):
+                return line
+            statement = ([], column, 0)
+
+        lines, column, quotes = statement
+        lines.append(line)
+        # Balanced quotes ('' escapes count twice), as in selective_restore.iter_statements:
+        # a "\n);" inside a string literal doesn't end the statement
+        quotes += line.count("'")
+        statement = (lines, column, quotes)
+        if quotes % 2 or not line.rstrip().endswith(');'):
+            return ''
+        statement = None
+        text = ''.join(lines).rstrip()
+        target = f' ("{column}")' if column else ''
+        return f'{text[:-1]} ON CONFLICT{target} DO NOTHING;\n'
+
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split('\n')
+        pending = lines.pop()
+        out = ''.join(finish(line + '\n') for line in lines)
+        if out:
+            yield out
+
+    pending += decoder.decode(b'', final=True)
+    tail = finish(pending) if pending else ''
+    if statement is not None:
+        tail += ''.join(statement[0])
+    if tail:
+        yield tail
+
+
+def pipe_into_psql(cmd, env, source, on_progress=None, preamble='', replaced_tables=None):
+    """
+    Stream a source through iter_sql into psql's stdin, after `preamble`
+    (SQL run first in the same session); on_progress(percent) is called as
+    the share of bytes consumed grows. Returns (returncode, stderr tail).
+
+    If reading or decoding the source fails, psql is killed before its
+    input ends, so a --single-transaction session never commits.
+    """
+    process = subprocess.Popen(
+        cmd + ['-f', '-', '--quiet'],
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env
+    )
+
+    # Drain stderr on a thread so a chatty psql can't block on a full pipe
+    stderr_tail = deque(maxlen=200)
+    drain = threading.Thread(target=lambda: stderr_tail.extend(process.stderr), daemon=True)
+    drain.start()
+
+    last_percent = 0
+    try:
+        # Same session as the data, so constraint triggers really are off while loading
+        process.stdin.write(b"SET session_replication_role = 'replica';\n")
+        if preamble:
+            process.stdin.write(preamble.encode('utf-8'))
+        for text in iter_sql(source.chunks(), replaced_tables):
+            process.stdin.write(text.encode('utf-8'))
+
+            if on_progress and source.total_bytes:
+                percent = source.bytes_read * 100 // source.total_bytes
+                if percent > last_percent:
+                    last_percent = percent
+                    on_progress(percent)
+        process.stdin.close()
+    except BrokenPipeError:
+        # psql exited early; its return code and stderr say why
+        pass
+    except Exception:
+        process.kill()
+        raise
+    finally:
+        returncode = process.wait()
+        drain.join(timeout=5)
+
+    return returncode, b"".join(stderr_tail).decode('utf-8', errors='ignore')
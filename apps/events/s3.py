@@ -0,0 +1,26 @@
+"""
+S3 access for backups, logs and exports. boto3 (with botocore and
+s3transfer) is imported on first use rather than when the views load, so
+workers that never touch S3 don't pay for it.
+"""
+from django.conf import settings
+
+
+def s3_client():
+    import boto3
+
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME
+    )
+
+
+def presigned_download_url(key, expires_in=60):
+    """Short-lived GET URL for an object in the configured bucket"""
+    return s3_client().generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key},
+        ExpiresIn=expires_in
+    )
@@ -0,0 +1,188 @@
+"""
+Synthetic archive generator used by `manage.py seed_archive` and the
+benchmark runner. Rows are bulk-created, so model signals don't fire;
+denormalized fields are filled in directly, and dedupe keys, archive
+statistics and caches are brought up to date at the end.
+"""
+import datetime
+import random
+import uuid
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from apps.events.caching import bump_archive_version
+from apps.events.dedupe import assign_dedupe_keys
+from apps.events.models import Department, Event, EventDepartment, EventLink, EventTag, Tag
+from apps.events.statistics import rebuild_archive_statistics
+from apps.shared.reference_cache import get_role, invalidate_reference_data
+
+DEPARTMENT_NAMES = [
+    "College of Computer Studies", "College of Engineering and Architecture", "College of Management",
+    "College of Nursing", "College of Arts and Sciences", "College of Education", "College of Criminal Justice",
+    "Senior High School", "Junior High School", "Elementary School", "Marketing Office", "Registrar",
+    "Guidance Center", "Campus Ministry", "Research Office", "Alumni Affairs", "Athletics Office",
+    "Library", "Student Affairs", "Community Extension",
+]
+
+TAG_WORDS = [
+    "SDG", "Workshop", "Seminar", "Webinar", "Outreach", "Hackathon", "Orientation", "Sports", "Alumni",
+    "Research", "Career", "Music", "Arts", "Wellness", "Leadership", "Innovation", "Culture", "Faith",
+    "Scholarship", "Competition", "Exhibit", "Summit", "Training", "Volunteer", "Awards",
+]
+
+TITLE_PREFIXES = ["Annual", "Intercollegiate", "Regional", "University-wide", "Open", "Spring", "Midyear", "Grand"]
+TITLE_SUBJECTS = [
+    "Research Colloquium", "Career Fair", "Coding Bootcamp", "Leadership Summit", "Sports Fest", "Music Festival",
+    "Outreach Program", "Alumni Homecoming", "Design Exhibit", "Robotics Challenge", "Wellness Week",
+    "Faculty Forum", "Parents Orientation", "Innovation Expo", "Film Showing",
+]
+LOCATIONS = ["Gymnasium", "Main Auditorium", "Library Hall", "Engineering Lobby", "Online", "Quadrangle", "Room 301"]
+PLATFORMS = [
+    ("Facebook", "https://www.facebook.com/cituniversity/posts/"),
+    ("YouTube", "https://www.youtube.com/watch?v="),
+    ("TikTok", "https://www.tiktok.com/@cituniversity/video/"),
+    ("Website", "https://cit.edu/news/"),
+]
+LOREM = (
+    "The event brings together students, faculty and partners for a day of talks, hands-on sessions and "
+    "networking. Participants are encouraged to register early as seats are limited. Certificates will be "
+    "given to all attendees, and highlights will be posted on the official university pages afterwards."
+).split()
+
+
+def _description(rng):
+    # Mix of short and long descriptions, like real archive entries
+    words = rng.randint(20, 400)
+    return " ".join(rng.choice(LOREM) for _ in range(words)).capitalize() + "."
+
+
+def ensure_departments(count, rng):
+    existing = list(Department.objects.all())
+    names = {d.DepartmentName for d in existing}
+    new = []
+    i = 0
+    while len(existing) + len(new) < count:
+        base = DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)]
+        name = base if i < len(DEPARTMENT_NAMES) else f"{base} {i // len(DEPARTMENT_NAMES) + 1}"
+        if name not in names:
+            new.append(Department(DepartmentName=name))
+            names.add(name)
+        i += 1
+    Department.objects.bulk_create(new)
+    return existing + new
+
+
+def ensure_tags(count, rng):
+    existing = list(Tag.objects.all())
+    names = {t.TagName.casefold() for t in existing}
+    new = []
+    i = 0
+    while len(existing) + len(new) < count:
+        base = TAG_WORDS[i % len(TAG_WORDS)]
+        name = base if i < len(TAG_WORDS) else f"{base}{i // len(TAG_WORDS) + 1}"
+        if name.casefold() not in names:
+            new.append(Tag(TagName=name))
+            names.add(name.casefold())
+        i += 1
+    Tag.objects.bulk_create(new)
+    return existing + new
+
+
+def seed_users(count, rng, password="benchmark-password"):
+    """Create `count` active staff users sharing one pre-hashed password"""
+    from apps.users.models import User
+
+    role = get_role('Staff')
+    password_hash = make_password(password)
+    now = timezone.now()
+    suffix = uuid.uuid4().hex[:8]
+    users = [
+        User(
+            RoleID=role,
+            UserFullName=f"Seed User {suffix}-{i}",
+            UserEmail=f"seed.{suffix}.{i}@cit.edu",
+            UserPasswordHash=password_hash,
+            UserCreatedAt=now,
+            isUserActive=True,
+            isUserStaff=True,
+        )
+        for i in range(count)
+    ]
+    User.objects.bulk_create(users, batch_size=1000)
+    return len(users)
+
+
+def seed_events(count, departments, tags, rng, batch_size=1000, years=5):
+    """Bulk-create `count` events with one department, 0-5 tags and 0-4 links each"""
+    today = datetime.date.today()
+    created = 0
+    separator = Event.SUMMARY_SEPARATOR
+
+    while created < count:
+        n = min(batch_size, count - created)
+        events, event_depts, event_tags, event_links = [], [], [], []
+
+        for _ in range(n):
+            dept = rng.choice(departments)
+            event_tag_objs = rng.sample(tags, k=min(len(tags), rng.randint(0, 5)))
+            platforms = rng.sample(PLATFORMS, k=rng.randint(0, len(PLATFORMS)))
+            created_at = timezone.now() - datetime.timedelta(minutes=rng.randint(0, years * 525600))
+
+            event = Event(
+                EventTitle=f"{rng.choice(TITLE_PREFIXES)} {rng.choice(TITLE_SUBJECTS)} {rng.randint(1, 9999)}",
+                EventDescription=_description(rng),
+                EventDate=today - datetime.timedelta(days=rng.randint(-60, years * 365)),
+                EventTime=datetime.time(rng.randint(7, 19), rng.choice([0, 15, 30, 45])),
+                EventLocation=rng.choice(LOCATIONS),
+                EventCreatedAt=created_at,
+                EventUpdatedAt=created_at,
+                EventPrimaryDepartmentID=dept.DepartmentID,
+                EventPrimaryDepartmentName=dept.DepartmentName,
+                EventTagNames=separator.join(t.TagName for t in event_tag_objs),
+                EventPlatforms=separator.join(sorted(name for name, _ in platforms)),
+            )
+            events.append(event)
+            event_depts.append(EventDepartment(EventID=event, DepartmentID=dept))
+            # Strictly increasing assignment times keep EventTagNames in summary order
+            event_tags.extend(
+                EventTag(EventID=event, TagID=t, EventTagAssignedAt=created_at + datetime.timedelta(microseconds=i))
+                for i, t in enumerate(event_tag_objs)
+            )
+            event_links.extend(
+                EventLink(
+                    EventID=event,
+                    EventLinkName=name,
+                    EventLinkPlatform=EventLink.normalize_platform(name),
+                    EventLinkURL=f"{url}{uuid.uuid4().hex[:12]}",
+                )
+                for name, url in platforms
+            )
+
+        with transaction.atomic():
+            Event.objects.bulk_create(events)
+            EventDepartment.objects.bulk_create(event_depts)
+            EventTag.objects.bulk_create(event_tags)
+            EventLink.objects.bulk_create(event_links)
+        created += n
+
+    return created
+
+
+def seed_archive(events, departments=20, tags=60, users=0, batch_size=1000, seed=None):
+    """Generate a synthetic archive; returns a dict of row counts created"""
+    rng = random.Random(seed)
+    dept_objs = ensure_departments(departments, rng)
+    tag_objs = ensure_tags(tags, rng)
+    created_users = seed_users(users, rng) if users else 0
+    created_events = seed_events(events, dept_objs, tag_objs, rng, batch_size=batch_size)
+
+    assign_dedupe_keys()
+    rebuild_archive_statistics()
+    invalidate_reference_data()
+    bump_archive_version()
+    return {
+        'events': created_events,
+        'departments': len(dept_objs),
+        'tags': len(tag_objs),
+        'users': created_users,
+    }
@@ -0,0 +1,405 @@
+"""
+Selective restore: bring back chosen tables, or chosen events with their
+tags, departments and links, from a data-only backup without touching
+anything else.
+
+pg_dump --inserts writes each table's rows as one contiguous run of INSERT
+statements, so a backup is indexed once (table -> byte ranges, row counts)
+and later restores only read the ranges they need. Rows are upserted
+(INSERT ... ON CONFLICT (pk) DO UPDATE), parents before children.
+"""
+import logging
+import re
+import uuid
+from django.apps import apps
+from django.db import DatabaseError, connection, transaction
+from apps.events.caching import bump_archive_version
+from apps.events.dedupe import assign_dedupe_keys, update_dedupe_keys
+from apps.events.restore_stream import FileSource, open_s3_source
+from apps.events.statistics import apply_changes, rebuild_archive_statistics, stat_rows
+from apps.events.summaries import backfill_link_platforms, refresh_event_summaries, backfill_summaries
+from apps.shared.reference_cache import invalidate_reference_data
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Restorable tables, parents first so foreign keys resolve
+RESTORABLE_TABLES = ['Role', 'User', 'Department', 'Tag', 'Event', 'EventDepartment', 'EventTag', 'EventLink']
+EVENT_CHILD_TABLES = ['EventDepartment', 'EventTag', 'EventLink']
+
+_INSERT_PREFIX = b'INSERT INTO public."'
+_STATEMENT_RE = re.compile(
+    r'^INSERT INTO public\."(?P<table>\w+)"\s*(?:\((?P<columns>[^)]*)\))?\s*VALUES\s*\((?P<values>.*)\);\s*$',
+    re.DOTALL,
+)
+
+
+class SelectiveRestoreError(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# Reading statements
+# ---------------------------------------------------------
+def iter_statements(chunks, offset=0):
+    """
+    Yield (start, end, statement bytes) for each complete statement line.
+    A statement spans several lines when a string literal contains
+    newlines; quotes are balanced ('' escapes count twice) once it ends.
+    """
+    pending = b''
+    position = offset
+    current, current_start, quotes = [], None, 0
+
+    def lines_of(data):
+        nonlocal pending
+        data = pending + data
+        parts = data.split(b'\n')
+        pending = parts.pop()
+        return parts
+
+    def feed(line):
+        nonlocal position, current, current_start, quotes
+        start = position
+        position += len(line) + 1
+        if current_start is None:
+            current_start = start
+        current.append(line)
+        quotes += line.count(b"'")
+        if quotes % 2 == 0:
+            statement = b'\n'.join(current)
+            result = (current_start, position, statement)
+            current, current_start, quotes = [], None, 0
+            return result
+        return None
+
+    for chunk in chunks:
+        for line in lines_of(chunk):
+            result = feed(line)
+            if result:
+                yield result
+
+    if pending:
+        result = feed(pending)
+        if result:
+            yield result[0], result[1] - 1, result[2]
+
+
+def statement_table(statement):
+    if not statement.startswith(_INSERT_PREFIX):
+        return None
+    end = statement.find(b'"', len(_INSERT_PREFIX))
+    return statement[len(_INSERT_PREFIX):end].decode('utf-8', errors='ignore')
+
+
+def build_table_index(source):
+    """Scan a whole backup once: {"tables": {table: {"ranges": [[start, end]], "rows": n}}}"""
+    tables = {}
+    last_table, range_start, range_end = None, None, None
+
+    def close_range():
+        if last_table is not None:
+            tables.setdefault(last_table, {'ranges': [], 'rows': 0})['ranges'].append([range_start, range_end])
+
+    for start, end, statement in iter_statements(source.chunks()):
+        table = statement_table(statement)
+        if table is None:
+            continue
+        if table != last_table:
+            close_range()
+            last_table, range_start = table, start
+        range_end = end
+        tables.setdefault(table, {'ranges': [], 'rows': 0})['rows'] += 1
+    close_range()
+
+    return {'version': INDEX_VERSION, 'size': source.total_bytes, 'tables': tables}
+
+
+# ---------------------------------------------------------
+# Backups
+# ---------------------------------------------------------
+class BackupReader:
+    """Opens a backup (S3 key, or a local dump for tooling) and serves table ranges"""
+
+    def __init__(self, backup=None, path=None):
+        if backup is None and path is None:
+            raise SelectiveRestoreError("A backup or a dump path is required")
+        if backup is not None and not backup.BackupFile:
+            raise SelectiveRestoreError("This backup has no file to restore from")
+        self.backup = backup
+        self.path = path
+
+    def source(self, byte_range=None):
+        if self.path:
+            return FileSource(self.path, byte_range=byte_range)
+        return open_s3_source(str(self.backup.BackupFile), byte_range=byte_range)
+
+    def index(self):
+        """Table index, built on first use and stored on the BackupHistory row"""
+        if self.backup is not None:
+            stored = self.backup.BackupTableIndex
+            if stored and stored.get('version') == INDEX_VERSION:
+                return stored
+
+        table_index = build_table_index(self.source())
+        if self.backup is not None:
+            self.backup.BackupTableIndex = table_index
+            self.backup.save(update_fields=['BackupTableIndex'])
+        return table_index
+
+    def statements(self, table):
+        """Statements for one table, reading only its byte ranges"""
+        entry = self.index()['tables'].get(table)
+        if not entry:
+            return
+        for start, end in entry['ranges']:
+            for _, _, statement in iter_statements(self.source((start, end)).chunks(), offset=start):
+                if statement_table(statement) == table:
+                    yield statement.decode('utf-8', errors='ignore')
+
+
+# ---------------------------------------------------------
+# Upserts
+# ---------------------------------------------------------
+def split_values(values):
+    """Split the inside of VALUES (...) into literals, honouring quotes and parentheses"""
+    parts, current, depth, in_string = [], [], 0, False
+    i = 0
+    while i < len(values):
+        ch = values[i]
+        current.append(ch)
+        if in_string:
+            if ch == "'":
+                if i + 1 < len(values) and values[i + 1] == "'":
+                    current.append("'")
+                    i += 1
+                else:
+                    in_string = False
+        elif ch == "'":
+            in_string = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            current.pop()
+            parts.append(''.join(current).strip())
+            current = []
+        i += 1
+    parts.append(''.join(current).strip())
+    return parts
+
+
+def statement_values(statement):
+    """The SQL literals of one dump INSERT, in column order"""
+    match = _STATEMENT_RE.match(statement)
+    if not match:
+        raise SelectiveRestoreError(f"Unrecognised statement: {statement[:80]}")
+    return split_values(match.group('values'))
+
+
+def parse_row(statement, columns):
+    """{column: SQL literal} for one dump INSERT (columns from the statement, else the table's order)"""
+    match = _STATEMENT_RE.match(statement)
+    if not match:
+        raise SelectiveRestoreError(f"Unrecognised statement: {statement[:80]}")
+    values = split_values(match.group('values'))
+    if match.group('columns'):
+        names = [name.strip().strip('"') for name in match.group('columns').split(',')]
+    else:
+        names = columns[:len(values)]
+    if len(names) != len(values):
+        raise SelectiveRestoreError(f"{match.group('table')}: {len(values)} values for {len(names)} columns")
+    return dict(zip(names, values))
+
+
+def _literal_text(literal):
+    if not literal or literal == 'NULL':
+        return ''
+    return literal[1:-1].replace("''", "'") if literal.startswith("'") else literal
+
+
+def _normalize_uuid(value):
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _literal_uuid(literal):
+    text = _literal_text(literal)
+    return _normalize_uuid(text) if text else None
+
+
+def _models_by_table():
+    return {model._meta.db_table: model for model in apps.get_models()}
+
+
+def _table_columns(cursor, table):
+    return [column.name for column in connection.introspection.get_table_description(cursor, table)]
+
+
+def upsert_sql(statement, columns, pk_column):
+    """
+    Rewrite a dump INSERT as an upsert on the primary key. Dumps without a
+    column list map values onto the table's columns in order, which is how
+    PostgreSQL itself reads them (missing trailing columns take defaults).
+    """
+    row = parse_row(statement, columns)
+    names = list(row)
+    table = _STATEMENT_RE.match(statement).group('table')
+
+    quoted = ", ".join(connection.ops.quote_name(name) for name in names)
+    updates = ", ".join(
+        f"{connection.ops.quote_name(name)} = EXCLUDED.{connection.ops.quote_name(name)}"
+        for name in names if name != pk_column
+    )
+    conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    return (
+        f"INSERT INTO {connection.ops.quote_name(table)} ({quoted}) "
+        f"VALUES ({', '.join(row.values())}) ON CONFLICT ({connection.ops.quote_name(pk_column)}) {conflict}"
+    )
+
+
+def _apply(statements_by_table, report):
+    """Upsert each table's statements; a row that violates a constraint is skipped and reported"""
+    models = _models_by_table()
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Django's foreign keys are DEFERRABLE INITIALLY DEFERRED; check them per row so an
+            # orphan fails its own savepoint instead of the commit of the whole restore
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for table in RESTORABLE_TABLES:
+            statements = statements_by_table.get(table)
+            if not statements:
+                continue
+            columns = _table_columns(cursor, table)
+            pk_column = models[table]._meta.pk.column
+            stats = report.setdefault(table, {'restored': 0, 'skipped': 0, 'errors': []})
+
+            for statement in statements:
+                try:
+                    with transaction.atomic():
+                        cursor.execute(upsert_sql(statement, columns, pk_column))
+                    stats['restored'] += 1
+                except (DatabaseError, SelectiveRestoreError) as e:
+                    stats['skipped'] += 1
+                    if len(stats['errors']) < 5:
+                        stats['errors'].append(str(e).strip().splitlines()[0])
+    return report
+
+
+def _after_restore(event_ids=None, before=None):
+    """
+    Raw SQL bypasses model signals: refresh denormalized data and caches.
+    A whole-table restore rebuilds them; an event restore only touches the
+    restored events, given their statistics rows from before the upsert.
+    """
+    if event_ids is None:
+        backfill_summaries()
+        backfill_link_platforms()
+        # Upserted events never passed through Event.save() or the incremental statistics path
+        assign_dedupe_keys()
+        rebuild_archive_statistics()
+    else:
+        # Move the rollup from the pre-restore rows to the upserted ones; the summary
+        # refresh then applies its own (upserted -> refreshed) change on top
+        after = stat_rows(event_ids)
+        apply_changes([
+            (before.get(event_id), after.get(event_id))
+            for event_id in event_ids if before.get(event_id) or after.get(event_id)
+        ])
+        refresh_event_summaries(event_ids)
+        backfill_link_platforms(event_ids)
+        update_dedupe_keys(event_ids)
+    invalidate_reference_data()
+    bump_archive_version()
+
+
+# ---------------------------------------------------------
+# Entry points
+# ---------------------------------------------------------
+def restore_tables(reader, tables):
+    """Upsert every row of the chosen tables from the backup"""
+    unknown = set(tables) - set(RESTORABLE_TABLES)
+    if unknown:
+        raise SelectiveRestoreError(f"Tables can't be restored selectively: {', '.join(sorted(unknown))}")
+
+    statements = {table: list(reader.statements(table)) for table in RESTORABLE_TABLES if table in tables}
+    report = _apply(statements, {})
+    _after_restore()
+    return report
+
+
+def restore_events(reader, event_ids):
+    """
+    Upsert the chosen events with their department/tag/link rows, and the
+    departments and tags those rows (and the events' primary department) use
+    """
+    wanted = {_normalize_uuid(event_id) for event_id in event_ids}
+    if not wanted:
+        raise SelectiveRestoreError("No events chosen")
+
+    with connection.cursor() as cursor:
+        columns = {table: _table_columns(cursor, table) for table in RESTORABLE_TABLES}
+
+    def rows(table, keep):
+        matched = []
+        for statement in reader.statements(table):
+            try:
+                if keep(parse_row(statement, columns[table])):
+                    matched.append(statement)
+            except SelectiveRestoreError as e:
+                logger.warning(f"Skipping unreadable {table} row in backup: {str(e)}")
+        return matched
+
+    statements = {'Event': rows('Event', lambda row: _literal_uuid(row.get('EventID')) in wanted)}
+    found = set()
+    departments, tags = set(), set()
+    for statement in statements['Event']:
+        row = parse_row(statement, columns['Event'])
+        found.add(_literal_uuid(row['EventID']))
+        departments.add(_literal_uuid(row.get('EventPrimaryDepartmentID')))
+
+    for table in EVENT_CHILD_TABLES:
+        statements[table] = rows(table, lambda row: _literal_uuid(row.get('EventID')) in found)
+        for statement in statements[table]:
+            row = parse_row(statement, columns[table])
+            departments.add(_literal_uuid(row.get('DepartmentID')))
+            tags.add(_literal_uuid(row.get('TagID')))
+
+    statements['Department'] = rows('Department', lambda row: _literal_uuid(row.get('DepartmentID')) in departments)
+    statements['Tag'] = rows('Tag', lambda row: _literal_uuid(row.get('TagID')) in tags)
+
+    restored_ids = [uuid.UUID(event_id) for event_id in found]
+    before = stat_rows(restored_ids)
+    report = _apply(statements, {})
+    report['missing_events'] = sorted(wanted - found)
+    _after_restore(event_ids=restored_ids, before=before)
+    return report
+
+
+def search_backup_events(reader, query='', limit=50):
+    """(id, title, date) of events in the backup whose title contains `query`"""
+    results = []
+    query = query.casefold()
+    with connection.cursor() as cursor:
+        columns = _table_columns(cursor, 'Event')
+
+    for statement in reader.statements('Event'):
+        try:
+            row = parse_row(statement, columns)
+        except SelectiveRestoreError:
+            continue
+        title = _literal_text(row.get('EventTitle'))
+        if query and query not in title.casefold():
+            continue
+        results.append({
+            'id': _literal_uuid(row.get('EventID')),
+            'title': title,
+            'date': _literal_text(row.get('EventDate')),
+        })
+        if len(results) >= limit:
+            break
+    return results
@@ -0,0 +1,93 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from apps.events.backup_reports import bump_backups_version
+from apps.events.caching import bump_archive_version
+from apps.events.models import BackupHistory, Department, Event, EventDepartment, EventLink, EventTag, Tag
+from apps.events.statistics import apply_changes, finish_delete, instance_row, start_delete, stat_rows, \
+    STAT_FIELDS
+from apps.events.summaries import refresh_event_summaries, refresh_summaries_for_tag, \
+    rename_department_in_summaries
+from apps.shared.reference_cache import invalidate_reference_data
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_reference_cache(sender, **kwargs):
+    """Drop cached departments/tags whenever one is saved or deleted"""
+    invalidate_reference_data()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=EventDepartment)
+@receiver(post_delete, sender=EventDepartment)
+@receiver(post_save, sender=EventTag)
+@receiver(post_delete, sender=EventTag)
+@receiver(post_save, sender=EventLink)
+@receiver(post_delete, sender=EventLink)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_archive_cache(sender, **kwargs):
+    """Any archive write invalidates cached fragments built from it"""
+    bump_archive_version()
+
+
+@receiver(post_save, sender=EventDepartment)
+@receiver(post_delete, sender=EventDepartment)
+@receiver(post_save, sender=EventTag)
+@receiver(post_delete, sender=EventTag)
+@receiver(post_save, sender=EventLink)
+@receiver(post_delete, sender=EventLink)
+def refresh_event_summary(sender, instance, **kwargs):
+    """Keep Event's denormalized department/tag/platform fields in step"""
+    refresh_event_summaries([instance.EventID_id])
+
+
+@receiver(pre_save, sender=Event)
+def remember_event_statistics(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or (update_fields is not None and not set(update_fields) & set(STAT_FIELDS)):
+        instance._statistics_before = None
+        return
+    instance._statistics_before = stat_rows([instance.pk]).get(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+def update_event_statistics(sender, instance, created, update_fields=None, **kwargs):
+    """Move the event between statistics buckets when its date or summary fields change"""
+    if not created and update_fields is not None and not set(update_fields) & set(STAT_FIELDS):
+        return
+    before = None if created else getattr(instance, '_statistics_before', None)
+    apply_changes([(before, instance_row(instance))])
+
+
+@receiver(pre_delete, sender=Event)
+def begin_event_statistics_delete(sender, instance, **kwargs):
+    start_delete(instance)
+
+
+@receiver(post_delete, sender=Event)
+def end_event_statistics_delete(sender, instance, **kwargs):
+    finish_delete(instance)
+
+
+@receiver(post_save, sender=Department)
+def sync_department_name(sender, instance, created, **kwargs):
+    if not created:
+        rename_department_in_summaries(instance.DepartmentID, instance.DepartmentName)
+
+
+@receiver(post_save, sender=Tag)
+def sync_tag_name(sender, instance, created, **kwargs):
+    if not created:
+        refresh_summaries_for_tag(instance.TagID)
+
+
+@receiver(post_save, sender=BackupHistory)
+@receiver(post_delete, sender=BackupHistory)
+def invalidate_backup_reports(sender, **kwargs):
+    """Backup dashboard aggregates are cached until the next backup write"""
+    bump_backups_version()
@@ -0,0 +1,252 @@
+"""
+Archive statistics: events per month overall and per department, tag and
+platform, kept in the ArchiveStatistic rollup table.
+
+An event's buckets follow from its EventDate and its summary fields, so
+the rollup is maintained next to them: Event saves and deletes
+(signals.py) and refresh_event_summaries() hand the row before and after
+the write to apply_changes(), which adds or subtracts one per bucket that
+was entered or left. Paths that bypass signals (restores, seeding) call
+rebuild_archive_statistics() instead. Reads only touch the rollup, so the
+dashboard costs the same however large the archive grows.
+"""
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import date
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
+from apps.events.models import ArchiveStatistic, Event, EventLink
+from apps.shared.reference_cache import get_departments
+
+logger = logging.getLogger(__name__)
+
+STAT_FIELDS = ['EventDate', 'EventPrimaryDepartmentID', 'EventTagNames', 'EventPlatforms']
+
+DEFAULT_MONTHS = 12
+DEFAULT_TOP = 10
+
+_state = threading.local()
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _split(value):
+    return [part for part in (value or '').split(Event.SUMMARY_SEPARATOR) if part]
+
+
+def event_buckets(row):
+    """(dimension, month, key) buckets an event counts towards; `row` maps STAT_FIELDS to values"""
+    if row is None or row.get('EventDate') is None:
+        return set()
+    month = month_start(row['EventDate'])
+    buckets = {('total', month, '')}
+    if row['EventPrimaryDepartmentID']:
+        buckets.add(('department', month, str(row['EventPrimaryDepartmentID'])))
+    buckets.update(('tag', month, name[:255]) for name in _split(row['EventTagNames']))
+    for name in _split(row['EventPlatforms']):
+        platform = EventLink.normalize_platform(name)
+        if platform:
+            buckets.add(('platform', month, platform[:255]))
+    return buckets
+
+
+def stat_rows(event_ids):
+    """{EventID: row} of the fields that decide an event's buckets, as currently stored"""
+    # Events being deleted are counted by the delete, not by their cascading junction rows
+    event_ids = set(event_ids) - getattr(_state, 'deleting', set())
+    if not event_ids:
+        return {}
+    return {
+        row['EventID']: row
+        for row in Event.objects.filter(pk__in=event_ids).values('EventID', *STAT_FIELDS)
+    }
+
+
+def instance_row(event):
+    return {'EventID': event.pk, **{field: getattr(event, field) for field in STAT_FIELDS}}
+
+
+# ---------------------------------------------------------
+# Incremental maintenance
+# ---------------------------------------------------------
+def _add(dimension, month, key, delta):
+    bucket = ArchiveStatistic.objects.filter(StatDimension=dimension, StatMonth=month, StatKey=key)
+    if bucket.update(StatCount=F('StatCount') + delta):
+        return
+    try:
+        with transaction.atomic():
+            ArchiveStatistic.objects.create(StatDimension=dimension, StatMonth=month, StatKey=key, StatCount=delta)
+    except IntegrityError:
+        # Another request created the bucket first
+        bucket.update(StatCount=F('StatCount') + delta)
+
+
+def _apply_deltas(deltas):
+    """One UPDATE per distinct delta for existing buckets; missing ones are inserted"""
+    # Months x keys covers every changed bucket (and maybe a few others, skipped below)
+    candidates = ArchiveStatistic.objects.filter(
+        StatMonth__in={month for _, month, _ in deltas},
+        StatKey__in={key for _, _, key in deltas},
+    ).values_list('StatisticID', 'StatDimension', 'StatMonth', 'StatKey')
+    existing = {
+        (dimension, month, key): pk
+        for pk, dimension, month, key in candidates
+        if (dimension, month, key) in deltas
+    }
+    by_delta = defaultdict(list)
+    for bucket, delta in deltas.items():
+        if bucket in existing:
+            by_delta[delta].append(existing[bucket])
+    for delta, ids in by_delta.items():
+        ArchiveStatistic.objects.filter(pk__in=ids).update(StatCount=F('StatCount') + delta)
+
+    missing = {bucket: delta for bucket, delta in deltas.items() if bucket not in existing}
+    if not missing:
+        return
+    try:
+        with transaction.atomic():
+            ArchiveStatistic.objects.bulk_create([
+                ArchiveStatistic(StatDimension=dimension, StatMonth=month, StatKey=key, StatCount=delta)
+                for (dimension, month, key), delta in missing.items()
+            ])
+    except IntegrityError:
+        # Some were created concurrently; fall back to one bucket at a time
+        for (dimension, month, key), delta in missing.items():
+            _add(dimension, month, key, delta)
+
+
+def apply_changes(changes):
+    """
+    Apply (before, after) row pairs to the rollup; None stands for a row
+    that didn't exist. Only buckets whose net count changed are written.
+    """
+    deltas = Counter()
+    for before, after in changes:
+        old, new = event_buckets(before), event_buckets(after)
+        for bucket in new - old:
+            deltas[bucket] += 1
+        for bucket in old - new:
+            deltas[bucket] -= 1
+
+    deltas = {bucket: delta for bucket, delta in deltas.items() if delta}
+    if deltas:
+        _apply_deltas(deltas)
+
+
+def start_delete(event):
+    """Called before an event is deleted, so cascading junction deletes leave its buckets alone"""
+    if getattr(_state, 'deleting', None) is None:
+        _state.deleting = set()
+    _state.deleting.add(event.pk)
+
+
+def finish_delete(event):
+    _state.deleting.discard(event.pk)
+    apply_changes([(instance_row(event), None)])
+
+
+# ---------------------------------------------------------
+# Full rebuild
+# ---------------------------------------------------------
+def compute_archive_statistics(batch_size=2000):
+    """Bucket counts computed from every event, as {(dimension, month, key): count}"""
+    counts = Counter()
+    for row in Event.objects.values('EventID', *STAT_FIELDS).iterator(chunk_size=batch_size):
+        counts.update(event_buckets(row))
+    return counts
+
+
+@transaction.atomic
+def rebuild_archive_statistics(batch_size=2000):
+    """Recompute the whole rollup from the events table; returns the number of buckets"""
+    counts = compute_archive_statistics(batch_size)
+    ArchiveStatistic.objects.all().delete()
+    ArchiveStatistic.objects.bulk_create(
+        [
+            ArchiveStatistic(StatDimension=dimension, StatMonth=month, StatKey=key, StatCount=count)
+            for (dimension, month, key), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+    logger.info(f"Archive statistics rebuilt: {len(counts)} buckets")
+    return len(counts)
+
+
+def find_stale_statistics():
+    """Yield (dimension, month, key, stored, expected) for buckets that disagree with the events"""
+    expected = compute_archive_statistics()
+    stored = {
+        (dimension, month, key): count
+        for dimension, month, key, count in ArchiveStatistic.objects.values_list(
+            'StatDimension', 'StatMonth', 'StatKey', 'StatCount'
+        )
+    }
+    for bucket in sorted(set(expected) | set(stored)):
+        if stored.get(bucket, 0) != expected.get(bucket, 0):
+            yield (*bucket, stored.get(bucket, 0), expected.get(bucket, 0))
+
+
+# ---------------------------------------------------------
+# Reads
+# ---------------------------------------------------------
+def latest_month():
+    month = ArchiveStatistic.objects.filter(StatCount__gt=0).aggregate(latest=Max('StatMonth'))['latest']
+    return month or month_start(date.today())
+
+
+def get_archive_statistics(start=None, end=None, top=DEFAULT_TOP):
+    """
+    Monthly totals between two months (inclusive) and the busiest
+    departments, tags and platforms over the same range.
+    """
+    end = month_start(end) if end else latest_month()
+    start = month_start(start) if start else add_months(end, 1 - DEFAULT_MONTHS)
+    if start > end:
+        start, end = end, start
+
+    totals = Counter()
+    sums = {'department': Counter(), 'tag': Counter(), 'platform': Counter()}
+    rows = ArchiveStatistic.objects.filter(StatMonth__range=(start, end), StatCount__gt=0).values_list(
+        'StatDimension', 'StatMonth', 'StatKey', 'StatCount'
+    )
+    for dimension, month, key, count in rows:
+        if dimension == 'total':
+            totals[month] += count
+        else:
+            sums[dimension][key] += count
+
+    months = []
+    month = start
+    while month <= end:
+        months.append({'month': month, 'count': totals[month]})
+        month = add_months(month, 1)
+    busiest = max((row['count'] for row in months), default=0)
+    for row in months:
+        row['percent'] = round(row['count'] * 100 / busiest) if busiest else 0
+
+    department_names = {str(dept.DepartmentID): dept.DepartmentName for dept in get_departments()}
+
+    def ranked(dimension, label=lambda key: key):
+        return [
+            {'key': key, 'name': label(key), 'count': count}
+            for key, count in sorted(sums[dimension].items(), key=lambda item: (-item[1], item[0]))[:top]
+        ]
+
+    return {
+        'start': start,
+        'end': end,
+        'total': sum(totals.values()),
+        'months': months,
+        'distinct': {dimension: len(keys) for dimension, keys in sums.items()},
+        'departments': ranked('department', lambda key: department_names.get(key, "Unknown department")),
+        'tags': ranked('tag'),
+        'platforms': ranked('platform'),
+    }
@@ -0,0 +1,191 @@
+"""
+Maintenance of the denormalized read fields on Event
+(EventPrimaryDepartmentID/Name, EventTagNames, EventPlatforms).
+
+Junction-table signals call refresh_event_summaries(); views that write
+several junction rows wrap the work in deferred_summary_refresh() so each
+event is recomputed once instead of once per row. Changes are passed on to
+the archive statistics rollup (statistics.py) and, when the primary
+department moves, to the event's dedupe key (dedupe.py).
+"""
+import threading
+from contextlib import contextmanager
+from django.db.models.functions import Lower, Trim
+from apps.events.dedupe import update_dedupe_keys
+from apps.events.models import Event, EventDepartment, EventLink, EventTag
+from apps.events.statistics import apply_changes, stat_rows
+
+SUMMARY_FIELDS = ['EventPrimaryDepartmentID', 'EventPrimaryDepartmentName', 'EventTagNames', 'EventPlatforms']
+
+_state = threading.local()
+
+
+def build_event_summaries(event_ids):
+    """
+    Compute summary field values for the given events from the junction
+    tables, in three queries regardless of how many events are passed.
+    """
+    event_ids = list(event_ids)
+    summaries = {
+        event_id: {
+            'EventPrimaryDepartmentID': None,
+            'EventPrimaryDepartmentName': '',
+            'tags': [],
+            'platforms': [],
+        }
+        for event_id in event_ids
+    }
+    if not event_ids:
+        return {}
+
+    # Primary department = earliest assignment, matching the single department the UI shows
+    dept_rows = (
+        EventDepartment.objects.filter(EventID__in=event_ids)
+        .order_by('EventDepartmentAssignedAt', 'EventDepartmentID')
+        .values_list('EventID', 'DepartmentID', 'DepartmentID__DepartmentName')
+    )
+    for event_id, dept_id, dept_name in dept_rows:
+        summary = summaries[event_id]
+        if summary['EventPrimaryDepartmentID'] is None:
+            summary['EventPrimaryDepartmentID'] = dept_id
+            summary['EventPrimaryDepartmentName'] = dept_name
+
+    tag_rows = (
+        EventTag.objects.filter(EventID__in=event_ids)
+        .order_by('EventTagAssignedAt', 'EventTagID')
+        .values_list('EventID', 'TagID__TagName')
+    )
+    for event_id, tag_name in tag_rows:
+        summaries[event_id]['tags'].append(tag_name)
+
+    link_rows = (
+        EventLink.objects.filter(EventID__in=event_ids)
+        .order_by('EventLinkName')
+        .values_list('EventID', 'EventLinkName')
+    )
+    for event_id, link_name in link_rows:
+        platforms = summaries[event_id]['platforms']
+        if link_name not in platforms:
+            platforms.append(link_name)
+
+    separator = Event.SUMMARY_SEPARATOR
+    return {
+        event_id: {
+            'EventPrimaryDepartmentID': summary['EventPrimaryDepartmentID'],
+            'EventPrimaryDepartmentName': summary['EventPrimaryDepartmentName'],
+            'EventTagNames': separator.join(summary['tags']),
+            'EventPlatforms': separator.join(summary['platforms']),
+        }
+        for event_id, summary in summaries.items()
+    }
+
+
+def refresh_event_summaries(event_ids):
+    """Recompute and store summary fields; deferred if inside deferred_summary_refresh()"""
+    event_ids = set(event_ids)
+    pending = getattr(_state, 'pending', None)
+    if pending is not None:
+        pending.update(event_ids)
+        return
+
+    before = stat_rows(event_ids)
+    # Only events that still exist (and aren't being deleted) need new summaries
+    summaries = build_event_summaries(before)
+    # bulk_update skips model signals, so this never re-triggers itself
+    Event.objects.bulk_update(
+        [Event(EventID=event_id, **values) for event_id, values in summaries.items()],
+        SUMMARY_FIELDS,
+        batch_size=500,
+    )
+    changes = []
+    moved = []
+    for event_id, values in summaries.items():
+        if event_id in before:
+            changes.append((before[event_id], {**before[event_id], **values}))
+            if values['EventPrimaryDepartmentID'] != before[event_id]['EventPrimaryDepartmentID']:
+                moved.append(event_id)
+    # Statistics buckets and the dedupe key follow the summary fields
+    apply_changes(changes)
+    if moved:
+        update_dedupe_keys(moved)
+
+
+@contextmanager
+def deferred_summary_refresh():
+    """Collect summary refreshes and run them once when the block exits cleanly"""
+    if getattr(_state, 'pending', None) is not None:
+        # Nested: the outermost block does the work
+        yield
+        return
+
+    _state.pending = set()
+    try:
+        yield
+        pending = _state.pending
+    finally:
+        _state.pending = None
+    refresh_event_summaries(pending)
+
+
+def rename_department_in_summaries(department_id, department_name):
+    """Push a department rename into every event that shows it"""
+    Event.objects.filter(EventPrimaryDepartmentID=department_id).exclude(
+        EventPrimaryDepartmentName=department_name
+    ).update(EventPrimaryDepartmentName=department_name)
+
+
+def refresh_summaries_for_tag(tag_id):
+    """Recompute summaries of events carrying a (renamed) tag"""
+    refresh_event_summaries(
+        EventTag.objects.filter(TagID=tag_id).values_list('EventID', flat=True)
+    )
+
+
+def find_stale_summaries(batch_size=500):
+    """
+    Yield (event_id, field, stored, expected) for every summary field that
+    disagrees with the junction tables.
+    """
+    queryset = Event.objects.order_by('EventID').values_list('EventID', *SUMMARY_FIELDS)
+    last_id = None
+    while True:
+        batch_qs = queryset if last_id is None else queryset.filter(EventID__gt=last_id)
+        batch = list(batch_qs[:batch_size])
+        if not batch:
+            return
+
+        expected = build_event_summaries(row[0] for row in batch)
+        for row in batch:
+            stored = dict(zip(SUMMARY_FIELDS, row[1:]))
+            for field in SUMMARY_FIELDS:
+                if stored[field] != expected[row[0]][field]:
+                    yield row[0], field, stored[field], expected[row[0]][field]
+        last_id = batch[-1][0]
+
+
+def backfill_summaries(batch_size=500):
+    """Rewrite summary fields for every event; returns the number of events updated"""
+    queryset = Event.objects.order_by('EventID').only('EventID', *SUMMARY_FIELDS)
+    updated = 0
+    last_id = None
+    while True:
+        batch_qs = queryset if last_id is None else queryset.filter(EventID__gt=last_id)
+        batch = list(batch_qs[:batch_size])
+        if not batch:
+            return updated
+
+        summaries = build_event_summaries(event.EventID for event in batch)
+        for event in batch:
+            for field, value in summaries[event.EventID].items():
+                setattr(event, field, value)
+        Event.objects.bulk_update(batch, SUMMARY_FIELDS)
+        updated += len(batch)
+        last_id = batch[-1].EventID
+
+
+def backfill_link_platforms(event_ids=None):
+    """Fill EventLinkPlatform for rows written without it (e.g. restored from SQL), optionally for some events"""
+    links = EventLink.objects.all() if event_ids is None else EventLink.objects.filter(EventID__in=list(event_ids))
+    return links.filter(EventLinkPlatform='').exclude(EventLinkName='').update(
+        EventLinkPlatform=Lower(Trim('EventLinkName'))
+    )
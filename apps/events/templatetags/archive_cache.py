@@ -0,0 +1,52 @@
+from django import template
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from apps.events.caching import (
+    ARCHIVE_NAMESPACE, fragment_cache_timeout, get_archive_version, record_fragment_lookup,
+)
+
+register = template.Library()
+
+
+class ArchiveCacheNode(template.Node):
+    def __init__(self, nodelist, fragment_name, vary_on):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        key = make_template_fragment_key(
+            f"{ARCHIVE_NAMESPACE}:v{get_archive_version()}:{self.fragment_name}", vary_on
+        )
+
+        value = cache.get(key)
+        if value is not None:
+            record_fragment_lookup(self.fragment_name, hit=True)
+            return value
+
+        record_fragment_lookup(self.fragment_name, hit=False)
+        value = self.nodelist.render(context)
+        cache.set(key, value, fragment_cache_timeout())
+        return value
+
+
+@register.tag("archivecache")
+def do_archive_cache(parser, token):
+    """
+    Cache a template fragment until the archive version changes.
+
+    Usage::
+
+        {% archivecache "fragment-name" [var1 var2 ...] %}
+            ... shared, role-independent markup only ...
+        {% endarchivecache %}
+    """
+    nodelist = parser.parse(("endarchivecache",))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name.")
+
+    fragment_name = bits[1].strip("'\"")
+    return ArchiveCacheNode(nodelist, fragment_name, [parser.compile_filter(b) for b in bits[2:]])
@@ -1,7 +1,5 @@
 import os
-import boto3
 from datetime import datetime
-from botocore.exceptions import NoCredentialsError, ClientError
 from apps.events.utils.log_line import log_line
 
 def upload_backup_to_cloud(file_path, log=None, folder="backups"):
@@ -9,6 +7,9 @@ def upload_backup_to_cloud(file_path, log=None, folder="backups"):
     Upload a file to S3 and return the S3 key (string) or None if failed.
     - log: StringIO object to record logs
     """
+    import boto3
+    from botocore.exceptions import NoCredentialsError, ClientError
+
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
     S3_BUCKET_NAME = os.getenv("AWS_STORAGE_BUCKET_NAME")
@@ -6,19 +6,34 @@ app_name = 'events'
 urlpatterns = [
     path('', views.events_view, name='events'),
     path('search/', views.events_search_ajax, name='events_search_api'),
+    path('cache-stats/', views.fragment_cache_stats_view, name='fragment_cache_stats'),
+    path('export-jobs/start/', views.start_export_job_view, name='start_export_job'),
+    path('export-jobs/<uuid:job_id>/', views.export_job_status_view, name='export_job_status'),
+    path('export-jobs/<uuid:job_id>/download/', views.export_job_download_view, name='export_job_download'),
+    path('calendar/', views.calendar_view, name='calendar'),
+    path('feeds/events.ics', views.events_ical_feed, name='events_ical_feed'),
+    path('feeds/events.atom', views.events_atom_feed, name='events_atom_feed'),
+    path('statistics/', views.archive_statistics_view, name='archive_statistics'),
     path('add/', views.add_event_view, name='add_event'),
     path('edit/<uuid:EventID>/', views.edit_event_view, name='edit_event'),
     path("delete/<uuid:EventID>/", views.delete_event, name="delete_event"),
+    path('bulk/delete/', views.bulk_delete_events_view, name='bulk_delete_events'),
+    path('bulk/retag/', views.bulk_retag_events_view, name='bulk_retag_events'),
+    path('bulk/move/', views.bulk_move_events_view, name='bulk_move_events'),
     path('admin-approval/', views.admin_approval_view, name='admin_approval'),
     path('admin-approval/approve/<uuid:user_id>/', views.approve_application, name='approve_application'),
     path('admin-approval/reject/<uuid:user_id>/', views.reject_application, name='reject_application'),
     path('backup-history/', views.backup_history_view, name='backup_history'),
     path("backup-dashboard/", views.backup_dashboard_view, name="backup_dashboard"),
+    path("backup-storage/", views.backup_storage_view, name="backup_storage"),
+    path("backup-verification/", views.backup_verification_view, name="backup_verification"),
     path('restore/', views.restore_operations_view, name='restore_operations'),
     path("run-backup/", views.run_backup, name="run_backup"),
     path("download-backup/<uuid:id>/", views.download_backup, name="download_backup"),
     path('view-log/<uuid:backup_id>/', views.view_log, name='view_log'),
     path('restore-full/', views.restore_full_database, name='restore_full'),
+    path('restore-selective/', views.restore_selective, name='restore_selective'),
+    path('backup-contents/<uuid:backup_id>/', views.backup_contents_view, name='backup_contents'),
     path('check-restore-status/<uuid:restore_op_id>/', views.check_restore_status, name='check_restore_status'),
     path("departments/add/", views.add_department, name="add_department"),
     path("departments/delete/<uuid:dept_id>/",views.delete_department,name="delete_department"),
@@ -1,9 +1,16 @@
 from datetime import datetime
+from apps.shared.operation_log import OperationLog
 
 # ----- Logging helper -----
 def log_line(log_output, message, level="INFO"):
-    """Write timestamped, human-readable log messages."""
+    """
+    Write a log message to an OperationLog (structured, queued) or a
+    StringIO (timestamped, human-readable). `log_output` may be None.
+    """
+    if isinstance(log_output, OperationLog):
+        log_output.log(message, level=level)
+        return
+    if log_output is None:
+        return
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{timestamp}] {level}: {message}\n"
-    log_output.write(line)
-    print(line, end="")  # optional: also print to console
\ No newline at end of file
+    log_output.write(f"[{timestamp}] {level}: {message}\n")
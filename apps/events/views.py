@@ -1,17 +1,17 @@
 import datetime
 import logging
 import traceback
-import boto3
 import os
 import csv
 import json
 import tempfile
-import subprocess
 import re
 import uuid
-import platform
+import threading
 from django.urls import reverse
-from django.db import OperationalError, ProgrammingError
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, OperationalError, ProgrammingError
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
@@ -19,51 +19,47 @@ from django.utils import timezone
 from django.template.loader import render_to_string
 from datetime import datetime
 from django.db import transaction
-from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect, JsonResponse, \
+    StreamingHttpResponse
 from django.db.models import Q
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
-from apps.events.backup_script import backup_database
 from apps.events.models import BackupHistory, Event, EventDepartment, EventLink, EventTag, Department, RestoreOperation, \
-    Tag, BackupHistory
+    Tag, BackupHistory, ExportJob
 from project import settings
+from .backup_reports import get_capacity_alerts, get_dashboard_stats, get_storage_usage, get_verification_alerts, get_verification_trend, stream_backup_csv
+from .bulk_operations import MAX_EVENTS, BulkOperationError, add_tag, delete_events, department_conflicts, \
+    move_to_department, remove_tag
+from .caching import get_fragment_cache_stats
+from .conditional import archive_cache_control, calendar_etag, calendar_last_modified, events_page_etag, \
+    events_page_last_modified, feed_etag, feed_last_modified, search_api_etag, search_api_last_modified
+from .csv_chunks import CSV_HEADER, format_row
+from .dedupe import is_duplicate
+from .event_calendar import month_calendar, week_calendar
+from .facets import get_facets
+from .feeds import atom_footer, atom_header, feed_fragments, feed_scope, feed_title, ical_footer, ical_header, \
+    request_feed_index, stream_feed
+from .filters import filter_events, filter_params, invalid_filters
 from .forms import AdminEditEventForm
-from apps.shared.email_utils import send_sendgrid_email
+from .log_viewer import LogObject, astream_slice, log_slice, stream_slice
+from .s3 import presigned_download_url
+from .statistics import get_archive_statistics
+from .summaries import deferred_summary_refresh, refresh_event_summaries
+from apps.shared.async_utils import async_condition, async_login_required, async_require_GET, run_in_thread
+from apps.shared.email_utils import asend_sendgrid_email
+from apps.shared.operation_log import operation_entries
+from apps.shared.reference_cache import get_department, get_departments, get_or_create_tag, get_tag_lookup
 from django.conf import settings
-from django.views.decorators.http import require_POST, require_GET
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_POST, require_GET
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
 
-def get_platform_config():
-    """Get platform-specific configuration"""
-    IS_RENDER = os.environ.get('RENDER', 'false').lower() == 'true'
-    IS_WINDOWS = platform.system().lower() == 'windows'
-
-    if IS_RENDER:
-        return {
-            'psql_path': 'psql',
-            'pg_dump_path': 'pg_dump',
-            'platform': 'render'
-        }
-    elif IS_WINDOWS:
-        return {
-            'psql_path': r"C:\Program Files\PostgreSQL\18\bin\psql.exe",
-            'pg_dump_path': r"C:\Program Files\PostgreSQL\18\bin\pg_dump.exe",
-            'platform': 'windows'
-        }
-    else:
-        return {
-            'psql_path': 'psql',
-            'pg_dump_path': 'pg_dump',
-            'platform': 'linux'
-        }
-
-
 # Email sending functions - SENDGRID WEB API
-def send_approval_email_async(user_email, user_name, login_url):
+async def send_approval_email_async(user_email, user_name, login_url):
     """Send approval email using SendGrid Web API"""
     try:
         html_message = render_to_string('events/account_approved.html', {
@@ -84,7 +80,7 @@ Login: {login_url}
 This is an automated message from the Arcasys System."""
 
         # Use SendGrid Web API
-        success = send_sendgrid_email(
+        success = await asend_sendgrid_email(
             to_email=user_email,
             subject='Arcasys System - Account Approved',
             plain_message=plain_message,
@@ -103,7 +99,7 @@ This is an automated message from the Arcasys System."""
         return False
 
 
-def send_rejection_email_async(user_email, user_name):
+async def send_rejection_email_async(user_email, user_name):
     """Send rejection email using SendGrid Web API"""
     try:
         html_message = render_to_string('events/account_rejected.html', {
@@ -121,7 +117,7 @@ Please contact the system administrator if you have questions.
 This is an automated message from the Arcasys System."""
 
         # Use SendGrid Web API
-        success = send_sendgrid_email(
+        success = await asend_sendgrid_email(
             to_email=user_email,
             subject='Arcasys System - Application Status',
             plain_message=plain_message,
@@ -143,50 +139,16 @@ This is an automated message from the Arcasys System."""
 # -----------------------------
 # Events View - FOR ALL USERS
 # -----------------------------
+@archive_cache_control
+@condition(etag_func=events_page_etag, last_modified_func=events_page_last_modified)
 def events_view(request):
     # --- 1. HANDLE FILTERS ---
     search_query = request.GET.get('q', '').strip()
-    department_filter = request.GET.get('department', '')
-    platform_filter = request.GET.get('platform', '')
-    from_date = request.GET.get('from_date', '')
-    to_date = request.GET.get('to_date', '')
-
-    # Start with all events sorted by date
-    events = Event.objects.all().order_by('-EventDate')
 
-    # Search Logic
     if 'q' in request.GET and not search_query:
         messages.error(request, "Please enter a search term to find events.")
-    elif search_query:
-        events = events.filter(
-            Q(EventTitle__icontains=search_query) |
-            Q(EventDescription__icontains=search_query) |
-            Q(eventdepartment__DepartmentID__DepartmentName__icontains=search_query) |
-            Q(eventtag__TagID__TagName__icontains=search_query)
-        ).distinct()
-
-    # Department Filter
-    if department_filter:
-        events = events.filter(eventdepartment__DepartmentID=department_filter)
-
-    # Platform Filter
-    if platform_filter:
-        events = events.filter(eventlink__EventLinkName__icontains=platform_filter)
-
-    # Date Range Filters
-    if from_date:
-        try:
-            from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date()
-            events = events.filter(EventDate__gte=from_date_obj)
-        except ValueError:
-            pass
 
-    if to_date:
-        try:
-            to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date()
-            events = events.filter(EventDate__lte=to_date_obj)
-        except ValueError:
-            pass
+    events = filter_events(request.GET)
 
     # --- 2. EXPORT CSV ---
     if request.GET.get('export') == '1':
@@ -210,35 +172,39 @@ def events_view(request):
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
         writer = csv.writer(response)
-        writer.writerow(['Event Title', 'Date', 'Department', 'Description', 'Platform(s)', 'Tag(s)', 'Link(s)'])
+        writer.writerow(CSV_HEADER)
 
-        for event in events_to_export:
-            dept_obj = event.eventdepartment_set.first()
-            dept_name = dept_obj.DepartmentID.DepartmentName if dept_obj else "N/A"
-            tags = ", ".join([t.TagID.TagName for t in event.eventtag_set.all()])
-            links = ", ".join([f"{l.EventLinkName}: {l.EventLinkURL}" for l in event.eventlink_set.all()])
-            platforms = ", ".join(list(set([l.EventLinkName for l in event.eventlink_set.all()])))
-
-            writer.writerow([
+        for event in events_to_export.prefetch_related('eventlink_set'):
+            writer.writerow(format_row(
                 event.EventTitle,
-                event.EventDate.strftime('%Y-%m-%d'),
-                dept_name,
+                event.EventDate,
+                event.EventPrimaryDepartmentName,
                 event.EventDescription,
-                platforms,
-                tags,
-                links,
-            ])
+                event.EventPlatforms,
+                event.EventTagNames,
+                [(l.EventLinkName, l.EventLinkURL) for l in event.eventlink_set.all()],
+            ))
         
         return response
 
+    # --- 2b. COMPACT EXPORT (NDJSON, dictionary-encoded; see ndjson_format) ---
+    if request.GET.get('export') == 'ndjson':
+        from .export_jobs import stream_ndjson_export
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
+        response = StreamingHttpResponse(stream_ndjson_export(events), content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="Arcasys_Events_{timestamp}.ndjson"'
+        return response
+
     # --- 3. PAGINATION ---
     paginator = Paginator(events, 10)
     page_number = request.GET.get('page')
     events_page = paginator.get_page(page_number)
 
-    # Get extra context data
-    departments = Department.objects.all()
-    recent_events = Event.objects.all().order_by('-EventCreatedAt')[:10]
+    # Get extra context data (recent_events stays lazy; the sidebar fragment is cached)
+    departments = get_departments()
+    recent_events = Event.objects.only('EventTitle').order_by('-EventCreatedAt')[:10]
+    # Counts for the department/platform/tag options, cached per search and date range
+    facets = get_facets(request.GET)
 
     context = {
         'events': events_page,
@@ -247,9 +213,75 @@ def events_view(request):
         'is_admin': request.user.is_authenticated and request.user.isUserAdmin,
         'departments': departments,
         'recent_events': recent_events,
+        'facets': facets,
     }
     return render(request, "events/events.html", context)
 
+@login_required
+def fragment_cache_stats_view(request):
+    """Admin-only hit/miss counters for the events-page fragment cache"""
+    if not request.user.isUserAdmin:
+        return JsonResponse({'success': False, 'message': 'Admin privileges required'}, status=403)
+
+    return JsonResponse({'success': True, 'stats': get_fragment_cache_stats()})
+
+# -----------------------------
+# Export Jobs - large CSV exports in the background
+# -----------------------------
+def _export_job_payload(job):
+    payload = {
+        'job_id': str(job.ExportJobID),
+        'status': job.ExportStatus,
+        'progress': job.ExportProgress,
+        'processed_rows': job.ExportProcessedRows,
+        'total_rows': job.ExportTotalRows,
+        'message': job.ExportMessage or '',
+        'status_url': reverse('events:export_job_status', args=[job.ExportJobID]),
+    }
+    if job.ExportStatus == 'completed':
+        payload['download_url'] = reverse('events:export_job_download', args=[job.ExportJobID])
+    return payload
+
+
+def _get_export_job_for(request, job_id):
+    job = get_object_or_404(ExportJob, ExportJobID=job_id)
+    if job.ExportRequestedBy_id != request.user.pk and not request.user.isUserAdmin:
+        raise Http404("Export not found.")
+    return job
+
+
+@login_required
+@require_POST
+def start_export_job_view(request):
+    """Queue a CSV export of the events matching the posted filters"""
+    from .export_jobs import start_export_job
+    job = start_export_job(request.user, filter_params(request.POST))
+    return JsonResponse({'success': True, **_export_job_payload(job)})
+
+
+@login_required
+@require_GET
+def export_job_status_view(request, job_id):
+    job = _get_export_job_for(request, job_id)
+    return JsonResponse({'success': True, **_export_job_payload(job)})
+
+
+@async_login_required
+async def export_job_download_view(request, job_id):
+    job = await sync_to_async(_get_export_job_for)(request, job_id)
+    if job.ExportStatus != 'completed' or not job.ExportFile:
+        raise Http404("Export file not available.")
+
+    key = str(job.ExportFile)
+    if job.ExportStorage == 'local':
+        from .export_jobs import export_storage
+        storage = export_storage()
+        if not await run_in_thread(storage.exists, key):
+            raise Http404("Export file not available.")
+        return FileResponse(storage.open(key, 'rb'), as_attachment=True, filename=os.path.basename(key))
+
+    return HttpResponseRedirect(await run_in_thread(presigned_download_url, key))
+
 def delete_event(request, EventID):
     if not request.user.is_authenticated or not request.user.isUserAdmin:
         messages.error(request, "You do not have permission to delete events.")
@@ -258,14 +290,114 @@ def delete_event(request, EventID):
     event = get_object_or_404(Event, pk=EventID)
 
     if request.method == "POST":
-        event.delete()
+        # Cascaded junction deletes would otherwise each refresh the event's summaries
+        with transaction.atomic(), deferred_summary_refresh():
+            event.delete()
         messages.success(request, "Event deleted successfully.")
         return redirect("events:events")
 
     messages.error(request, "Invalid request.")
     return redirect("events:events")
 
-def events_search_ajax(request):
+
+# -----------------------------
+# Bulk Event Operations
+# -----------------------------
+def _bulk_request(request, admin_only=False):
+    """
+    (payload, event_ids, error_response) for a bulk operation. The JSON body
+    names the events either as "event_ids" or as "filters" (the events-page
+    search and filters, applied as on the page).
+    """
+    allowed = request.user.isUserAdmin or request.user.is_superuser or (not admin_only and request.user.isUserStaff)
+    if not allowed:
+        return None, None, JsonResponse({'success': False, 'message': 'Permission denied'}, status=403)
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        return None, None, JsonResponse({'success': False, 'message': 'Invalid JSON body'}, status=400)
+
+    if 'event_ids' in payload:
+        try:
+            event_ids = [uuid.UUID(str(event_id)) for event_id in payload['event_ids']]
+        except (TypeError, ValueError):
+            return None, None, JsonResponse({'success': False, 'message': 'Invalid event ID'}, status=400)
+    elif isinstance(payload.get('filters'), dict):
+        params = filter_params(payload['filters'])
+        # A filter that would be ignored must not widen the selection to the whole archive
+        if not params or invalid_filters(params):
+            return None, None, JsonResponse({'success': False, 'message': 'Filters are missing or invalid'}, status=400)
+        event_ids = list(filter_events(params).values_list('EventID', flat=True)[:MAX_EVENTS + 1])
+    else:
+        return None, None, JsonResponse({'success': False, 'message': 'Send event_ids or filters'}, status=400)
+    return payload, event_ids, None
+
+
+def _bulk_response(run, *args):
+    try:
+        result = run(*args)
+    except BulkOperationError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    except IntegrityError:
+        # e.g. a concurrent edit took a dedupe key the move needed
+        return JsonResponse({'success': False, 'message': 'Events changed during the operation; try again'}, status=409)
+    return JsonResponse({'success': True, **result})
+
+
+@login_required
+@require_POST
+def bulk_delete_events_view(request):
+    """Delete the selected events with their tags, departments and links"""
+    payload, event_ids, error = _bulk_request(request, admin_only=True)
+    if error:
+        return error
+    return _bulk_response(delete_events, event_ids)
+
+
+@login_required
+@require_POST
+def bulk_retag_events_view(request):
+    """Add a tag to (or with "remove": true, take it off) the selected events"""
+    payload, event_ids, error = _bulk_request(request)
+    if error:
+        return error
+    tag_name = str(payload.get('tag') or '').lstrip('#').strip()
+    if not tag_name:
+        return JsonResponse({'success': False, 'message': 'Tag is required'}, status=400)
+
+    if payload.get('remove'):
+        tag = get_tag_lookup().get(tag_name.casefold())
+        if tag is None:
+            return JsonResponse({'success': False, 'message': f"Unknown tag: {tag_name}"}, status=400)
+        return _bulk_response(remove_tag, event_ids, tag)
+    return _bulk_response(add_tag, event_ids, get_or_create_tag(tag_name))
+
+
+@login_required
+@require_POST
+def bulk_move_events_view(request):
+    """Make one department the department of every selected event"""
+    payload, event_ids, error = _bulk_request(request)
+    if error:
+        return error
+    department = get_department(payload.get('department_id') or '')
+    if department is None:
+        return JsonResponse({'success': False, 'message': 'Selected department does not exist'}, status=400)
+
+    conflicts = department_conflicts(event_ids, department)
+    if conflicts:
+        return JsonResponse({
+            'success': False,
+            'message': f"{len(conflicts)} event(s) would duplicate an event with the same title and date in {department.DepartmentName}",
+            'conflicts': [str(event_id) for event_id in conflicts[:50]],
+        }, status=409)
+    return _bulk_response(move_to_department, event_ids, department)
+
+@archive_cache_control
+@async_condition(etag_func=search_api_etag, last_modified_func=search_api_last_modified)
+async def events_search_ajax(request):
     query = request.GET.get('q', '').strip()
     results = []
 
@@ -282,12 +414,88 @@ def events_search_ajax(request):
                 'date': e.EventDate.strftime('%b %d, %Y'),
                 'location': e.EventLocation,
             }
-            for e in events
+            async for e in events
         ]
 
     return JsonResponse({'results': results})
 
 
+# -----------------------------
+# Calendar View - FOR ALL USERS
+# -----------------------------
+def _calendar_for(params):
+    """Month grid for ?month=YYYY-MM, week for ?week=YYYY-MM-DD (any day in it); this month by default"""
+    try:
+        if params.get('week'):
+            return week_calendar(datetime.strptime(params['week'], "%Y-%m-%d").date())
+        if params.get('month'):
+            month = datetime.strptime(params['month'], "%Y-%m").date()
+            return month_calendar(month.year, month.month)
+    except ValueError:
+        pass
+    today = timezone.localdate()
+    return month_calendar(today.year, today.month)
+
+
+@archive_cache_control
+@condition(etag_func=calendar_etag, last_modified_func=calendar_last_modified)
+def calendar_view(request):
+    cal = _calendar_for(request.GET)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'view': cal['view'],
+            'start': cal['start'].isoformat(),
+            'end': cal['end'].isoformat(),
+            'previous': cal['previous'],
+            'next': cal['next'],
+            'days': [
+                {'date': day['date'].isoformat(), 'events': day['events']}
+                for week in cal['weeks'] for day in week if day['in_range']
+            ],
+        })
+    return render(request, 'events/calendar.html', {'calendar': cal, 'today': timezone.localdate()})
+
+
+# -----------------------------
+# Event Feeds (iCalendar / Atom) - PUBLIC
+# -----------------------------
+FEED_MAX_AGE = 60
+
+
+def _feed_response(request, fmt, header, footer, content_type):
+    """Stream a feed's header, its cached per-event fragments and its footer"""
+    invalid = invalid_filters(request.GET)
+    if invalid:
+        return JsonResponse({'success': False, 'message': f"Invalid filters: {', '.join(invalid)}"}, status=400)
+    index = request_feed_index(request)
+    fragments = feed_fragments(fmt, index['rows'])
+    response = StreamingHttpResponse(stream_feed(header(index), fragments, footer()), content_type=content_type)
+    # Subscribers poll; a short max-age plus the validators keeps most polls at a 304
+    patch_cache_control(response, public=True, max_age=FEED_MAX_AGE)
+    return response
+
+
+@require_GET
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def events_ical_feed(request):
+    title = feed_title(feed_scope(request.GET))
+    return _feed_response(
+        request, 'ical', lambda index: ical_header(title), ical_footer, 'text/calendar; charset=utf-8'
+    )
+
+
+@require_GET
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def events_atom_feed(request):
+    title = feed_title(feed_scope(request.GET))
+    feed_url = request.build_absolute_uri()
+    site_url = request.build_absolute_uri(reverse('events:events'))
+    return _feed_response(
+        request, 'atom', lambda index: atom_header(title, index, feed_url, site_url), atom_footer,
+        'application/atom+xml; charset=utf-8',
+    )
+
+
 # -----------------------------
 # Add Event View - FOR STAFF & ADMIN
 # -----------------------------
@@ -360,13 +568,14 @@ def add_event_view(request):
                     return redirect(REDIRECT_URL_NAME)
 
         # MAM-32
-        department_obj = Department.objects.get(pk=department)
+        department_obj = get_department(department)
+        if department_obj is None:
+            messages.error(request, "Selected office/department does not exist.")
+            return redirect(REDIRECT_URL_NAME)
+
         try:
-            dup = Event.objects.filter(
-                EventTitle__iexact=title,
-                EventDate=d,
-                eventdepartment__DepartmentID=department_obj,
-            ).exists()
+            # Indexed lookup on the normalized title/date/department key
+            dup = is_duplicate(title, d, department_obj.DepartmentID)
 
             if dup:
                 messages.error(request, f"Event already exists.")
@@ -378,13 +587,16 @@ def add_event_view(request):
 
         # Create event record
         try:
-            with transaction.atomic():
+            with transaction.atomic(), deferred_summary_refresh():
+                # Primary department set up front so the dedupe key is final on insert
                 event = Event.objects.create(
                     EventTitle=title,
                     EventDate=d,
                     EventTime=t,
                     EventLocation=location,
                     EventDescription=description,
+                    EventPrimaryDepartmentID=department_obj.DepartmentID,
+                    EventPrimaryDepartmentName=department_obj.DepartmentName,
                 )
 
                 # Link the Department
@@ -393,34 +605,31 @@ def add_event_view(request):
                     DepartmentID=department_obj
                 )
 
-                # Tags
-                tag_names = _parse_tags(tags_raw)
-                if tag_names:
-                    for nm in tag_names:
-                        tag_obj, created = Tag.objects.get_or_create(
-                            TagName__iexact=nm,
-                            defaults={'TagName': nm}
-                        )
-                        EventTag.objects.create(EventID=event, TagID=tag_obj)
-
-                # Links/URLs
-                for link_name, link_url in link_data:
-                    if link_url:
-                        EventLink.objects.create(
-                            EventID=event,
-                            EventLinkName=link_name.replace(" Link", ""),
-                            EventLinkURL=link_url
-                        )
+                # Tags and links in one INSERT each; bulk_create sends no signals,
+                # so the summary refresh is queued explicitly below
+                EventTag.objects.bulk_create([
+                    EventTag(EventID=event, TagID=get_or_create_tag(nm)) for nm in _parse_tags(tags_raw)
+                ])
+                EventLink.objects.bulk_create([
+                    _new_link(event, link_name.replace(" Link", ""), link_url)
+                    for link_name, link_url in link_data if link_url
+                ])
+                refresh_event_summaries([event.EventID])
 
             messages.success(request, f"Event created successfully.")
             return redirect(REDIRECT_URL_NAME)
 
+        except IntegrityError:
+            # A concurrent submission took the dedupe key after the check above
+            messages.error(request, f"Event already exists.")
+            return redirect(REDIRECT_URL_NAME)
+
         except Exception as e:
             messages.error(request, f"Could not create event: {e}")
             return redirect(REDIRECT_URL_NAME)
 
     context = {
-        'departments': Department.objects.all(),
+        'departments': get_departments(),
     }
     return render(request, "events/add_event.html", context)
 
@@ -441,12 +650,12 @@ def edit_event_view(request, EventID):
     # Prepare initial form data from the event
     initial = {
         "event_title": event.EventTitle,
-        "department": event.eventdepartment_set.first().DepartmentID if event.eventdepartment_set.exists() else None,
+        "department": event.EventPrimaryDepartmentID,
         "event_date": event.EventDate.strftime("%Y-%m-%d") if event.EventDate else "",
         "event_time": event.EventTime.strftime("%H:%M") if event.EventTime else "",
         "location": event.EventLocation,
         "description": event.EventDescription,
-        "tags": ', '.join([tag.TagID.TagName for tag in event.eventtag_set.all()]),
+        "tags": event.EventTagNames,
     }
 
     # Social links (if exist)
@@ -462,50 +671,29 @@ def edit_event_view(request, EventID):
     if request.method == "POST":
         form = AdminEditEventForm(request.POST)
         if form.is_valid():
-            # Handle saving manually since it's not a ModelForm
-            event.EventTitle = form.cleaned_data["event_title"]
-            event.EventLocation = form.cleaned_data["location"]
-            event.EventDate = form.cleaned_data["event_date"]
-            event.EventTime = form.cleaned_data["event_time"]
-            event.EventDescription = form.cleaned_data["description"]
-            event.EventUpdatedAt = timezone.now()
-            event.save()
-
-            department_instance = form.cleaned_data["department"]
-            # Ensure the department relation always matches the current selection
-            event.eventdepartment_set.all().delete()
-            event.eventdepartment_set.create(DepartmentID=department_instance)
-
-            # Tags
-            event.eventtag_set.all().delete()
-            tags_str = form.cleaned_data.get("tags", "")
-            for tag_name in [t.strip() for t in tags_str.split(",") if t.strip()]:
-                from .models import Tag
-                tag_obj, _ = Tag.objects.get_or_create(TagName=tag_name)
-                event.eventtag_set.create(TagID=tag_obj)
-
-            # Links
-            for name in ["facebook", "tiktok", "youtube", "website"]:
-                url = form.cleaned_data.get(name)
-                if url:
-                    from .models import EventLink
-                    link, _ = EventLink.objects.get_or_create(EventID=event, EventLinkName=name.capitalize())
-                    link.EventLinkURL = url
-                    link.save()
-                else:
-                    from .models import EventLink
-                    EventLink.objects.filter(EventID=event, EventLinkName=name.capitalize()).delete()
-
-            messages.success(request, f"Event updated successfully.")
+            data = form.cleaned_data
+            duplicate = is_duplicate(data["event_title"], data["event_date"], data["department"].DepartmentID, exclude=event)
+            if not duplicate:
+                try:
+                    with transaction.atomic(), deferred_summary_refresh():
+                        _save_event_form(event, form)
+                except IntegrityError:
+                    # A concurrent save took the dedupe key after the check above
+                    duplicate = True
+
+            if not duplicate:
+                messages.success(request, f"Event updated successfully.")
+                event.refresh_from_db()
+                return redirect("events:edit_event", EventID=event.EventID)
+            messages.error(request, f"An event with this title, date and department already exists.")
             event.refresh_from_db()
-            return redirect("events:edit_event", EventID=event.EventID)
         else:
             messages.error(request, f"Please fix the errors below.")
     else:
         form = AdminEditEventForm(initial=initial)
 
     # Departments for dropdown
-    departments = Department.objects.all()
+    departments = get_departments()
 
     context = {
         "form": form,
@@ -516,6 +704,63 @@ def edit_event_view(request, EventID):
     return render(request, "events/edit_event.html", context)
 
 
+def _save_event_form(event, form):
+    """Apply a valid AdminEditEventForm to an event and its junction rows"""
+    # Handle saving manually since it's not a ModelForm
+    event.EventTitle = form.cleaned_data["event_title"]
+    event.EventLocation = form.cleaned_data["location"]
+    event.EventDate = form.cleaned_data["event_date"]
+    event.EventTime = form.cleaned_data["event_time"]
+    event.EventDescription = form.cleaned_data["description"]
+    event.EventUpdatedAt = timezone.now()
+    # The form replaces all department rows with this one, so it becomes the primary
+    department_instance = form.cleaned_data["department"]
+    event.EventPrimaryDepartmentID = department_instance.DepartmentID
+    event.EventPrimaryDepartmentName = department_instance.DepartmentName
+    event.save()
+
+    # Ensure the department relation always matches the current selection
+    event.eventdepartment_set.all().delete()
+    event.eventdepartment_set.create(DepartmentID=department_instance)
+
+    # Tags
+    event.eventtag_set.all().delete()
+    tags_str = form.cleaned_data.get("tags", "")
+    EventTag.objects.bulk_create([
+        EventTag(EventID=event, TagID=get_or_create_tag(tag_name))
+        for tag_name in [t.strip() for t in tags_str.split(",") if t.strip()]
+    ])
+
+    # Links: one read, then only the rows that change
+    existing = {link.EventLinkName: link for link in EventLink.objects.filter(EventID=event)}
+    new_links = []
+    removed = []
+    for name in ["Facebook", "Tiktok", "Youtube", "Website"]:
+        url = form.cleaned_data.get(name.lower())
+        link = existing.get(name)
+        if url and link is None:
+            new_links.append(_new_link(event, name, url))
+        elif url and link.EventLinkURL != url:
+            link.EventLinkURL = url
+            link.save()
+        elif not url and link is not None:
+            removed.append(link)
+    EventLink.objects.bulk_create(new_links)
+    for link in removed:
+        # Deleting the loaded instance skips the re-select a filtered delete would run
+        link.delete()
+
+    # bulk_create sends no signals; queue the summary refresh for the caller's deferred block
+    refresh_event_summaries([event.EventID])
+
+
+def _new_link(event, name, url):
+    # bulk_create skips EventLink.save(), which normally fills in the platform
+    return EventLink(
+        EventID=event, EventLinkName=name, EventLinkURL=url, EventLinkPlatform=EventLink.normalize_platform(name)
+    )
+
+
 # Helper function for tags
 def _parse_tags(raw: str):
     """Turn 'SDG, Workshop #Seminar' into unique tokens preserving case."""
@@ -609,36 +854,10 @@ def backup_history_view(request):
             messages.error(request, "Backup not found.")
         return redirect('events:backup_history')
 
-    # Export CSV -----
+    # Export CSV (streamed; download URLs built from one reversed prefix) -----
     if request.GET.get('export') == '1':
-        response = HttpResponse(content_type='text/csv')
+        response = StreamingHttpResponse(stream_backup_csv(backups, request), content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename="Arcasys_Backups.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow(['Backup Name', 'Status', 'Timestamp', 'Size', 'Backup File', 'Log File'])
-
-        for backup in backups:
-            backup_file_url = ""
-            log_file_url = ""
-
-            if backup.BackupFile:
-                backup_file_url = request.build_absolute_uri(
-                    reverse("events:download_backup", args=[backup.BackupHistoryID]) + "?file_type=backup"
-                )
-            if backup.BackupLogFile:
-                log_file_url = request.build_absolute_uri(
-                    reverse("events:download_backup", args=[backup.BackupHistoryID]) + "?file_type=log"
-                )
-
-            writer.writerow([
-                backup.BackupName,
-                backup.BackupStatus.capitalize(),
-                backup.BackupTimestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                backup.BackupSize,
-                backup_file_url,
-                log_file_url,
-            ])
-
         return response
 
     return render(request, 'events/backup_history.html', {
@@ -651,19 +870,12 @@ def backup_history_view(request):
 
 @login_required
 def backup_dashboard_view(request):
-    recent_jobs = BackupHistory.objects.order_by('-BackupTimestamp')[:5]
-    total_backups = BackupHistory.objects.count()
-    successful_backups = BackupHistory.objects.filter(
-        BackupStatus='completed',
-        BackupTimestamp__gte=timezone.now() - timezone.timedelta(days=1)
-    ).count()
-    failed_backups = BackupHistory.objects.filter(BackupStatus='failed').count()
-
-    # Generate alerts based on failed or recent backups
-    alerts = []
-    failed_jobs = BackupHistory.objects.filter(BackupStatus='failed').order_by('-BackupTimestamp')[:5]
-
-    for job in failed_jobs:
+    stats = get_dashboard_stats()
+    storage = get_storage_usage()
+
+    # Generate alerts based on storage capacity and failed backups
+    alerts = get_capacity_alerts(storage) + get_verification_alerts(get_verification_trend())
+    for job in stats['failed_jobs']:
         alerts.append({
             'Level': 'Critical',  # you can customize based on logic
             'Message': f"Backup '{job.BackupName}' failed.",
@@ -672,15 +884,63 @@ def backup_dashboard_view(request):
         })
 
     context = {
-        'recent_jobs': recent_jobs,
-        'total_backups': total_backups,
-        'successful_backups': successful_backups,
-        'failed_backups': failed_backups,
+        'recent_jobs': stats['recent_jobs'],
+        'total_backups': stats['total_backups'],
+        'successful_backups': stats['successful_backups'],
+        'failed_backups': stats['failed_backups'],
+        'storage': storage,
         'alerts': alerts
     }
     return render(request, 'events/backup_dashboard.html', context)
 
 
+@login_required
+@require_GET
+def backup_storage_view(request):
+    """Stored backup bytes per month and status, with the quota and any capacity alerts"""
+    storage = get_storage_usage()
+    alerts = [{'level': a['Level'], 'message': a['Message']} for a in get_capacity_alerts(storage)]
+    return JsonResponse({'success': True, 'storage': storage, 'alerts': alerts})
+
+
+@login_required
+@require_GET
+def backup_verification_view(request):
+    """Recent backup verification runs with restore throughput, oldest first"""
+    trend = get_verification_trend()
+    return JsonResponse({'success': True, 'verifications': trend, 'latest': trend[-1] if trend else None})
+
+
+# -----------------------------
+# Archive Statistics
+# -----------------------------
+def _parse_month(value):
+    """'YYYY-MM' to the first day of that month; None when missing or malformed"""
+    try:
+        return datetime.strptime(value, "%Y-%m").date() if value else None
+    except ValueError:
+        return None
+
+
+@login_required
+@require_GET
+def archive_statistics_view(request):
+    """Events per month and the busiest departments, tags and platforms, read from the statistics rollup"""
+    stats = get_archive_statistics(_parse_month(request.GET.get('from')), _parse_month(request.GET.get('to')))
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'success': True,
+            'start': stats['start'].strftime("%Y-%m"),
+            'end': stats['end'].strftime("%Y-%m"),
+            'total': stats['total'],
+            'months': [{'month': row['month'].strftime("%Y-%m"), 'count': row['count']} for row in stats['months']],
+            'departments': stats['departments'],
+            'tags': stats['tags'],
+            'platforms': stats['platforms'],
+        })
+    return render(request, 'events/archive_statistics.html', {'stats': stats, 'nav_active': 'archive_statistics'})
+
+
 @login_required
 def restore_operations_view(request):
     """Display restore operations page"""
@@ -706,6 +966,7 @@ def run_backup(request):
         return JsonResponse({"status": "error", "message": "Invalid request method"}, status=405)
 
     try:
+        from .backup_script import backup_database
         backup_database()
         return JsonResponse({"status": "success", "message": "Backup completed successfully!"})
     except Exception as e:
@@ -713,92 +974,72 @@ def run_backup(request):
         return JsonResponse({"status": "error", "message": f"Backup failed: {str(e)}"})
 
 
-def download_backup(request, id):
+async def download_backup(request, id):
     file_type = request.GET.get("file_type", "backup")
-    backup = get_object_or_404(BackupHistory, BackupHistoryID=id)
+    backup = await BackupHistory.objects.filter(BackupHistoryID=id).afirst()
+    if backup is None:
+        raise Http404("Backup not found.")
 
     s3_key = getattr(backup, "BackupFile" if file_type == "backup" else "BackupLogFile", None)
     if not s3_key:
         raise Http404(f"{file_type.capitalize()} file not available.")
 
-    s3_key = str(s3_key)
-    s3_client = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION_NAME
-    )
-
-    presigned_url = s3_client.generate_presigned_url(
-        "get_object",
-        Params={
-            "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
-            "Key": s3_key
-        },
-        ExpiresIn=60
-    )
+    return HttpResponseRedirect(await run_in_thread(presigned_download_url, str(s3_key)))
 
-    return HttpResponseRedirect(presigned_url)
 
+@async_login_required
+@async_require_GET
+async def view_log(request, backup_id):
+    """
+    Stream part of a backup's log as text: the last ?tail= lines (default
+    200), or ?length= bytes from ?offset=. Pieces fetched from S3 are
+    cached, and the body is gzip-compressed when the client accepts it.
+    X-Log-Start / X-Log-End / X-Log-Size give the slice's position.
+    """
+    backup = await BackupHistory.objects.filter(BackupHistoryID=backup_id).afirst()
+    if backup is None:
+        return JsonResponse({'success': False, 'message': 'Backup record not found'}, status=404)
+    if not backup.BackupLogFile:
+        return JsonResponse({'success': False, 'message': 'No log file associated with this backup'}, status=404)
 
-def view_log(request, backup_id):
     try:
-        backup = BackupHistory.objects.get(BackupHistoryID=backup_id)
-
-        if not backup.BackupLogFile:
-            return JsonResponse({
-                'success': False,
-                'message': 'No log file associated with this backup'
-            })
-
-        # Get the S3 file key (path in S3)
-        file_key = backup.BackupLogFile.name
-
-        # Read directly from S3 using boto3
-        try:
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME
-            )
-
-            response = s3_client.get_object(
-                Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-                Key=file_key
-            )
-
-            # Read and decode the content
-            log_content = response['Body'].read().decode('utf-8', errors='ignore')
-
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'message': f'Error reading file from S3: {str(e)}'
-            })
-
-        return JsonResponse({
-            'success': True,
-            'content': log_content
-        })
-
-    except BackupHistory.DoesNotExist:
-        return JsonResponse({
-            'success': False,
-            'message': 'Backup record not found'
-        }, status=404)
+        tail = int(request.GET['tail']) if 'tail' in request.GET else None
+        offset = int(request.GET['offset']) if 'offset' in request.GET else None
+        length = int(request.GET['length']) if 'length' in request.GET else None
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'tail, offset and length must be integers'}, status=400)
+    if any(value is not None and value < 0 for value in (tail, offset, length)):
+        return JsonResponse({'success': False, 'message': 'tail, offset and length must not be negative'}, status=400)
+
+    log = LogObject(backup.BackupLogFile.name)
+    try:
+        start, end, size = await run_in_thread(log_slice, log, tail=tail, offset=offset, length=length)
     except Exception as e:
-        return JsonResponse({
-            'success': False,
-            'message': f'Error: {str(e)}'
-        }, status=500)
+        logger.error(f"Could not read log of backup {backup_id}: {str(e)}")
+        return JsonResponse({'success': False, 'message': f'Error reading file from S3: {str(e)}'}, status=502)
+
+    compress = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+    # Under WSGI the response is iterated on the worker thread, so it can read S3 directly
+    stream = astream_slice if isinstance(request, ASGIRequest) else stream_slice
+    response = StreamingHttpResponse(
+        stream(log, start, end, compress=compress), content_type='text/plain; charset=utf-8'
+    )
+    if compress:
+        response['Content-Encoding'] = 'gzip'
+    response['Vary'] = 'Accept-Encoding'
+    response['X-Log-Start'] = str(start)
+    response['X-Log-End'] = str(end)
+    response['X-Log-Size'] = str(size)
+    # Log objects are immutable once written
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
 
 
 # -----------------------------
 # Approval/Reject Views - FIXED WITH SENDGRID WEB API
 # -----------------------------
-@login_required
-def approve_application(request, user_id):
+@async_login_required
+async def approve_application(request, user_id):
     from apps.users.models import User
 
     if not request.user.isUserAdmin and not request.user.is_superuser:
@@ -806,15 +1047,15 @@ def approve_application(request, user_id):
         return redirect("events:events")
 
     try:
-        user = User.objects.get(UserID=user_id, isUserActive=False, isUserStaff=True)
+        user = await User.objects.aget(UserID=user_id, isUserActive=False, isUserStaff=True)
         user.isUserActive = True
         user.UserApprovedBy = request.user
         user.UserApprovedAt = timezone.now()
-        user.save()
+        await user.asave()
 
-        # Send approval email using SendGrid Web API (NO THREADING)
+        # Send approval email using SendGrid Web API (the worker stays free while it sends)
         login_url = request.build_absolute_uri("/users/login/")
-        send_approval_email_async(user.UserEmail, user.UserFullName, login_url)
+        await send_approval_email_async(user.UserEmail, user.UserFullName, login_url)
 
         messages.success(request,
                          f"Account for {user.UserFullName} approved successfully. Approval email has been sent.")
@@ -827,8 +1068,8 @@ def approve_application(request, user_id):
     return redirect('events:admin_approval')
 
 
-@login_required
-def reject_application(request, user_id):
+@async_login_required
+async def reject_application(request, user_id):
     from apps.users.models import User
 
     if not request.user.isUserAdmin and not request.user.is_superuser:
@@ -836,15 +1077,15 @@ def reject_application(request, user_id):
         return redirect("events:events")
 
     try:
-        user = User.objects.get(UserID=user_id, isUserActive=False, isUserStaff=True)
+        user = await User.objects.aget(UserID=user_id, isUserActive=False, isUserStaff=True)
         user_name = user.UserFullName
         user_email = user.UserEmail
 
-        # Send rejection email using SendGrid Web API (NO THREADING)
-        send_rejection_email_async(user_email, user_name)
+        # Send rejection email using SendGrid Web API (the worker stays free while it sends)
+        await send_rejection_email_async(user_email, user_name)
 
         # Delete user after sending email
-        user.delete()
+        await user.adelete()
 
         messages.success(request, f"Account for {user_name} rejected. Rejection email has been sent.")
         logger.info(f"User {user_name} rejected successfully - email sent via SendGrid API")
@@ -889,7 +1130,7 @@ def restore_full_database(request):
         )
 
         # Execute restoration in background thread
-        import threading
+        from .restore_service import execute_full_restoration_async
         thread = threading.Thread(
             target=execute_full_restoration_async,
             args=(str(backup.BackupFile), str(restore_op.RestoreID))
@@ -909,268 +1150,114 @@ def restore_full_database(request):
         return JsonResponse({'status': 'error', 'message': f'Failed to start restoration: {str(e)}'})
 
 
-def execute_full_restoration_async(backup_s3_key, restore_op_id):
-    """
-    Background restoration process.
-    """
-    from django.db import connection
-    connection.close()
-
+@async_login_required
+@async_require_GET
+async def check_restore_status(request, restore_op_id):
+    """Polling endpoint to check restoration status"""
     try:
-        restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
-
-        restore_op.RestoreProgress = 10
-        restore_op.RestoreMessage = 'Downloading backup file...'
-        restore_op.save()
-
-        # Download and restore
-        success = restore_full_database_from_s3(backup_s3_key, restore_op)
-
-        # Update status
-        restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
-        restore_op.RestoreStatus = 'completed' if success else 'failed'
-        restore_op.RestoreProgress = 100
-        restore_op.RestoreMessage = 'FULL DATA RESTORATION COMPLETED' if success else 'RESTORATION FAILED'
-        restore_op.RestoreCompletedAt = timezone.now()
-        restore_op.save()
+        restore_op = await RestoreOperation.objects.aget(RestoreID=restore_op_id)
 
-    except Exception as e:
+        # Log entries buffered by this worker since the client's last poll (?after=<seq>)
         try:
-            restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
-            restore_op.RestoreStatus = 'failed'
-            restore_op.RestoreMessage = f'Restoration failed: {str(e)}'
-            restore_op.RestoreCompletedAt = timezone.now()
-            restore_op.save()
-        except RestoreOperation.DoesNotExist:
-            logger.error(f"RestoreOperation {restore_op_id} not found during error handling")
-
-
-def restore_full_database_from_s3(backup_s3_key, restore_op=None):
-    """
-    Downloads the backup from S3 and executes full restoration.
-    """
-    try:
-        if restore_op:
-            restore_op.RestoreProgress = 20
-            restore_op.RestoreMessage = 'Processing backup file...'
-            restore_op.save()
-
-        # Download backup from S3
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME
-        )
-
-        with tempfile.NamedTemporaryFile(suffix='.sql', delete=False) as temp_file:
-            s3_client.download_fileobj(
-                settings.AWS_STORAGE_BUCKET_NAME,
-                backup_s3_key,
-                temp_file
-            )
-            temp_file_path = temp_file.name
-
-        # Execute restoration
-        success = execute_full_restoration(temp_file_path, restore_op)
-
-        if os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
-
-        return success
+            after = int(request.GET.get('after', 0))
+        except ValueError:
+            after = 0
 
-    except Exception as e:
-        if restore_op:
-            restore_op.RestoreStatus = 'failed'
-            restore_op.RestoreMessage = f'Download failed: {str(e)}'
-            restore_op.RestoreCompletedAt = timezone.now()
-            restore_op.save()
-        return False
+        return JsonResponse({
+            'status': restore_op.RestoreStatus,
+            'message': restore_op.RestoreMessage,
+            'progress': restore_op.RestoreProgress,
+            'log': operation_entries(restore_op_id, after),
+        })
+    except RestoreOperation.DoesNotExist:
+        return JsonResponse({
+            'status': 'failed',
+            'message': 'Restore operation not found'
+        })
 
 
-def execute_full_restoration(sql_file_path, restore_op=None):
+@login_required
+@require_POST
+def restore_selective(request):
     """
-    Actual restoration using psql - platform aware
+    Restores chosen tables, or chosen events with their tags, departments
+    and links, by upserting only those rows from a backup. Everything else
+    in the database is left as it is.
     """
-    try:
-        db_host = os.getenv('DB_HOST')
-        db_port = os.getenv('DB_PORT', '5432')
-        db_name = os.getenv('DB_NAME')
-        db_user = os.getenv('DB_USER')
-        db_password = os.getenv('DB_PASSWORD')
-
-        # Get platform config
-        config = get_platform_config()
-        psql_path = config['psql_path']
-
-        env = os.environ.copy()
-
-        # Handle password based on platform
-        IS_RENDER = os.environ.get('RENDER', 'false').lower() == 'true'
-        if not IS_RENDER:
-            env['PGPASSWORD'] = db_password
-
-        if restore_op:
-            restore_op.RestoreProgress = 30
-            restore_op.RestoreMessage = f'Preparing database for restoration on {config["platform"]}...'
-            restore_op.save()
-
-        # Build connection command based on platform
-        if IS_RENDER:
-            # Render connection string includes password
-            base_cmd = [
-                psql_path,
-                f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?sslmode=require"
-            ]
-        else:
-            # Local connection uses separate parameters
-            base_cmd = [
-                psql_path, '-h', db_host, '-p', db_port, '-U', db_user, '-d', db_name
-            ]
-
-        # Disable constraints
-        disable_result = subprocess.run(
-            base_cmd + ['-c', "SET session_replication_role = 'replica';", '--quiet'],
-            env=env, capture_output=True, text=True
-        )
-
-        if disable_result.returncode != 0:
-            logger.error(f"Failed to disable constraints: {disable_result.stderr}")
-            if restore_op:
-                restore_op.RestoreMessage = f'Failed to prepare database: {disable_result.stderr[:200]}'
-                restore_op.save()
-            return False
-
-        if restore_op:
-            restore_op.RestoreProgress = 40
-            restore_op.RestoreMessage = 'Cleaning existing data...'
-            restore_op.save()
-
-        # Delete application tables but preserve django_session
-        delete_script = """
-        DELETE FROM public."EventTag";
-        DELETE FROM public."EventDepartment";
-        DELETE FROM public."EventLink";
-        DELETE FROM public."Event";
-        DELETE FROM public."Tag";
-        DELETE FROM public."Department";
-        DELETE FROM public."User";
-        DELETE FROM public."Role";
-        -- KEEP django_session table untouched
-        """
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False, encoding='utf-8') as tmp_del:
-            tmp_del.write(delete_script)
-            tmp_del_path = tmp_del.name
-
-        delete_result = subprocess.run(
-            base_cmd + ['-f', tmp_del_path, '--quiet'],
-            env=env, capture_output=True, text=True
-        )
-
-        os.unlink(tmp_del_path)
-
-        if delete_result.returncode != 0:
-            logger.error(f"Failed to clean tables: {delete_result.stderr}")
-            if restore_op:
-                restore_op.RestoreMessage = f'Failed to clean existing data: {delete_result.stderr[:200]}'
-                restore_op.save()
-            return False
-
-        if restore_op:
-            restore_op.RestoreProgress = 60
-            restore_op.RestoreMessage = 'Processing backup data...'
-            restore_op.save()
-
-        # Read the backup SQL
-        with open(sql_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            sql_content = f.read()
-
-        # Make inserts for BackupHistory idempotent
-        sql_content = re.sub(
-            r'INSERT INTO public\."BackupHistory"\s*\((.*?)\)\s*VALUES\s*\((.*?)\);',
-            r'INSERT INTO public."BackupHistory" (\1) VALUES (\2) '
-            r'ON CONFLICT ("BackupHistoryID") DO NOTHING;',
-            sql_content,
-            flags=re.DOTALL | re.IGNORECASE
-        )
-
-        # Make inserts for RestoreOperation idempotent
-        sql_content = re.sub(
-            r'INSERT INTO public\."RestoreOperation"\s*\((.*?)\)\s*VALUES\s*\((.*?)\);',
-            r'INSERT INTO public."RestoreOperation" (\1) VALUES (\2) '
-            r'ON CONFLICT ("RestoreID") DO NOTHING;',
-            sql_content,
-            flags=re.DOTALL | re.IGNORECASE
-        )
+    if not request.user.isUserAdmin and not request.user.is_superuser:
+        return JsonResponse({'status': 'error', 'message': 'Permission denied'}, status=403)
 
-        # Write modified SQL to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False, encoding='utf-8') as tmp_sql:
-            tmp_sql.write(sql_content)
-            tmp_sql_path = tmp_sql.name
+    from .selective_restore import RESTORABLE_TABLES
 
-        if restore_op:
-            restore_op.RestoreProgress = 80
-            restore_op.RestoreMessage = 'Restoring data from backup...'
-            restore_op.save()
+    try:
+        data = json.loads(request.body)
+        backup_id = data.get('backup_id')
+        tables = data.get('tables') or []
+        event_ids = data.get('event_ids') or []
 
-        # Run the restored SQL
-        restore_result = subprocess.run(
-            base_cmd + ['-f', tmp_sql_path, '--quiet'],
-            env=env, capture_output=True, text=True
+        if not backup_id:
+            return JsonResponse({'status': 'error', 'message': 'Backup ID is required'})
+        if bool(tables) == bool(event_ids):
+            return JsonResponse({'status': 'error', 'message': 'Choose either tables or events to restore'})
+        unknown = set(tables) - set(RESTORABLE_TABLES)
+        if unknown:
+            return JsonResponse({'status': 'error', 'message': f"Unknown tables: {', '.join(sorted(unknown))}"})
+        try:
+            event_ids = [str(uuid.UUID(str(event_id))) for event_id in event_ids]
+        except ValueError:
+            return JsonResponse({'status': 'error', 'message': 'Invalid event ID'})
+
+        backup = BackupHistory.objects.get(BackupHistoryID=backup_id, BackupStatus='completed')
+        what = f"{len(event_ids)} event(s)" if event_ids else ", ".join(tables)
+        restore_op = RestoreOperation.objects.create(
+            BackupHistoryID=backup,
+            RestoreStatus='in_progress',
+            RestoreProgress=0,
+            RestoreMessage=f'Starting selective restoration of {what}...',
         )
 
-        os.unlink(tmp_sql_path)
-
-        if restore_result.returncode != 0:
-            logger.error(f"Restoration failed: {restore_result.stderr}")
-            if restore_op:
-                restore_op.RestoreMessage = f'Data restoration failed: {restore_result.stderr[:200]}'
-                restore_op.save()
-            return False
-
-        if restore_op:
-            restore_op.RestoreProgress = 90
-            restore_op.RestoreMessage = 'Finalizing restoration...'
-            restore_op.save()
-
-        # Re-enable constraints
-        enable_result = subprocess.run(
-            base_cmd + ['-c', "SET session_replication_role = 'origin';", '--quiet'],
-            env=env, capture_output=True, text=True
+        from .restore_service import execute_selective_restoration_async
+        thread = threading.Thread(
+            target=execute_selective_restoration_async,
+            args=(str(backup.BackupHistoryID), str(restore_op.RestoreID), tables, event_ids)
         )
+        thread.daemon = True
+        thread.start()
 
-        if enable_result.returncode != 0:
-            logger.warning(f"Failed to re-enable constraints: {enable_result.stderr}")
-
-        logger.info("Database restoration completed successfully")
-        return True
+        return JsonResponse({
+            'status': 'success',
+            'message': 'Selective restoration process started',
+            'restore_op_id': str(restore_op.RestoreID)
+        })
 
+    except BackupHistory.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': 'Backup not found'})
     except Exception as e:
-        logger.error(f"Restoration error: {str(e)}")
-        if restore_op:
-            restore_op.RestoreMessage = f'Restoration error: {str(e)}'
-            restore_op.save()
-        return False
+        return JsonResponse({'status': 'error', 'message': f'Failed to start restoration: {str(e)}'})
 
 
 @login_required
 @require_GET
-def check_restore_status(request, restore_op_id):
-    """Polling endpoint to check restoration status"""
+def backup_contents_view(request, backup_id):
+    """Tables and row counts in a backup, and its events matching ?q= for choosing what to restore"""
+    if not request.user.isUserAdmin and not request.user.is_superuser:
+        return JsonResponse({'success': False, 'message': 'Permission denied'}, status=403)
+
+    from .selective_restore import RESTORABLE_TABLES, BackupReader, search_backup_events
+    backup = get_object_or_404(BackupHistory, BackupHistoryID=backup_id, BackupStatus='completed')
     try:
-        restore_op = RestoreOperation.objects.get(RestoreID=restore_op_id)
+        reader = BackupReader(backup=backup)
+        table_index = reader.index()
+        events = search_backup_events(reader, request.GET.get('q', '').strip())
+    except Exception as e:
+        logger.error(f"Could not read contents of backup {backup_id}: {str(e)}")
+        return JsonResponse({'success': False, 'message': f'Could not read backup: {str(e)}'}, status=502)
 
-        return JsonResponse({
-            'status': restore_op.RestoreStatus,
-            'message': restore_op.RestoreMessage,
-            'progress': restore_op.RestoreProgress
-        })
-    except RestoreOperation.DoesNotExist:
-        return JsonResponse({
-            'status': 'failed',
-            'message': 'Restore operation not found'
-        })
+    tables = [
+        {'table': table, 'rows': table_index['tables'].get(table, {}).get('rows', 0)}
+        for table in RESTORABLE_TABLES
+    ]
+    return JsonResponse({'success': True, 'tables': tables, 'events': events})
 
 def add_department(request):
     if request.user.isUserAdmin and request.method == "POST":
@@ -1180,5 +1267,7 @@ def add_department(request):
 
 def delete_department(request, dept_id):
     if request.user.isUserAdmin and request.method == "POST":
-        Department.objects.filter(DepartmentID=dept_id).delete()
+        # One summary refresh for all events that lose the department, not one per junction row
+        with transaction.atomic(), deferred_summary_refresh():
+            Department.objects.filter(DepartmentID=dept_id).delete()
     return redirect("events:events")
\ No newline at end of file
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 class SharedConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.shared'
-    verbose_name = 'Shared'
\ No newline at end of file
+    verbose_name = 'Shared'
+
+    def ready(self):
+        from apps.shared import db_connections
+        db_connections.install()  # Connection open/reuse metrics
+
+        if getattr(settings, 'PERFORMANCE_PROFILING_ENABLED', False):
+            from django.db.backends.signals import connection_created
+            from apps.shared.profiling import install_query_timing, install_template_timing
+            install_template_timing()
+            connection_created.connect(install_query_timing)
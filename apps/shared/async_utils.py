@@ -0,0 +1,91 @@
+"""
+Helpers for the async views served under ASGI (project/asgi.py).
+
+Django 4.2's login_required, require_http_methods and condition wrap a
+view in a plain function, which turns a coroutine view back into a sync
+one; the decorators here keep async views async. Blocking calls that
+don't use the database (S3, SendGrid) go through `run_in_thread`, which
+uses the shared executor instead of the request's database thread.
+"""
+from calendar import timegm
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def run_in_thread(func, *args, **kwargs):
+    """Await a blocking, non-database call on a worker thread"""
+    return sync_to_async(func, thread_sensitive=False)(*args, **kwargs)
+
+
+def _load_user(request):
+    user = request.user
+    # Evaluating the lazy user reads the session and the user row
+    user.is_authenticated
+    return user
+
+
+async def get_user(request):
+    """request.user, loaded outside the event loop; later attribute reads don't query"""
+    return await sync_to_async(_load_user)(request)
+
+
+def async_login_required(view_func):
+    @wraps(view_func)
+    async def _wrapped_view(request, *args, **kwargs):
+        user = await get_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+
+    return _wrapped_view
+
+
+def async_require_http_methods(request_method_list):
+    def decorator(view_func):
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            if request.method not in request_method_list:
+                return HttpResponseNotAllowed(request_method_list)
+            return await view_func(request, *args, **kwargs)
+
+        return _wrapped_view
+
+    return decorator
+
+
+async_require_GET = async_require_http_methods(["GET"])
+
+
+def async_condition(etag_func=None, last_modified_func=None):
+    """django.views.decorators.http.condition for async views; validators are computed in one sync call"""
+
+    def decorator(view_func):
+        def validators(request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs) if etag_func else None
+            last_modified = last_modified_func(request, *args, **kwargs) if last_modified_func else None
+            return (
+                quote_etag(etag) if etag is not None else None,
+                timegm(last_modified.utctimetuple()) if last_modified else None,
+            )
+
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(validators)(request, *args, **kwargs)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+            return response
+
+        return _wrapped_view
+
+    return decorator
@@ -0,0 +1,74 @@
+import logging
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _version_key(namespace):
+    return f"version:{namespace}"
+
+
+def _fresh_version():
+    # Time-based so a version lost to eviction never reuses an old number
+    return int(time.time() * 1000)
+
+
+def get_namespace_version(namespace):
+    """Return the current version counter for a cache namespace"""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_namespace_version(namespace):
+    """Invalidate every key in a namespace by moving its version forward"""
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def bump_namespace_version_on_commit(namespace):
+    """Bump after the surrounding transaction commits (immediately if there is none)"""
+    transaction.on_commit(lambda: bump_namespace_version(namespace))
+
+
+def make_versioned_key(namespace, *parts):
+    """Build a cache key that changes whenever the namespace is bumped"""
+    version = get_namespace_version(namespace)
+    suffix = ":".join(str(p) for p in parts)
+    return f"{namespace}:v{version}:{suffix}"
+
+
+def get_or_set_versioned(namespace, name, builder, timeout=None):
+    """
+    Return the cached value for `name` in `namespace`, calling `builder`
+    on a miss. Cache errors fall back to the builder so a broken backend
+    never takes a page down.
+    """
+    try:
+        key = make_versioned_key(namespace, name)
+        value = cache.get(key, _MISSING)
+    except Exception as e:
+        logger.warning(f"Cache read failed for {namespace}:{name}: {str(e)}")
+        return builder()
+
+    if value is not _MISSING:
+        return value
+
+    value = builder()
+    try:
+        cache.set(key, value, timeout)
+    except Exception as e:
+        logger.warning(f"Cache write failed for {namespace}:{name}: {str(e)}")
+    return value
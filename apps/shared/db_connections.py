@@ -0,0 +1,73 @@
+import logging
+import time
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+from apps.shared.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CONNECTIONS_OPENED = REGISTRY.counter(
+    "arcasys_db_connections_opened_total", "Database connections opened by this worker"
+)
+CONNECTIONS_CLOSED = REGISTRY.counter(
+    "arcasys_db_connections_closed_total", "Database connections closed by the connection manager"
+)
+REQUESTS_BY_CONNECTION = REGISTRY.counter(
+    "arcasys_db_requests_total", "Requests that touched the database, by whether they reused a connection"
+)
+REUSE_RATIO = REGISTRY.gauge(
+    "arcasys_db_connection_reuse_ratio", "Share of database-using requests served on an existing connection"
+)
+
+# Attributes stored on the (thread-local) connection wrapper
+LAST_USED_ATTR = 'arcasys_last_used_at'
+OPENED_AT_ATTR = 'arcasys_opened_at'
+
+
+def count_connection_opened(sender, connection, **kwargs):
+    CONNECTIONS_OPENED.inc(alias=connection.alias)
+    setattr(connection, OPENED_AT_ATTR, time.monotonic())
+
+
+def install():
+    """Start counting opened connections; called from SharedConfig.ready()"""
+    connection_created.connect(count_connection_opened, dispatch_uid="arcasys_count_connection_opened")
+
+
+def opened_since(started):
+    """True if this thread's connection was (re)opened after `started`"""
+    opened_at = getattr(connection, OPENED_AT_ATTR, None)
+    return opened_at is not None and opened_at >= started
+
+
+def close_connection(reason):
+    CONNECTIONS_CLOSED.inc(reason=reason)
+    connection.close()
+
+
+def close_if_idle_too_long():
+    """Drop a persistent connection that sat idle past DB_CONN_MAX_IDLE"""
+    max_idle = getattr(settings, 'DB_CONN_MAX_IDLE', 300)
+    last_used = getattr(connection, LAST_USED_ATTR, None)
+    if connection.connection is None or last_used is None or max_idle <= 0:
+        return
+    if time.monotonic() - last_used > max_idle and not connection.in_atomic_block:
+        logger.debug(f"Closing database connection idle for more than {max_idle}s")
+        close_connection('idle')
+
+
+def close_if_broken():
+    """Drop the connection only if it errored and no longer answers"""
+    if connection.connection is None or connection.in_atomic_block:
+        return
+    if connection.errors_occurred and not connection.is_usable():
+        close_connection('broken')
+
+
+def record_request(reused):
+    REQUESTS_BY_CONNECTION.inc(reused=str(reused).lower())
+    reused_count = REQUESTS_BY_CONNECTION.value(reused='true')
+    total = reused_count + REQUESTS_BY_CONNECTION.value(reused='false')
+    if total:
+        REUSE_RATIO.set(round(reused_count / total, 4))
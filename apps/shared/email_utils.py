@@ -1,7 +1,6 @@
 import logging
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Content
 from django.conf import settings
+from apps.shared.async_utils import run_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +10,10 @@ def send_sendgrid_email(to_email, subject, plain_message, html_message=None):
     Send email using SendGrid Web API (works on Render)
     Supports both plain text and HTML templates
     """
+    # sendgrid is only loaded by the requests that actually send mail
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail, Content
+
     try:
         # Create the email message
         message = Mail(
@@ -35,4 +38,12 @@ def send_sendgrid_email(to_email, subject, plain_message, html_message=None):
 
     except Exception as e:
         logger.error(f"SendGrid email failed for {to_email}: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+async def asend_sendgrid_email(to_email, subject, plain_message, html_message=None):
+    """
+    send_sendgrid_email for async views. The SendGrid client is blocking,
+    so the request is made on a worker thread and the event loop stays free.
+    """
+    return await run_in_thread(send_sendgrid_email, to_email, subject, plain_message, html_message)
@@ -0,0 +1,136 @@
+"""
+Minimal in-process metrics registry rendered in Prometheus text format.
+
+Values live in worker memory, so each gunicorn worker reports its own
+series; scrape every worker or aggregate downstream.
+"""
+import threading
+from bisect import bisect_left
+
+_lock = threading.Lock()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally labelled"""
+
+    type_name = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self):
+        with _lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def set(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            self._values[key] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally labelled"""
+
+    type_name = "histogram"
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            if index < len(self.buckets):
+                series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def snapshot(self):
+        with _lock:
+            return {
+                key: {"buckets": list(s["buckets"]), "sum": s["sum"], "count": s["count"]}
+                for key, s in self._series.items()
+            }
+
+    def samples(self):
+        out = []
+        for key, series in self.snapshot().items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["buckets"]):
+                cumulative += count
+                out.append((f"{self.name}_bucket", key + (("le", _format_value(float(bound))),), cumulative))
+            out.append((f"{self.name}_bucket", key + (("le", "+Inf"),), series["count"]))
+            out.append((f"{self.name}_sum", key, series["sum"]))
+            out.append((f"{self.name}_count", key, series["count"]))
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        """Register a metric once; returns the existing one on re-registration"""
+        with _lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text):
+        return self.register(Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self.register(Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets):
+        return self.register(Histogram(name, help_text, buckets))
+
+    def render_prometheus(self):
+        lines = []
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
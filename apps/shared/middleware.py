@@ -1,17 +1,159 @@
+import logging
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
 from django.db import connection
+from whitenoise.middleware import WhiteNoiseMiddleware
+from apps.shared.db_connections import (
+    LAST_USED_ATTR, close_if_broken, close_if_idle_too_long, opened_since, record_request,
+)
+from apps.shared.profiling import (
+    DB_DURATION, DB_QUERIES, QUERY_BUDGET_EXCEEDED, REQUEST_DURATION, RESPONSE_SIZE, TEMPLATE_DURATION,
+    RequestStats, current_request_stats,
+)
 
+logger = logging.getLogger(__name__)
 
-class CloseDBConnectionMiddleware:
-    """Only close connections if they're idle to avoid connection exhaustion"""
+
+class PersistentDBConnectionMiddleware:
+    """
+    Keep database connections open across requests (CONN_MAX_AGE) and only
+    close ones that are broken or have been idle longer than DB_CONN_MAX_IDLE.
+    Also records how often requests reuse an existing connection.
+
+    Under ASGI every request runs its queries on a thread of its own, so
+    there is nothing to keep between requests (settings sets CONN_MAX_AGE
+    to 0 there) and the async path just passes the request on.
+    """
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.get_response(request)
+
+        close_if_idle_too_long()
+        had_connection = connection.connection is not None
+        started = time.monotonic()
+
         response = self.get_response(request)
 
-        # Only close if connection is idle and not in transaction
-        if connection.connection and not connection.in_atomic_block:
-            connection.close()
+        opened_during = opened_since(started)
+        if had_connection or opened_during:
+            record_request(reused=had_connection and not opened_during)
+            setattr(connection, LAST_USED_ATTR, time.monotonic())
+
+        close_if_broken()
+        return response
+
+
+class CloseDBConnectionMiddleware(PersistentDBConnectionMiddleware):
+    """
+    Kept for existing MIDDLEWARE entries. Closing after every response made
+    each request open a fresh SSL connection, so this now behaves like
+    PersistentDBConnectionMiddleware.
+    """
+
+
+class RequestProfilingMiddleware:
+    """
+    Record wall time, DB query count/time, template render time and response
+    size per URL name, and warn when a request exceeds the query budget.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_budget = getattr(settings, 'PERFORMANCE_QUERY_BUDGET', 30)
+        self.slow_request_ms = getattr(settings, 'PERFORMANCE_SLOW_REQUEST_MS', 1000)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        # Queries are counted by profiling.time_query, installed on every connection
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+
+        self.record(request, response, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+
+        self.record(request, response, stats)
+        return response
+
+    def record(self, request, response, stats):
+        elapsed = time.perf_counter() - stats.started
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+
+        REQUEST_DURATION.observe(elapsed, view=view)
+        DB_QUERIES.observe(stats.query_count, view=view)
+        DB_DURATION.observe(stats.db_seconds, view=view)
+        TEMPLATE_DURATION.observe(stats.template_seconds, view=view)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), view=view)
+
+        if stats.query_count > self.query_budget:
+            QUERY_BUDGET_EXCEEDED.inc(view=view)
+            logger.warning(
+                f"Query budget exceeded on {view} ({request.method} {request.path}): "
+                f"{stats.query_count} queries > {self.query_budget}, "
+                f"db {stats.db_seconds * 1000:.1f} ms, total {elapsed * 1000:.1f} ms"
+            )
+        elif elapsed * 1000 > self.slow_request_ms:
+            logger.warning(
+                f"Slow request on {view} ({request.method} {request.path}): {elapsed * 1000:.1f} ms, "
+                f"{stats.query_count} queries, db {stats.db_seconds * 1000:.1f} ms"
+            )
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that stays async under ASGI. The stock middleware is
+    sync-only, so at the top of the stack it would hand every request to a
+    thread and back before reaching the async views.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
 
-        return response
\ No newline at end of file
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,231 @@
+"""
+Structured logs for long-running operations (backups, restores).
+
+Callers log through an OperationLog, which tags every record with the
+operation id, kind, phase and elapsed time and hands it to a QueueHandler,
+so logging never waits on I/O. A single QueueListener thread turns records
+into JSON and
+  * keeps the latest OPERATION_LOG_RING_SIZE entries per operation in
+    memory, for progress UIs polling this worker,
+  * appends every entry to a gzip spool file for the operation, which
+    finish() closes so the caller can persist it once,
+  * echoes the JSON line to stderr.
+"""
+import atexit
+import gzip
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone as dt_timezone
+from logging.handlers import QueueHandler, QueueListener
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LOGGER_NAME = "arcasys.operations"
+
+# Operations whose ring buffers are kept, least recently written dropped first
+MAX_TRACKED_OPERATIONS = 100
+FINISH_TIMEOUT = 10
+
+_lock = threading.Lock()
+_listener = None
+_active = {}
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+
+
+def ring_size():
+    return getattr(settings, 'OPERATION_LOG_RING_SIZE', 500)
+
+
+class _OperationHandler(logging.Handler):
+    """Runs on the listener thread: ring buffers, gzip spools and the stderr echo"""
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream
+        self.buffers = OrderedDict()
+        self.spools = {}
+        self.buffers_lock = threading.Lock()
+
+    def _buffer(self, operation_id):
+        with self.buffers_lock:
+            buffer = self.buffers.get(operation_id)
+            if buffer is None:
+                buffer = self.buffers[operation_id] = deque(maxlen=ring_size())
+                while len(self.buffers) > MAX_TRACKED_OPERATIONS:
+                    self.buffers.popitem(last=False)
+            else:
+                self.buffers.move_to_end(operation_id)
+            return buffer
+
+    def entries(self, operation_id, after=0):
+        with self.buffers_lock:
+            buffer = self.buffers.get(operation_id)
+            return [entry for entry in buffer if entry['seq'] > after] if buffer else []
+
+    def emit(self, record):
+        operation_id = getattr(record, 'operation_id', None)
+        if operation_id is None:
+            return
+
+        finished = getattr(record, 'finished', None)
+        if finished is not None:
+            spool = self.spools.pop(operation_id, None)
+            if spool:
+                spool.close()
+            finished.set()
+            return
+
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, dt_timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'op': operation_id,
+            'kind': record.operation_kind,
+            'phase': record.phase,
+            'elapsed_ms': record.elapsed_ms,
+            'seq': record.seq,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'fields', None):
+            entry.update(record.fields)
+        line = _dumps(entry) + "\n"
+
+        self._buffer(operation_id).append(entry)
+        try:
+            spool = self.spools.get(operation_id)
+            if spool is None:
+                spool = self.spools[operation_id] = gzip.open(record.spool_path, 'at', encoding='utf-8')
+            spool.write(line)
+            if self.stream:
+                self.stream.write(line)
+        except Exception:
+            self.handleError(record)
+
+
+_handler = _OperationHandler(stream=sys.stderr)
+
+
+def _logger():
+    """Operations logger behind a QueueHandler; the listener starts on first use"""
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    with _lock:
+        if _listener is None:
+            log_queue = queue.SimpleQueue()
+            logger.addHandler(QueueHandler(log_queue))
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+            _listener = QueueListener(log_queue, _handler, respect_handler_level=False)
+            _listener.start()
+            atexit.register(_listener.stop)
+    return logger
+
+
+class OperationLog:
+    """Log for one operation; records are queued and written off the caller's thread"""
+
+    def __init__(self, kind, operation_id, phase="start"):
+        self.kind = kind
+        self.operation_id = str(operation_id)
+        self.phase = phase
+        self.started = time.monotonic()
+        self._seq = itertools.count(1)
+        self.finished = False
+        self._logger = _logger()
+        fd, self.spool_path = tempfile.mkstemp(prefix=f"arcasys_{kind}_log_", suffix=".jsonl.gz")
+        os.close(fd)
+        os.unlink(self.spool_path)
+        with _lock:
+            _active[self.operation_id] = self
+
+    def log(self, message, level="INFO", phase=None, **fields):
+        if self.finished:
+            # The spool is closed and persisted; a late record would reopen it and never be saved
+            logger.warning(
+                f"Dropped {level} record logged after {self.kind} {self.operation_id} finished: {message}"
+            )
+            return
+        if phase:
+            self.phase = phase
+        self._logger.log(logging.getLevelName(level), message, extra={
+            'operation_id': self.operation_id,
+            'operation_kind': self.kind,
+            'phase': self.phase,
+            'elapsed_ms': int((time.monotonic() - self.started) * 1000),
+            'seq': next(self._seq),
+            'spool_path': self.spool_path,
+            'fields': fields,
+        })
+
+    def info(self, message, **kwargs):
+        self.log(message, "INFO", **kwargs)
+
+    def warning(self, message, **kwargs):
+        self.log(message, "WARNING", **kwargs)
+
+    def error(self, message, **kwargs):
+        self.log(message, "ERROR", **kwargs)
+
+    def finish(self):
+        """
+        Wait until every queued record is written and return the path of the
+        gzip JSON-lines log (None if nothing was logged); the caller persists
+        and deletes it. The ring buffer stays readable afterwards.
+        """
+        # Refuse new records first, so none can land behind the sentinel
+        self.finished = True
+        finished = threading.Event()
+        self._logger.info("finished", extra={'operation_id': self.operation_id, 'finished': finished})
+        finished.wait(FINISH_TIMEOUT)
+        with _lock:
+            _active.pop(self.operation_id, None)
+        return self.spool_path if os.path.exists(self.spool_path) else None
+
+    def discard(self):
+        """Finish if needed and delete the spool file"""
+        if not self.finished:
+            self.finish()
+        if os.path.exists(self.spool_path):
+            os.unlink(self.spool_path)
+
+
+def active_operation(operation_id):
+    """The running OperationLog for an id in this process, or None"""
+    with _lock:
+        return _active.get(str(operation_id))
+
+
+def operation_entries(operation_id, after=0):
+    """Buffered entries of an operation (this worker only) with seq greater than `after`"""
+    return _handler.entries(str(operation_id), after)
+
+
+def read_operation_log(data):
+    """Entries from a persisted log (gzip JSON lines; plain text logs become one entry per line)"""
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    entries = []
+    for line in data.decode('utf-8', errors='ignore').splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            entries.append({'message': line})
+    return entries
+
+
+def format_entry(entry):
+    """One human-readable line for an entry"""
+    if 'ts' not in entry:
+        return entry.get('message', '')
+    return f"[{entry['ts']}] {entry['level']} {entry['phase']} +{entry['elapsed_ms']}ms: {entry['message']}"
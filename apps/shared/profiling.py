@@ -0,0 +1,88 @@
+import contextvars
+import time
+from django.template import base as template_base
+from apps.shared.metrics import REGISTRY
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "arcasys_request_duration_seconds", "Request wall time per URL name", SECONDS_BUCKETS
+)
+DB_QUERIES = REGISTRY.histogram(
+    "arcasys_request_db_queries", "Database queries per request per URL name", QUERY_COUNT_BUCKETS
+)
+DB_DURATION = REGISTRY.histogram(
+    "arcasys_request_db_duration_seconds", "Time spent in database queries per request", SECONDS_BUCKETS
+)
+TEMPLATE_DURATION = REGISTRY.histogram(
+    "arcasys_request_template_seconds", "Time spent rendering templates per request", SECONDS_BUCKETS
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    "arcasys_response_size_bytes", "Response body size per URL name", SIZE_BUCKETS
+)
+QUERY_BUDGET_EXCEEDED = REGISTRY.counter(
+    "arcasys_query_budget_exceeded_total", "Requests that ran more queries than PERFORMANCE_QUERY_BUDGET"
+)
+
+# Stats for the request being handled on this thread / task
+current_request_stats = contextvars.ContextVar("current_request_stats", default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    Execute wrapper on every connection: counts and times queries for the
+    request being profiled. Async views run their queries on other threads,
+    which inherit the request's context, so they are counted too.
+    """
+    stats = current_request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.query_count += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def install_query_timing(sender, connection, **kwargs):
+    """connection_created receiver adding time_query to each new connection once"""
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+_original_template_render = template_base.Template.render
+
+
+def _timed_template_render(self, context):
+    stats = current_request_stats.get()
+    if stats is None:
+        return _original_template_render(self, context)
+
+    # Only the outermost template is timed; includes are part of it
+    stats.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_template_render(self, context)
+    finally:
+        stats.template_depth -= 1
+        if stats.template_depth == 0:
+            stats.template_seconds += time.perf_counter() - started
+
+
+def install_template_timing():
+    """Patch Template.render once so profiled requests can attribute render time"""
+    if template_base.Template.render is not _timed_template_render:
+        template_base.Template.render = _timed_template_render
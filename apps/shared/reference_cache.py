@@ -0,0 +1,73 @@
+from django.conf import settings
+from apps.shared.cache_utils import bump_namespace_version_on_commit, get_or_set_versioned
+
+# Departments, tags and roles share one namespace; any write to them bumps it
+REFERENCE_NAMESPACE = "reference"
+
+
+def _timeout():
+    return getattr(settings, "REFERENCE_DATA_CACHE_TIMEOUT", 300)
+
+
+def get_departments():
+    """All departments ordered by name, served from cache"""
+    from apps.events.models import Department
+
+    return get_or_set_versioned(
+        REFERENCE_NAMESPACE,
+        "departments",
+        lambda: list(Department.objects.order_by("DepartmentName")),
+        _timeout(),
+    )
+
+
+def get_department(department_id):
+    """Look up one department by primary key without hitting the database"""
+    wanted = str(department_id)
+    for dept in get_departments():
+        if str(dept.DepartmentID) == wanted:
+            return dept
+    return None
+
+
+def get_tag_lookup():
+    """Map of casefolded tag name -> Tag, served from cache"""
+    from apps.events.models import Tag
+
+    return get_or_set_versioned(
+        REFERENCE_NAMESPACE,
+        "tags",
+        lambda: {tag.TagName.casefold(): tag for tag in Tag.objects.all()},
+        _timeout(),
+    )
+
+
+def get_or_create_tag(tag_name):
+    """Case-insensitive tag lookup that only touches the database for new tags"""
+    from apps.events.models import Tag
+
+    tag = get_tag_lookup().get(tag_name.casefold())
+    if tag is not None:
+        return tag
+
+    tag, _ = Tag.objects.get_or_create(
+        TagName__iexact=tag_name,
+        defaults={'TagName': tag_name}
+    )
+    return tag
+
+
+def get_role(role_name):
+    """Return the Role with this name, creating it on first use"""
+    from apps.users.models import Role
+
+    def build():
+        role, _ = Role.objects.get_or_create(RoleName=role_name)
+        return role
+
+    return get_or_set_versioned(REFERENCE_NAMESPACE, f"role:{role_name}", build, _timeout())
+
+
+def invalidate_reference_data():
+    """Drop every cached department, tag and role"""
+    bump_namespace_version_on_commit(REFERENCE_NAMESPACE)
@@ -0,0 +1,15 @@
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, HttpResponseForbidden
+from apps.shared.metrics import REGISTRY
+
+
+@login_required
+def metrics_view(request):
+    """Prometheus text exposition of this worker's metrics - admins only"""
+    if not request.user.isUserAdmin:
+        return HttpResponseForbidden("Admin privileges required.")
+
+    return HttpResponse(
+        REGISTRY.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -2,6 +2,7 @@ import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 from django.utils import timezone
+from apps.shared.reference_cache import get_role
 
 
 class Role(models.Model):
@@ -32,10 +33,7 @@ class UserManager(BaseUserManager):
 
         # Get or create Staff role for regular users
         if 'RoleID' not in extra_fields:
-            staff_role, created = Role.objects.get_or_create(
-                RoleName='Staff'
-            )
-            extra_fields['RoleID'] = staff_role
+            extra_fields['RoleID'] = get_role('Staff')
 
         user = self.model(UserEmail=email, **extra_fields)
         user.set_password(password)
@@ -48,10 +46,7 @@ class UserManager(BaseUserManager):
         extra_fields.setdefault('isUserStaff', False)
 
         # Get or create admin role
-        admin_role, created = Role.objects.get_or_create(
-            RoleName='Admin'
-        )
-        extra_fields['RoleID'] = admin_role
+        extra_fields['RoleID'] = get_role('Admin')
 
         return self.create_user(UserEmail, password, **extra_fields)
 
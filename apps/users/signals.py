@@ -1,9 +1,18 @@
 from django.contrib.auth import user_logged_in
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
+from apps.shared.reference_cache import invalidate_reference_data
+from apps.users.models import Role
 
 @receiver(user_logged_in)
 def update_user_last_login(sender, request, user, **kwargs):
     """Update custom UserLastLogin field when user logs in"""
     user.UserLastLogin = timezone.now()
-    user.save(update_fields=['UserLastLogin'])
\ No newline at end of file
+    user.save(update_fields=['UserLastLogin'])
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_cache(sender, **kwargs):
+    """Drop cached roles whenever one is saved or deleted"""
+    invalidate_reference_data()
@@ -18,6 +18,7 @@ import re
 
 from .models import User, Role
 from apps.shared.email_utils import send_sendgrid_email  # ADD THIS IMPORT
+from apps.shared.reference_cache import get_role
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -372,7 +373,7 @@ def register_view(request):
 
         # --- Create user ---
         try:
-            staff_role, _ = Role.objects.get_or_create(RoleName='Staff')
+            staff_role = get_role('Staff')
             user = User.objects.create_user(
                 UserEmail=email,
                 UserFullName=f"{first_name} {last_name}".strip(),
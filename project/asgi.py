@@ -2,6 +2,9 @@
 ASGI config for Arcasys project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with uvicorn workers under gunicorn:
+
+    gunicorn project.asgi:application -k uvicorn.workers.UvicornWorker
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +15,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+os.environ.setdefault('SERVER_INTERFACE', 'asgi')
 
 application = get_asgi_application()
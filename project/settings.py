@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.shared.middleware.PersistentDBConnectionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -59,6 +60,16 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# PERFORMANCE INSTRUMENTATION
+# Per-request timings aggregated per URL name, exposed at /metrics/ (admins only)
+PERFORMANCE_PROFILING_ENABLED = os.environ.get('PERFORMANCE_PROFILING_ENABLED', 'True').lower() == 'true'
+PERFORMANCE_QUERY_BUDGET = int(os.environ.get('PERFORMANCE_QUERY_BUDGET', '30'))
+PERFORMANCE_SLOW_REQUEST_MS = int(os.environ.get('PERFORMANCE_SLOW_REQUEST_MS', '1000'))
+
+if PERFORMANCE_PROFILING_ENABLED:
+    # Outermost so wall time covers every other middleware
+    MIDDLEWARE.insert(0, 'apps.shared.middleware.RequestProfilingMiddleware')
+
 ROOT_URLCONF = 'project.urls'
 
 TEMPLATES = [
@@ -81,17 +92,109 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'project.wsgi.application'
+ASGI_APPLICATION = 'project.asgi.application'
+
+# SERVER_INTERFACE: "wsgi" (gunicorn sync workers) or "asgi" (gunicorn with
+# uvicorn workers, set by project/asgi.py). Under ASGI the I/O-bound views
+# run as coroutines and every request gets its own database thread.
+SERVER_INTERFACE = os.environ.get('SERVER_INTERFACE', 'wsgi').lower()
+
+if SERVER_INTERFACE == 'asgi':
+    MIDDLEWARE[MIDDLEWARE.index('whitenoise.middleware.WhiteNoiseMiddleware')] = \
+        'apps.shared.middleware.AsyncWhiteNoiseMiddleware'
 
 # DATABASE
+# DB_CONNECTION_MODE:
+#   persistent - reuse connections for DB_CONN_MAX_AGE seconds, health-checked
+#                before reuse; idle-too-long or broken ones are closed
+#   pgbouncer  - same, for a transaction-pooling pgbouncer / Supabase pooler
+#                (port 6543): server-side cursors are disabled
 DATABASE_URL = os.environ.get('DATABASE_URL')
+DB_CONNECTION_MODE = os.environ.get('DB_CONNECTION_MODE', 'persistent').lower()
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '600'))
+if SERVER_INTERFACE == 'asgi':
+    # A request's database thread ends with the request; a kept connection would never be reused
+    DB_CONN_MAX_AGE = 0
+DB_CONN_MAX_IDLE = int(os.environ.get('DB_CONN_MAX_IDLE', '300'))
+
 DATABASES = {
     "default": dj_database_url.config(
         default=DATABASE_URL or "sqlite:///db.sqlite3",
-        conn_max_age=600,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
         ssl_require=True
     )
 }
 
+if DB_CONNECTION_MODE == 'pgbouncer':
+    # Named cursors don't survive transaction pooling
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Scratch PostgreSQL database that backup verification wipes and restores into
+BACKUP_VERIFY_DATABASE_URL = os.environ.get('BACKUP_VERIFY_DATABASE_URL')
+if BACKUP_VERIFY_DATABASE_URL:
+    DATABASES['backup_verify'] = dj_database_url.parse(BACKUP_VERIFY_DATABASE_URL)
+
+# CACHE
+# locmem is per-process: with several gunicorn workers use "file" or "redis"
+# so signal-based invalidation reaches every worker.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem').lower()
+CACHE_LOCATION = os.environ.get('CACHE_LOCATION', '')
+
+if CACHE_BACKEND == 'redis':
+    # Requires the optional `redis` package
+    _cache_backend = 'django.core.cache.backends.redis.RedisCache'
+    _cache_location = CACHE_LOCATION or 'redis://127.0.0.1:6379/1'
+elif CACHE_BACKEND == 'file':
+    _cache_backend = 'django.core.cache.backends.filebased.FileBasedCache'
+    _cache_location = CACHE_LOCATION or str(BASE_DIR / '.cache')
+else:
+    _cache_backend = 'django.core.cache.backends.locmem.LocMemCache'
+    _cache_location = CACHE_LOCATION or 'arcasys-default'
+
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': _cache_location,
+        'KEY_PREFIX': 'arcasys',
+        'TIMEOUT': int(os.environ.get('CACHE_DEFAULT_TIMEOUT', '3600')),
+    }
+}
+
+# Departments, tags and roles; kept short so locmem workers converge quickly
+REFERENCE_DATA_CACHE_TIMEOUT = int(os.environ.get('REFERENCE_DATA_CACHE_TIMEOUT', '300'))
+
+# Rendered events-page fragments; keys also carry the archive version
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', '600'))
+
+# iCalendar/Atom feeds: events listed per feed, and how long serialized entries
+# stay cached (keys carry each event's revision, so they never go stale)
+FEED_MAX_EVENTS = int(os.environ.get('FEED_MAX_EVENTS', '50'))
+FEED_FRAGMENT_TIMEOUT = int(os.environ.get('FEED_FRAGMENT_TIMEOUT', '86400'))
+
+# EXPORT JOBS
+# Large CSV exports run in the background; chunks are formatted in a process
+# pool (0 = format on the job thread). Files go to S3 when it is configured,
+# otherwise to EXPORT_LOCAL_ROOT.
+EXPORT_JOB_WORKERS = int(os.environ.get('EXPORT_JOB_WORKERS', str(min(4, os.cpu_count() or 1))))
+EXPORT_JOB_CHUNK_SIZE = int(os.environ.get('EXPORT_JOB_CHUNK_SIZE', '5000'))
+# Unfinished jobs without progress for this long are treated as dead (e.g. worker restarted)
+EXPORT_JOB_STALE_SECONDS = int(os.environ.get('EXPORT_JOB_STALE_SECONDS', '600'))
+EXPORT_LOCAL_ROOT = os.environ.get('EXPORT_LOCAL_ROOT', str(BASE_DIR / '.exports'))
+
+# BACKUP STORAGE
+# Capacity alerts on the backup dashboard (0 disables them)
+BACKUP_STORAGE_QUOTA_BYTES = int(os.environ.get('BACKUP_STORAGE_QUOTA_BYTES', str(5 * 1024 ** 3)))
+BACKUP_STORAGE_WARNING_RATIO = float(os.environ.get('BACKUP_STORAGE_WARNING_RATIO', '0.8'))
+# Restores stream the S3 object into psql; set to stage a local temp copy first
+RESTORE_STAGE_TO_DISK = os.environ.get('RESTORE_STAGE_TO_DISK', 'False').lower() == 'true'
+# In-memory log entries kept per running backup/restore for status polling
+OPERATION_LOG_RING_SIZE = int(os.environ.get('OPERATION_LOG_RING_SIZE', '500'))
+# Per-process LRU of log pieces fetched from S3 by the log viewer
+LOG_VIEWER_CACHE_BYTES = int(os.environ.get('LOG_VIEWER_CACHE_BYTES', str(32 * 1024 * 1024)))
+# Directory holding psql / pg_dump for backup verification (empty: use PATH)
+BACKUP_VERIFY_PG_BIN = os.environ.get('BACKUP_VERIFY_PG_BIN', '')
+
 # PASSWORD VALIDATION
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
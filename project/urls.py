@@ -10,6 +10,7 @@ urlpatterns = [
     path('', include('apps.marketing.urls')),  # Landing page
     path('users/', include('apps.users.urls')),
     path('events/', include('apps.events.urls')),
+    path('metrics/', include('apps.shared.urls')),
 ]
 
 if settings.DEBUG: